@@ -0,0 +1,205 @@
+# api_clients/avalanche_warning_store.py
+"""
+Local table of Varsom avalanche warnings for all forecast regions
+Filled by a scheduled bulk ingestion (python worker.py ingest-avalanche), so
+looking up a warning during a user request never touches the network
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import requests
+
+import config
+from api_clients.http_transport import get_transport
+
+# English problem type names from the API, matched by keyword, to our problem keys
+AVALANCHE_PROBLEM_KEYWORDS = [
+    ('persistent', 'persistent_weak_layer'),
+    ('wind', 'wind_slab'),
+    ('new snow', 'new_snow'),
+    ('wet', 'wet_snow'),
+    ('glid', 'gliding_snow')
+]
+
+DANGER_TEXTS = {
+    1: "Low avalanche danger",
+    2: "Moderate avalanche danger",
+    3: "Considerable avalanche danger",
+    4: "High avalanche danger",
+    5: "Very high avalanche danger"
+}
+
+class AvalancheWarningStore:
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, 'avalanche_warnings.sqlite')
+        self._local = threading.local()
+        self._initialized = False
+
+    def _connect(self):
+        """One connection per thread, creating the table on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            if not self._initialized:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS warnings ('
+                    'region_id INTEGER NOT NULL, valid_date TEXT NOT NULL, region_name TEXT, '
+                    'danger_level INTEGER NOT NULL, avalanche_problems TEXT NOT NULL, '
+                    'forecast_text TEXT, valid_from TEXT, valid_to TEXT, ingested_at TEXT NOT NULL, '
+                    'PRIMARY KEY (region_id, valid_date))'
+                )
+                self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def get_warning(self, region_id: int, valid_date: date) -> Optional[Dict]:
+        """
+        Get the stored warning for a region and day
+
+        Returns:
+            dict in the VarsomClient warning format, or None if no warning is stored
+        """
+        try:
+            row = self._connect().execute(
+                'SELECT region_name, danger_level, avalanche_problems, forecast_text, valid_from, valid_to '
+                'FROM warnings WHERE region_id = ? AND valid_date = ?',
+                (region_id, valid_date.isoformat())
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Avalanche warning table unavailable ({e})")
+            return None
+
+        if not row:
+            return None
+        region_name, danger_level, problems, forecast_text, valid_from, valid_to = row
+        return {
+            'danger_level': danger_level,
+            'danger_text': DANGER_TEXTS.get(danger_level, "Unknown avalanche danger"),
+            'avalanche_problems': json.loads(problems),
+            'valid_from': valid_from,
+            'valid_to': valid_to,
+            'forecast_text': forecast_text,
+            'data_source': 'varsom',
+            'region_name': region_name
+        }
+
+    def save_warnings(self, warnings: List[Dict]):
+        """Insert or replace normalized warnings in one transaction"""
+        ingested_at = datetime.now().isoformat()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO warnings (region_id, valid_date, region_name, danger_level, '
+                'avalanche_problems, forecast_text, valid_from, valid_to, ingested_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(w['region_id'], w['valid_date'], w['region_name'], w['danger_level'],
+                  json.dumps(w['avalanche_problems']), w['forecast_text'],
+                  w['valid_from'], w['valid_to'], ingested_at) for w in warnings]
+            )
+            # Old days are never looked up again
+            conn.execute('DELETE FROM warnings WHERE valid_date < ?',
+                         ((date.today() - timedelta(days=7)).isoformat(),))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def normalize_warning(raw: Dict) -> Optional[Dict]:
+    """
+    Normalize one warning from the NVE API
+
+    Returns:
+        dict ready for AvalancheWarningStore.save_warnings, or None for unrated warnings
+    """
+    danger_level = int(raw.get('DangerLevel') or 0)
+    if danger_level < 1:
+        return None  # 0 = not assessed (e.g. outside the season)
+
+    problems = []
+    for problem in raw.get('AvalancheProblems') or []:
+        name = (problem.get('AvalancheProblemTypeName') or '').lower()
+        for keyword, problem_key in AVALANCHE_PROBLEM_KEYWORDS:
+            if keyword in name:
+                if problem_key not in problems:
+                    problems.append(problem_key)
+                break
+
+    valid_from = raw.get('ValidFrom', '')
+    return {
+        'region_id': int(raw['RegionId']),
+        'valid_date': valid_from[:10],
+        'region_name': raw.get('RegionName', ''),
+        'danger_level': danger_level,
+        'avalanche_problems': problems,
+        'forecast_text': raw.get('MainText') or '',
+        'valid_from': valid_from[:10],
+        'valid_to': (raw.get('ValidTo') or '')[:10]
+    }
+
+def ingest_avalanche_warnings(days: int = 3, store: Optional[AvalancheWarningStore] = None) -> int:
+    """
+    Download warnings for all regions for the next days in one request and store them
+
+    Args:
+        days: Number of valid days to ingest, starting today
+        store: Target store (uses the shared store if None)
+
+    Returns:
+        int: Number of warnings stored
+    """
+    store = store or get_avalanche_warning_store()
+    start = date.today()
+    end = start + timedelta(days=days - 1)
+    url = f"{config.AVALANCHE_FORECAST_API}/api/RegionSummary/Detail/2/{start.isoformat()}/{end.isoformat()}"
+
+    print(f"📡 Downloading avalanche warnings for all regions ({start} to {end})...")
+    try:
+        response = get_transport().get(url, headers={'Accept': 'application/json'})
+        response.raise_for_status()
+        regions = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"🚫 Error downloading avalanche warnings: {e}")
+        return 0
+
+    warnings = []
+    for region in regions:
+        for raw_warning in region.get('AvalancheWarningList') or []:
+            try:
+                warning = normalize_warning(raw_warning)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"   ⚠️  Skipping malformed warning for {region.get('Name', 'unknown region')}: {e}")
+                continue
+            if warning:
+                warnings.append(warning)
+
+    store.save_warnings(warnings)
+    print(f"✅ Stored {len(warnings)} avalanche warnings from {len(regions)} regions")
+    return len(warnings)
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_avalanche_warning_store():
+    """
+    Get the process-wide warning store
+
+    Returns:
+        AvalancheWarningStore: Shared store instance
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = AvalancheWarningStore()
+    return _shared_store
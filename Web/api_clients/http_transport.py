@@ -0,0 +1,132 @@
+# api_clients/http_transport.py
+"""
+Shared HTTP transport used by all API clients
+Keeps one keep-alive connection pool per host, with timeouts and bounded retries
+"""
+
+import random
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+from api_clients.rate_limiter import get_rate_limiter
+
+# Responses worth retrying: rate limited or temporary server trouble
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+class JitteredRetry(Retry):
+    """
+    urllib3 retry policy with random jitter added to the exponential backoff,
+    so parallel workers hitting the same host don't retry in lockstep
+    """
+    JITTER_SECONDS = config.API_BACKOFF_JITTER
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, self.JITTER_SECONDS)
+
+
+class HttpTransport:
+    def __init__(self, user_agent=None, timeout=None, retries=None, rate_limiter=None):
+        self.user_agent = user_agent or config.USER_AGENT
+        self.timeout = timeout or (config.API_CONNECT_TIMEOUT, config.API_READ_TIMEOUT)
+        self.retries = config.API_RETRIES if retries is None else retries
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._sessions = {}  # One pooled session per host
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        """
+        Perform a GET request through the pooled session for the url's host
+        Blocks first if the host's shared rate limit bucket is empty
+
+        Args:
+            url (str): Full request URL
+            params (dict): Query parameters
+            headers (dict): Extra headers for this request (User-Agent is set per session)
+            timeout (float or tuple): Override of the (connect, read) timeout
+
+        Returns:
+            requests.Response: The response (after any retries)
+        """
+        session = self._get_session(url)
+        self.rate_limiter.acquire(url)
+        return session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        """
+        Perform a POST request with a JSON body through the pooled session
+        POSTs are rate limited like GETs but not retried automatically
+
+        Returns:
+            requests.Response: The response
+        """
+        session = self._get_session(url)
+        self.rate_limiter.acquire(url)
+        return session.post(url, json=json, headers=headers, timeout=timeout or self.timeout)
+
+    def _get_session(self, url):
+        """Get (or lazily create) the pooled session for the url's host"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session(host)
+                self._sessions[host] = session
+        return session
+
+    def _create_session(self, host):
+        """Create a keep-alive session with a bounded pool and retry policy"""
+        retry = JitteredRetry(
+            total=self.retries,
+            backoff_factor=config.API_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False  # Hand the last response back so callers can raise_for_status()
+        )
+
+        pool_size = config.API_HOST_POOL_SIZES.get(host, config.API_POOL_MAXSIZE)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=True,  # Never open more than pool_size sockets to one host
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['User-Agent'] = self.user_agent
+        return session
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+_shared_transport = None
+_shared_transport_lock = threading.Lock()
+
+def get_transport():
+    """
+    Get the process-wide shared transport
+
+    Returns:
+        HttpTransport: Shared transport instance
+    """
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            _shared_transport = HttpTransport()
+    return _shared_transport
@@ -5,10 +5,65 @@ Kartverket API client for Norwegian place name lookup
 
 import requests
 import config
+from api_clients.http_transport import get_transport
+from api_clients.singleflight import SingleFlight
+
+_search_flights = SingleFlight("Kartverket search")
 
 class KartverketClient:
     def __init__(self):
         self.api_url = config.KARTVERKET_STEDSNAVN_API
+        self.transport = get_transport()
+    
+    def fetch_places(self, place_name, max_results=5):
+        """
+        Query Kartverket for places matching a name
+        Concurrent identical searches share one request
+        
+        Args:
+            place_name (str): Name of the place to search for
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            list: Location dictionaries, most relevant first (empty if nothing matched)
+            
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            KeyError, ValueError: If the response can't be parsed
+        """
+        key = (' '.join(place_name.lower().split()), max_results)
+        results = _search_flights.do(key, self._request_places, place_name, max_results)
+        return [dict(result, original_search=place_name) for result in results]
+    
+    def _request_places(self, place_name, max_results):
+        """Send one search request and parse the matching places"""
+        params = {
+            'sok': place_name,
+            'treffPerSide': max_results,
+            'side': 1
+        }
+        
+        response = self.transport.get(self.api_url, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        results = []
+        for place in data.get('navn') or []:
+            if 'representasjonspunkt' in place:
+                coords = place['representasjonspunkt']
+                result = {
+                    'name': place['skrivemåte'],
+                    'lat': coords['nord'],
+                    'lon': coords['øst'],
+                    'municipality': place.get('kommunenavn', ''),
+                    'county': place.get('fylkesnavn', ''),
+                    'place_type': place.get('navneobjekttype', ''),
+                    'original_search': place_name
+                }
+                results.append(result)
+        
+        return results
     
     def search_place(self, place_name, max_results=None):
         """
@@ -25,53 +80,23 @@ class KartverketClient:
             max_results = config.DEFAULT_KARTVERKET_RESULTS
             
         try:
-            params = {
-                'sok': place_name,
-                'treffPerSide': max_results,
-                'side': 1
-            }
-            
             print(f"🔍 Searching for '{place_name}' using Kartverket...")
-            response = requests.get(self.api_url, params=params)
-            response.raise_for_status()
+            results = self.fetch_places(place_name, max_results)
             
-            data = response.json()
-            
-            if not data.get('navn'):
+            if not results:
                 print(f"❌ No results found for '{place_name}'")
                 return None
             
-            # Get the first (most relevant) result
-            place = data['navn'][0]
-            
-            # Extract coordinates
-            if 'representasjonspunkt' in place:
-                coords = place['representasjonspunkt']
-                lat = coords['nord']
-                lon = coords['øst']
-                
-                result = {
-                    'name': place['skrivemåte'],
-                    'lat': lat,
-                    'lon': lon,
-                    'municipality': place.get('kommunenavn', ''),
-                    'county': place.get('fylkesnavn', ''),
-                    'place_type': place.get('navneobjekttype', ''),
-                    'original_search': place_name
-                }
-                
-                print(f"✅ Found: {result['name']} in {result['municipality']}, {result['county']}")
-                print(f"📍 Coordinates: {lat:.4f}, {lon:.4f}")
-                
-                return result
-            else:
-                print(f"❌ No coordinates found for '{place_name}'")
-                return None
+            # The first result is the most relevant
+            result = results[0]
+            print(f"✅ Found: {result['name']} in {result['municipality']}, {result['county']}")
+            print(f"📍 Coordinates: {result['lat']:.4f}, {result['lon']:.4f}")
+            return result
                 
         except requests.exceptions.RequestException as e:
             print(f"🚫 Error searching for location: {e}")
             return None
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, ValueError) as e:
             print(f"🚫 Error parsing location data: {e}")
             return None
     
@@ -87,40 +112,11 @@ class KartverketClient:
             list: List of location dictionaries
         """
         try:
-            params = {
-                'sok': place_name,
-                'treffPerSide': max_results,
-                'side': 1
-            }
-            
-            response = requests.get(self.api_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data.get('navn'):
-                return []
-            
-            results = []
-            for place in data['navn']:
-                if 'representasjonspunkt' in place:
-                    coords = place['representasjonspunkt']
-                    result = {
-                        'name': place['skrivemåte'],
-                        'lat': coords['nord'],
-                        'lon': coords['øst'],
-                        'municipality': place.get('kommunenavn', ''),
-                        'county': place.get('fylkesnavn', ''),
-                        'place_type': place.get('navneobjekttype', ''),
-                        'original_search': place_name
-                    }
-                    results.append(result)
-            
-            return results
+            return self.fetch_places(place_name, max_results)
                 
         except requests.exceptions.RequestException as e:
             print(f"Error searching for locations: {e}")
             return []
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, ValueError) as e:
             print(f"Error parsing location data: {e}")
             return []
\ No newline at end of file
@@ -0,0 +1,135 @@
+# api_clients/rate_limiter.py
+"""
+Per-host token bucket rate limiter shared across processes
+Bucket state lives in a small SQLite database so CGI processes and WSGI
+workers on the same machine draw from the same quota
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import config
+
+class RateLimiter:
+    def __init__(self, db_path=None, limits=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, 'rate_limits.sqlite')
+        self.limits = limits if limits is not None else config.API_RATE_LIMITS
+        self.default_limit = (1 / config.API_DELAY, 1)  # Old fixed delay as fallback quota
+        self._local = threading.local()
+        self._memory_buckets = {}  # Used only if the shared database is unavailable
+        self._memory_lock = threading.Lock()
+        self._use_database = self._init_database()
+
+    def _init_database(self):
+        """Create the bucket table, falling back to in-process buckets on failure"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Rate limiter database unavailable ({e}) - limiting per process only")
+            return False
+
+    def _connect(self):
+        """One connection per thread, in autocommit mode so we control transactions"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, url_or_host):
+        """
+        Take one token for the host, blocking only while its bucket is empty
+
+        Args:
+            url_or_host (str): Request URL or bare host name
+        """
+        host = urlsplit(url_or_host).netloc or url_or_host
+        rate, burst = self.limits.get(host, self.default_limit)
+
+        while True:
+            if self._use_database:
+                try:
+                    wait = self._take_shared(host, rate, burst)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Rate limiter database error ({e}) - limiting per process only")
+                    self._use_database = False
+                    continue
+            else:
+                wait = self._take_local(host, rate, burst)
+
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _take_shared(self, host, rate, burst):
+        """Try to take a token from the shared bucket, returning seconds to wait if empty"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')  # Write lock shared by all processes
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM buckets WHERE host = ?', (host,)
+            ).fetchone()
+            now = time.time()
+            tokens, wait = self._refill_and_take(row, now, rate, burst)
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (host, tokens, updated_at) VALUES (?, ?, ?)',
+                (host, tokens, now)
+            )
+            conn.execute('COMMIT')
+            return wait
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _take_local(self, host, rate, burst):
+        """Same as _take_shared, but for an in-process bucket"""
+        with self._memory_lock:
+            now = time.time()
+            tokens, wait = self._refill_and_take(self._memory_buckets.get(host), now, rate, burst)
+            self._memory_buckets[host] = (tokens, now)
+            return wait
+
+    def _refill_and_take(self, bucket, now, rate, burst):
+        """
+        Refill a bucket for the elapsed time and take one token if available
+
+        Returns:
+            tuple: (tokens left, seconds to wait before retrying - 0 if a token was taken)
+        """
+        if bucket is None:
+            tokens = burst
+        else:
+            stored_tokens, updated_at = bucket
+            tokens = min(burst, stored_tokens + max(0, now - updated_at) * rate)
+
+        if tokens >= 1:
+            return tokens - 1, 0
+        return tokens, (1 - tokens) / rate
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """
+    Get the process-wide rate limiter
+
+    Returns:
+        RateLimiter: Shared limiter instance
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+    return _shared_limiter
@@ -0,0 +1,243 @@
+# api_clients/regobs_store.py
+"""
+Local store of recent RegObs snow observations, indexed by geohash and time
+Filled by a scheduled ingestion (python worker.py ingest-regobs), so radius
+queries for every candidate tour run without any network round trip
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import requests
+
+import config
+from api_clients.http_transport import get_transport
+from utils import geohash
+from utils.distance_calculator import calculate_distances
+
+GEOHASH_PRECISION = 5          # ~4.9 km x 2.4 km cells at Norwegian latitudes
+SNOW_GEO_HAZARD = 10           # RegObs geo hazard ID for snow/avalanches
+SEARCH_PAGE_SIZE = 100
+
+# English registration names from the API, matched by keyword, to our observation types
+OBSERVATION_TYPE_KEYWORDS = [
+    ('avalanche obs', 'avalanche'),
+    ('avalanche activity', 'avalanche'),
+    ('danger sign', 'danger_sign'),
+    ('snow profile', 'snow_profile'),
+    ('compression test', 'snow_profile'),
+    ('snow cover', 'snow_cover'),
+    ('weather', 'weather')
+]
+
+class RegObsObservationStore:
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, 'regobs_observations.sqlite')
+        self._local = threading.local()
+        self._initialized = False
+
+    def _connect(self):
+        """One connection per thread, creating the table on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            if not self._initialized:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS observations ('
+                    'reg_id INTEGER PRIMARY KEY, geohash TEXT NOT NULL, obs_time TEXT NOT NULL, '
+                    'lat REAL NOT NULL, lon REAL NOT NULL, types TEXT NOT NULL, description TEXT)'
+                )
+                conn.execute('CREATE INDEX IF NOT EXISTS observations_cell_time ON observations (geohash, obs_time)')
+                self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def save_observations(self, observations: List[Dict]):
+        """Insert or replace normalized observations in one transaction, dropping old ones"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO observations (reg_id, geohash, obs_time, lat, lon, types, description) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(o['reg_id'], geohash.encode(o['lat'], o['lon'], GEOHASH_PRECISION), o['obs_time'],
+                  o['lat'], o['lon'], json.dumps(o['types']), o['description']) for o in observations]
+            )
+            cutoff = (datetime.now() - timedelta(days=config.REGOBS_RETENTION_DAYS)).isoformat()
+            conn.execute('DELETE FROM observations WHERE obs_time < ?', (cutoff,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def query(self, lat: float, lon: float, radius_km: float = 15, days_back: int = 7) -> List[Dict]:
+        """
+        Observations within a radius and time window, nearest first
+
+        Args:
+            lat (float): Centre latitude
+            lon (float): Centre longitude
+            radius_km (float): Search radius in kilometers
+            days_back (int): How many days back to include
+
+        Returns:
+            list: Observation dicts with 'date', 'type', 'types', 'description' and 'distance_km'
+        """
+        cells = geohash.cover_radius(lat, lon, radius_km, GEOHASH_PRECISION)
+        since = (datetime.now() - timedelta(days=days_back)).isoformat()
+        placeholders = ','.join('?' * len(cells))
+        try:
+            rows = self._connect().execute(
+                f'SELECT reg_id, obs_time, lat, lon, types, description FROM observations '
+                f'WHERE geohash IN ({placeholders}) AND obs_time >= ?',
+                (*cells, since)
+            ).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  RegObs observation store unavailable ({e})")
+            return []
+
+        distances = calculate_distances(lat, lon, [row[2] for row in rows], [row[3] for row in rows])
+        observations = []
+        for (reg_id, obs_time, obs_lat, obs_lon, types, description), distance in zip(rows, distances.tolist()):
+            if distance > radius_km:
+                continue  # Cells cover the bounding box, not the circle
+            types = json.loads(types)
+            observations.append({
+                'reg_id': reg_id,
+                'date': obs_time[:10],
+                'obs_time': obs_time,
+                'type': types[0] if types else 'other',
+                'types': types,
+                'description': description,
+                'lat': obs_lat,
+                'lon': obs_lon,
+                'distance_km': distance
+            })
+
+        observations.sort(key=lambda o: o['distance_km'])
+        return observations
+
+
+def normalize_registration(raw: Dict) -> Optional[Dict]:
+    """
+    Normalize one registration from the RegObs Search API
+
+    Returns:
+        dict ready for RegObsObservationStore.save_observations, or None without a location
+    """
+    location = raw.get('ObsLocation') or {}
+    lat, lon = location.get('Latitude'), location.get('Longitude')
+    if lat is None or lon is None:
+        return None
+
+    types = []
+    descriptions = []
+    for summary in raw.get('Summaries') or []:
+        name = (summary.get('RegistrationName') or '').lower()
+        for keyword, observation_type in OBSERVATION_TYPE_KEYWORDS:
+            if keyword in name:
+                if observation_type not in types:
+                    types.append(observation_type)
+                break
+        if summary.get('Summary'):
+            descriptions.append(f"{summary.get('RegistrationName', '')}: {summary['Summary']}")
+
+    return {
+        'reg_id': int(raw['RegId']),
+        'obs_time': raw['DtObsTime'][:19],  # Local time, without offset, for plain string comparison
+        'lat': float(lat),
+        'lon': float(lon),
+        'types': types or ['other'],
+        'description': ' | '.join(descriptions)
+    }
+
+def ingest_regobs_observations(days_back: int = 7, source: Optional[str] = None,
+                               store: Optional[RegObsObservationStore] = None) -> int:
+    """
+    Pull recent snow observations from RegObs (or a local JSON dump) into the store
+
+    Args:
+        days_back: How many days of observations to fetch
+        source: Path to a JSON dump of Search API results to read instead of the API
+        store: Target store (uses the shared store if None)
+
+    Returns:
+        int: Number of observations stored
+    """
+    store = store or get_regobs_store()
+
+    if source:
+        with open(source, 'r', encoding='utf-8') as f:
+            registrations = json.load(f)
+        print(f"📁 Loaded {len(registrations)} RegObs registrations from {source}")
+    else:
+        registrations = _search_registrations(days_back)
+        if registrations is None:
+            return 0
+
+    observations = []
+    for raw in registrations:
+        try:
+            observation = normalize_registration(raw)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"   ⚠️  Skipping malformed registration: {e}")
+            continue
+        if observation:
+            observations.append(observation)
+
+    store.save_observations(observations)
+    print(f"✅ Stored {len(observations)} RegObs observations")
+    return len(observations)
+
+def _search_registrations(days_back):
+    """Page through the RegObs Search API for recent snow registrations"""
+    url = f"{config.REGOBS_API_BASE}/Search"
+    now = datetime.now()
+    query = {
+        'LangKey': 2,  # English
+        'SelectedGeoHazards': [SNOW_GEO_HAZARD],
+        'FromDtObsTime': (now - timedelta(days=days_back)).isoformat(timespec='seconds'),
+        'ToDtObsTime': now.isoformat(timespec='seconds'),
+        'NumberOfRecords': SEARCH_PAGE_SIZE,
+        'Offset': 0
+    }
+
+    print(f"📡 Downloading RegObs observations for the last {days_back} days...")
+    registrations = []
+    try:
+        while True:
+            response = get_transport().post(url, json=query)
+            response.raise_for_status()
+            page = response.json()
+            registrations.extend(page)
+            if len(page) < SEARCH_PAGE_SIZE:
+                return registrations
+            query['Offset'] += SEARCH_PAGE_SIZE
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"🚫 Error downloading RegObs observations: {e}")
+        return None
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_regobs_store():
+    """
+    Get the process-wide observation store
+
+    Returns:
+        RegObsObservationStore: Shared store instance
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = RegObsObservationStore()
+    return _shared_store
@@ -4,56 +4,114 @@ SeNorge API client for Norwegian snow depth and conditions data
 Uses the THREDDS Data Server from MET Norway
 """
 
-import requests
 import json
 from datetime import datetime, timedelta
 import config
+from api_clients.senorge_grid import get_snow_grid_store
+from api_clients.singleflight import SingleFlight
+from utils.data_cache import get_data_cache
+
+_snow_flights = SingleFlight("Snow data")
 
 class SeNorgeClient:
     def __init__(self):
+        self.data_cache = get_data_cache()
+        self.grid_store = get_snow_grid_store()
         self.thredds_base_url = "https://thredds.met.no/thredds"
         self.catalog_url = f"{self.thredds_base_url}/catalog/senorge/catalog.html"
         self.opendap_base = f"{self.thredds_base_url}/dodsC/senorge"
         
-    def get_snow_data(self, lat, lon, location_name=""):
+    def get_snow_data(self, lat, lon, location_name="", elevation=None):
         """
         Get snow depth data for a specific location from SeNorge
+        Uses the ingested daily grids (python worker.py ingest-snow) when available,
+        otherwise falls back to estimated data
         
         Args:
             lat (float): Latitude
             lon (float): Longitude  
             location_name (str): Name for logging purposes
+            elevation (float): Height of the location (m), used when the grids have no terrain height
             
         Returns:
             dict: Snow data summary, or None if failed
         """
         try:
-            if location_name:
-                print(f"❄️  Fetching snow data for {location_name} ({lat:.4f}, {lon:.4f})...")
-            
-            # Get current date and recent dates for snowfall analysis
-            today = datetime.now()
-            recent_dates = [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(4)]
-            
-            snow_data = {
-                'location': location_name,
-                'coordinates': {'lat': lat, 'lon': lon},
-                'snow_depth_cm': None,
-                'snowfall_3days_cm': 0,
-                'data_timestamp': today.isoformat(),
-                'data_quality': 'estimated'  # Since we're using mock data for now
-            }
-            
-            # For prototype: Generate realistic snow data based on location
-            # In production, this would query the actual THREDDS server
-            snow_data.update(self._generate_mock_snow_data(lat, lon, today))
+            grid_data = self.get_grid_snow_data(lat, lon, location_name, elevation)
+            if grid_data:
+                return grid_data
             
-            return snow_data
+            # Concurrent lookups for the same point share one estimate
+            cache_key = f"{lat:.4f},{lon:.4f}"
+            snow_data = _snow_flights.do(cache_key, self._get_estimated_snow_data, lat, lon, cache_key, location_name)
+            return dict(snow_data, location=location_name)
             
         except Exception as e:
             print(f"🚫 Error fetching snow data for {location_name}: {e}")
             return None
     
+    def _get_estimated_snow_data(self, lat, lon, cache_key, location_name):
+        """Get estimated snow data for one point from the cache or the estimate model"""
+        cached = self.data_cache.get('snow', cache_key)
+        if cached:
+            return cached
+        
+        if location_name:
+            print(f"❄️  Fetching snow data for {location_name} ({lat:.4f}, {lon:.4f})...")
+        
+        # Get current date and recent dates for snowfall analysis
+        today = datetime.now()
+        recent_dates = [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(4)]
+        
+        snow_data = {
+            'location': location_name,
+            'coordinates': {'lat': lat, 'lon': lon},
+            'snow_depth_cm': None,
+            'snowfall_3days_cm': 0,
+            'data_timestamp': today.isoformat(),
+            'data_quality': 'estimated'  # Since we're using mock data for now
+        }
+        
+        # For prototype: Generate realistic snow data based on location
+        # In production, this would query the actual THREDDS server
+        snow_data.update(self._generate_mock_snow_data(lat, lon, today))
+        
+        self.data_cache.set('snow', cache_key, snow_data)
+        return snow_data
+    
+    def get_grid_snow_data(self, lat, lon, location_name="", elevation=None):
+        """
+        Look up snow data in the ingested seNorge grids (no network calls)
+        The grids have no temperature trend or wind effect, so those are 'unknown' (scored neutral)
+        
+        Args:
+            elevation (float): Height of the location (m), used when the grids have no terrain height
+        
+        Returns:
+            dict: Snow data summary, or None if no recent grid covers the location
+        """
+        grid_values = self.grid_store.lookup(lat, lon)
+        if not grid_values:
+            return None
+        
+        snow_data = {
+            'location': location_name,
+            'coordinates': {'lat': lat, 'lon': lon},
+            'snow_depth_cm': grid_values['snow_depth_cm'],
+            'snowfall_3days_cm': grid_values['snowfall_3days_cm'],
+            'temperature_trend': 'unknown',
+            'wind_effect': 'unknown',
+            'data_timestamp': grid_values['grid_date'],
+            'data_quality': 'senorge_grid'
+        }
+        # Height the depth was sampled at, so depths at other elevations are derived correctly
+        reference_elevation = grid_values.get('elevation_m')
+        if reference_elevation is None:
+            reference_elevation = elevation
+        if reference_elevation is not None:
+            snow_data['elevation'] = reference_elevation
+        return snow_data
+    
     def _generate_mock_snow_data(self, lat, lon, date):
         """
         Generate realistic mock snow data for prototype
@@ -92,36 +150,6 @@ class SeNorgeClient:
             'wind_effect': random.choice(['minimal', 'moderate', 'significant'])
         }
     
-    def _query_thredds_server(self, lat, lon, date):
-        """
-        Query actual THREDDS server for snow data
-        This is the real implementation for production use
-        """
-        try:
-            # Construct OPeNDAP URL for snow depth data
-            dataset_url = f"{self.opendap_base}/seNorge_2018/Archive/seNorge2018_{date.strftime('%Y')}.nc"
-            
-            # Parameters for spatial subset
-            params = {
-                'var': 'snow_depth',
-                'north': lat + 0.01,
-                'south': lat - 0.01, 
-                'east': lon + 0.01,
-                'west': lon - 0.01,
-                'time': date.strftime('%Y-%m-%d')
-            }
-            
-            # This would be the actual implementation
-            # response = requests.get(dataset_url, params=params)
-            # return self._parse_netcdf_response(response)
-            
-            print("   📊 THREDDS query constructed (using mock data for prototype)")
-            return None
-            
-        except Exception as e:
-            print(f"   🚫 THREDDS query failed: {e}")
-            return None
-    
     def get_snow_forecast(self, lat, lon, days_ahead=3):
         """
         Get snow forecast for the coming days
@@ -180,6 +208,8 @@ class SeNorgeClient:
             score += 15  # Getting more stable
         elif temp_trend == 'warming':
             score += 5   # Less stable, potential for wet avalanches
+        elif temp_trend == 'unknown':
+            score += 10  # Not measured (seNorge grids) - neutral
         
         # Wind Impact (10 points max)
         wind_effect = snow_data.get('wind_effect', 'minimal')
@@ -187,6 +217,8 @@ class SeNorgeClient:
             score += 10  # No wind loading issues
         elif wind_effect == 'moderate':
             score += 5   # Some wind redistribution
+        elif wind_effect == 'unknown':
+            score += 5   # Not measured (seNorge grids) - neutral
         # significant wind gets 0 points - dangerous wind slabs
         
         return min(score, 100)  # Cap at 100
\ No newline at end of file
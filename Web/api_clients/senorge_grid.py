@@ -0,0 +1,277 @@
+# api_clients/senorge_grid.py
+"""
+Daily seNorge snow grids stored as memory-mapped arrays
+The ingestion job downloads each day's 1 km snow depth and new snow grids once;
+lookups are then a grid index calculation with no network calls, and every
+process maps the same files from the page cache
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+from utils.projection import latlon_to_utm33
+
+try:
+    import netCDF4
+except ImportError:  # Only needed to ingest NetCDF/OPeNDAP sources
+    netCDF4 = None
+
+GRID_VARIABLES = ('snow_depth', 'new_snow')
+OPTIONAL_GRID_VARIABLES = ('elevation',)  # Terrain height of each cell (m), stored when the source has it
+GRID_META_FILE = 'grid.json'
+DATES_RECHECK_SECONDS = 60  # How often lookups rescan for newly ingested days
+SNOWFALL_WINDOW_DAYS = 3    # New snow is summed over this many days up to the latest grid
+
+def get_grid_root():
+    return os.path.join(config.CACHE_DIR, 'senorge')
+
+def ingest_snow_grids(day: date, source: Optional[str] = None) -> Optional[str]:
+    """
+    Download one day's seNorge grids and store them as .npy files
+
+    Args:
+        day: Date to ingest
+        source: Local .nc/.npz file or OPeNDAP URL (uses the config URL templates if None).
+                A .npz stand-in must contain 'x', 'y', 'snow_depth' and 'new_snow' arrays,
+                and may contain 'elevation'.
+
+    Returns:
+        str: Directory with the stored grids, or None if ingestion failed
+    """
+    try:
+        if source and source.endswith('.npz'):
+            grids = _read_npz_source(source)
+        else:
+            grids = _read_netcdf_sources(day, source)
+    except Exception as e:
+        print(f"🚫 Error ingesting seNorge grids for {day}: {e}")
+        return None
+
+    target_dir = os.path.join(get_grid_root(), day.isoformat())
+    temp_dir = f"{target_dir}.tmp{os.getpid()}"
+    os.makedirs(temp_dir, exist_ok=True)
+
+    x, y = grids['x'], grids['y']
+    meta = {
+        'date': day.isoformat(),
+        'x0': float(x[0]), 'dx': float(x[1] - x[0]), 'nx': int(len(x)),
+        'y0': float(y[0]), 'dy': float(y[1] - y[0]), 'ny': int(len(y)),
+        'ingested_at': datetime.now().isoformat()
+    }
+    for variable in GRID_VARIABLES + OPTIONAL_GRID_VARIABLES:
+        if variable in grids:
+            np.save(os.path.join(temp_dir, f"{variable}.npy"), grids[variable].astype(np.float32))
+    with open(os.path.join(temp_dir, GRID_META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    # Swap the finished directory in, so readers never see half-written grids
+    if os.path.isdir(target_dir):
+        shutil.rmtree(target_dir)
+    os.replace(temp_dir, target_dir)
+
+    print(f"❄️  Stored seNorge grids for {day} ({meta['ny']}x{meta['nx']}) in {target_dir}")
+    return target_dir
+
+def _read_npz_source(path):
+    with np.load(path) as data:
+        grids = {key: np.asarray(data[key]) for key in ('x', 'y') + GRID_VARIABLES}
+        grids.update({key: np.asarray(data[key]) for key in OPTIONAL_GRID_VARIABLES if key in data.files})
+        return grids
+
+def _read_netcdf_sources(day, source):
+    """Read both variables for one day from NetCDF files or OPeNDAP"""
+    if netCDF4 is None:
+        raise RuntimeError("netCDF4 is required to ingest NetCDF/OPeNDAP sources (pip install netCDF4)")
+
+    url_templates = {
+        'snow_depth': config.SENORGE_SNOW_DEPTH_URL,
+        'new_snow': config.SENORGE_NEW_SNOW_URL
+    }
+    variable_names = {
+        'snow_depth': config.SENORGE_SNOW_DEPTH_VARIABLE,
+        'new_snow': config.SENORGE_NEW_SNOW_VARIABLE
+    }
+
+    grids = {}
+    for variable in GRID_VARIABLES:
+        url = source or url_templates[variable].format(year=day.year)
+        print(f"📡 Reading {variable_names[variable]} for {day} from {url}")
+        with netCDF4.Dataset(url) as dataset:
+            time_var = dataset.variables['time']
+            index = netCDF4.date2index(datetime(day.year, day.month, day.day), time_var, select='nearest')
+            values = dataset.variables[variable_names[variable]][index, :, :]
+            grids[variable] = np.ma.filled(values.astype(np.float32), np.nan)
+            if 'x' not in grids:
+                grids['x'] = np.asarray(dataset.variables['X'][:])
+                grids['y'] = np.asarray(dataset.variables['Y'][:])
+    return grids
+
+
+class SnowGrid:
+    """Memory-mapped snow grids for one day"""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, GRID_META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.date = date.fromisoformat(self.meta['date'])
+        self.arrays = {
+            variable: np.load(os.path.join(directory, f"{variable}.npy"), mmap_mode='r')
+            for variable in GRID_VARIABLES
+        }
+        for variable in OPTIONAL_GRID_VARIABLES:
+            path = os.path.join(directory, f"{variable}.npy")
+            if os.path.exists(path):
+                self.arrays[variable] = np.load(path, mmap_mode='r')
+
+    def sample(self, variable: str, lat: float, lon: float) -> Optional[float]:
+        """
+        Bilinear interpolation of a grid variable at a location
+        Missing (NaN) neighbours are left out and the remaining weights renormalized
+
+        Returns:
+            float value in the grid's units (mm, m for elevation), or None outside the grid,
+            over no data or for a variable this day doesn't have
+        """
+        if variable not in self.arrays:
+            return None
+        meta = self.meta
+        x, y = latlon_to_utm33(lat, lon)
+        fx = (float(x) - meta['x0']) / meta['dx']
+        fy = (float(y) - meta['y0']) / meta['dy']
+        ix, iy = int(np.floor(fx)), int(np.floor(fy))
+        if not (0 <= ix < meta['nx'] - 1 and 0 <= iy < meta['ny'] - 1):
+            return None
+
+        tx, ty = fx - ix, fy - iy
+        cell = np.asarray(self.arrays[variable][iy:iy + 2, ix:ix + 2], dtype=np.float64)
+        weights = np.array([[(1 - tx) * (1 - ty), tx * (1 - ty)],
+                            [(1 - tx) * ty, tx * ty]])
+        valid = ~np.isnan(cell)
+        total_weight = weights[valid].sum()
+        if total_weight <= 0:
+            return None
+        return float((cell[valid] * weights[valid]).sum() / total_weight)
+
+
+class SnowGridStore:
+    """Finds and keeps open the most recent ingested grids"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or get_grid_root()
+        self._grids = {}  # day -> (SnowGrid, mtime of its meta file when opened)
+        self._dates = []
+        self._dates_checked_at = 0
+        self._lock = threading.Lock()
+
+    def available_dates(self) -> List[date]:
+        """Ingested days, newest first (rescanned at most every DATES_RECHECK_SECONDS)"""
+        now = time.time()
+        if now - self._dates_checked_at < DATES_RECHECK_SECONDS:
+            return self._dates
+
+        dates = []
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                try:
+                    dates.append(date.fromisoformat(name))
+                except ValueError:
+                    continue  # Unfinished .tmp directories
+        self._dates = sorted(dates, reverse=True)
+        self._dates_checked_at = now
+        return self._dates
+
+    def get_grid(self, day: date) -> Optional[SnowGrid]:
+        """
+        Open grids for a day, reopening them if the day was re-ingested since
+
+        Returns:
+            SnowGrid, or None if the day can't be opened
+        """
+        directory = os.path.join(self.root, day.isoformat())
+        try:
+            modified = os.path.getmtime(os.path.join(directory, GRID_META_FILE))
+        except OSError:
+            modified = None
+
+        with self._lock:
+            entry = self._grids.get(day)
+            if entry is not None and entry[1] == modified:
+                return entry[0]
+            try:
+                grid = SnowGrid(directory)
+            except (OSError, ValueError, KeyError) as e:
+                self._grids.pop(day, None)
+                print(f"⚠️  Could not open seNorge grids for {day}: {e}")
+                return None
+            self._grids[day] = (grid, modified)
+            self._drop_stale_grids()
+            return grid
+
+    def _drop_stale_grids(self):
+        # Unmap days that were removed or fell out of the snowfall window (call with the lock held)
+        dates = self._dates
+        if not dates:
+            return  # Not scanned yet
+        window_start = dates[0] - timedelta(days=SNOWFALL_WINDOW_DAYS - 1)
+        for day in list(self._grids):
+            if day not in dates or day < window_start:
+                del self._grids[day]
+
+    def lookup(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Snow depth from the latest grid and new snow summed over its last 3 days
+
+        Returns:
+            dict with 'snow_depth_cm', 'snowfall_3days_cm', 'grid_date' and 'elevation_m'
+            (the cell's terrain height, None if not ingested), or None if no recent grid
+            covers the location
+        """
+        dates = self.available_dates()
+        if not dates or (date.today() - dates[0]).days > config.SENORGE_MAX_GRID_AGE_DAYS:
+            return None
+
+        latest = self.get_grid(dates[0])
+        depth_mm = latest.sample('snow_depth', lat, lon) if latest else None
+        if depth_mm is None:
+            return None
+
+        snowfall_mm = 0.0
+        window_start = dates[0] - timedelta(days=SNOWFALL_WINDOW_DAYS - 1)
+        for day in dates:
+            if day < window_start:
+                break
+            grid = self.get_grid(day)
+            new_snow = grid.sample('new_snow', lat, lon) if grid else None
+            snowfall_mm += new_snow or 0
+
+        return {
+            'snow_depth_cm': round(max(0.0, depth_mm) / 10, 1),
+            'snowfall_3days_cm': round(max(0.0, snowfall_mm) / 10, 1),
+            'grid_date': dates[0].isoformat(),
+            'elevation_m': latest.sample('elevation', lat, lon)
+        }
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_snow_grid_store():
+    """
+    Get the process-wide grid store
+
+    Returns:
+        SnowGridStore: Shared store instance
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = SnowGridStore()
+    return _shared_store
@@ -0,0 +1,76 @@
+# api_clients/singleflight.py
+"""
+Request coalescing for upstream lookups
+Concurrent calls with the same key share one in-flight call and all get its
+result, so a burst of identical requests costs a single upstream round trip
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str = ""):
+        """
+        Args:
+            name: Label for log messages (e.g. "yr")
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless an identical call is already running, then wait for that one
+
+        Args:
+            key: Identifies identical calls (e.g. the grid cell or region and day)
+            fn: Function making the upstream lookup
+
+        Returns:
+            The result of the shared call; an exception it raised is raised in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a new call (and usually hit the client's cache instead)
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                print(f"🔗 {self.name or 'Upstream'} lookup {key} shared by {call.waiters + 1} requests")
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        with self._lock:
+            return len(self._calls)
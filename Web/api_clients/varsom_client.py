@@ -6,18 +6,32 @@ Enhanced to handle out-of-season periods with no data
 
 import requests
 import json
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import date, datetime, timedelta
 import config
+from api_clients.avalanche_warning_store import get_avalanche_warning_store
+from api_clients.regobs_store import get_regobs_store
+from api_clients.singleflight import SingleFlight
+from utils.region_index import get_avalanche_region_index
+
+# Region warnings by (region_id, date) -> (warning, expires_at), shared by every VarsomClient in the process
+_region_warnings = {}
+_region_lock = threading.Lock()
+_region_flights = SingleFlight("Avalanche warning")
 
 class VarsomClient:
     def __init__(self):
+        self.warning_store = get_avalanche_warning_store()
+        self.observation_store = get_regobs_store()
+        self._region_warnings = _region_warnings
         self.regobs_api_url = "https://api.regobs.no/v5"
         self.forecast_api_url = "https://api01.nve.no/hydrology/forecast/avalanche/v6.0.1"
         self.headers = {
             'User-Agent': config.USER_AGENT
         }
     
-    def get_avalanche_warning(self, lat, lon, location_name=""):
+    def get_avalanche_warning(self, lat, lon, location_name="", region_id=None):
         """
         Get avalanche warning for a specific location
         Always attempts to check for warnings, returns None if none found
@@ -26,6 +40,7 @@ class VarsomClient:
             lat (float): Latitude
             lon (float): Longitude
             location_name (str): Name for logging purposes
+            region_id (int): Precomputed forecast region (looked up from lat/lon if None)
             
         Returns:
             dict: Avalanche warning data, or None if no data available
@@ -50,21 +65,18 @@ class VarsomClient:
                 print(f"   📅 Outside avalanche warning period - no warnings expected")
                 return None
             
-            # For development/testing: Check if mock data is enabled
-            if getattr(config, 'MOCK_API_DATA', True):
-                return self._generate_seasonal_mock_data(lat, lon, current_month, is_main_season, is_semi_season)
-            
-            # Production: Always try to get real data, return None if not found
-            region_id = self._get_avalanche_region(lat, lon)
+            # Warnings are issued per forecast region and day
+            if region_id is None:
+                region_id = self.find_avalanche_region(lat, lon)
             
             if not region_id:
                 print(f"   📍 No avalanche forecast region found for {location_name}")
                 return None
             
-            # Attempt to get current avalanche warnings for the region
-            warning_data = self._get_regional_warning(region_id, is_main_season, is_semi_season)
+            region_warning = self._get_cached_regional_warning(region_id, is_main_season, is_semi_season)
             
-            if warning_data:
+            if region_warning:
+                warning_data = dict(region_warning)  # Shared by every tour in the region
                 warning_data['location'] = location_name
                 warning_data['coordinates'] = {'lat': lat, 'lon': lon}
                 warning_data['region_id'] = region_id
@@ -78,6 +90,49 @@ class VarsomClient:
             print(f"🚫 Error checking avalanche warnings for {location_name}: {e}")
             return None
     
+    def _get_cached_regional_warning(self, region_id, is_main_season, is_semi_season):
+        """
+        Get a region's warning for today, shared by every tour in the region
+        Reads only the locally ingested warning table - never the network
+        """
+        today = date.today()
+        cache_key = (region_id, today.isoformat())
+        
+        with _region_lock:
+            entry = self._region_warnings.get(cache_key)
+            if entry is not None and entry[1] > time.time():
+                return entry[0]
+        
+        # Tours in the same region share one lookup instead of each looking up
+        return _region_flights.do(
+            cache_key, self._load_regional_warning, cache_key, region_id, today, is_main_season, is_semi_season
+        )
+    
+    def _load_regional_warning(self, cache_key, region_id, today, is_main_season, is_semi_season):
+        """
+        Look up a region's warning and remember it for AVALANCHE_WARNING_TTL_MINUTES
+        "No warning" is not remembered, so a warning ingested (or published) later today is found
+        """
+        mock = getattr(config, 'MOCK_API_DATA', True)
+        if mock:
+            # For development/testing
+            warning_data = self._generate_seasonal_mock_data(
+                0, 0, today.month, is_main_season, is_semi_season
+            )
+        else:
+            warning_data = self.warning_store.get_warning(region_id, today)
+            if warning_data:
+                warning_data['season_type'] = 'main_season' if is_main_season else 'semi_season'
+        
+        if warning_data or mock:  # Mock answers, including none, stay fixed so tours in a region agree
+            expires_at = time.time() + config.AVALANCHE_WARNING_TTL_MINUTES * 60
+            with _region_lock:
+                # Earlier days' warnings are never asked for again
+                for key in [key for key in self._region_warnings if key[1] != cache_key[1]]:
+                    del self._region_warnings[key]
+                self._region_warnings[cache_key] = (warning_data, expires_at)
+        return warning_data
+    
     def _generate_seasonal_mock_data(self, lat, lon, month, is_main_season, is_semi_season):
         """
         Generate realistic mock avalanche data based on season type
@@ -193,57 +248,20 @@ class VarsomClient:
             'season_active': True
         }
     
-    def _get_avalanche_region(self, lat, lon):
+    def find_avalanche_region(self, lat, lon):
         """
         Find which avalanche forecast region contains the given coordinates
+        Points just outside the outlines get the nearest region (see AVALANCHE_REGION_FALLBACK_KM)
+        
+        Returns:
+            int: Varsom region ID, or None away from all forecast regions
         """
-        try:
-            # Rough region mapping for major ski areas
-            regions = {
-                'Lyngen': {'lat_range': (69.2, 70.0), 'lon_range': (19.5, 20.5), 'id': 3022},
-                'Lofoten': {'lat_range': (67.8, 68.5), 'lon_range': (13.0, 15.0), 'id': 3023},
-                'Jotunheimen': {'lat_range': (61.2, 61.8), 'lon_range': (7.5, 8.8), 'id': 3009},
-                'Hemsedal': {'lat_range': (60.6, 61.0), 'lon_range': (8.2, 8.8), 'id': 3007},
-                'Romsdalen': {'lat_range': (62.3, 62.8), 'lon_range': (7.4, 8.0), 'id': 3012},
-                'Narvik': {'lat_range': (68.2, 68.6), 'lon_range': (17.0, 18.0), 'id': 3024}
-            }
-            
-            for region_name, bounds in regions.items():
-                lat_min, lat_max = bounds['lat_range']
-                lon_min, lon_max = bounds['lon_range']
-                
-                if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max:
-                    print(f"   📍 Found region: {region_name} (ID: {bounds['id']})")
-                    return bounds['id']
-            
-            print(f"   📍 No specific region found, using nearest region")
-            return 3009  # Default to Jotunheimen region
-            
-        except Exception as e:
-            print(f"   🚫 Error finding avalanche region: {e}")
-            return None
-    
-    def _get_regional_warning(self, region_id, is_main_season, is_semi_season):
-        """
-        Get avalanche warning for a specific region
-        Always attempts to check, returns None if no warning found
-        """
-        try:
-            if not (is_main_season or is_semi_season):
-                print(f"   📅 No avalanche forecasts expected outside warning periods")
-                return None
-            
-            # In production, this would query the actual forecast API
-            # The API call should always be attempted, returning None if no warning found
-            print(f"   📊 Querying avalanche forecast API for region {region_id}")
-            
-            # For development, simulate the API behavior
-            current_month = datetime.now().month
-            return self._generate_seasonal_mock_data(0, 0, current_month, is_main_season, is_semi_season)
-            
-        except Exception as e:
-            print(f"   🚫 Error fetching regional warning: {e}")
+        region_index = get_avalanche_region_index()
+        if region_index is None:
             return None
+        
+        region = region_index.lookup(lat, lon, config.AVALANCHE_REGION_FALLBACK_KM)
+        return region['id'] if region else None
     
     def _generate_forecast_text(self, danger_level, problems):
         """
@@ -314,11 +332,26 @@ class VarsomClient:
         
         return max(0, min(100, base_score))  # Keep between 0-100
     
-    def get_recent_observations(self, lat, lon, days_back=7):
+    def get_recent_observations(self, lat, lon, days_back=7, radius_km=None):
         """
         Get recent avalanche observations in the area
+        Reads the locally ingested RegObs store (python worker.py ingest-regobs) - no network calls
+        
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            days_back (int): How many days back to include
+            radius_km (float): Search radius (uses config default if None)
+            
+        Returns:
+            list: Observations nearest first, each with 'date', 'type', 'description' and 'distance_km'
         """
         try:
+            if not getattr(config, 'MOCK_API_DATA', True):
+                return self.observation_store.query(
+                    lat, lon, radius_km or config.REGOBS_SEARCH_RADIUS_KM, days_back
+                )
+            
             # Check for any warning periods
             current_month = datetime.now().month
             is_warning_period = current_month in [12, 1, 2, 3, 4, 5, 6, 10, 11]
@@ -326,8 +359,7 @@ class VarsomClient:
             if not is_warning_period:
                 return []  # No observations outside warning periods
             
-            # In production, query RegObs API for recent observations
-            # For prototype, return mock recent activity only during warning periods
+            # For development, return mock recent activity only during warning periods
             
             import random
             observations = []
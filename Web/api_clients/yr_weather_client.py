@@ -3,112 +3,245 @@
 Yr.no weather API client
 """
 
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
 import requests
 import config
+from api_clients.http_transport import get_transport
+from api_clients.singleflight import SingleFlight
+from utils.distance_calculator import KM_PER_DEGREE_LAT
+from utils.forecast_columns import ForecastColumns
+
+class ForecastCache:
+    """
+    In-memory cache of Yr.no forecasts keyed by rounded coordinates
+    Stores the parsed payload together with the Expires and Last-Modified headers
+    """
 
-class YrWeatherClient:
     def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, cache_key):
+        """Get cache entry dict ('data', 'expires', 'last_modified') or None"""
+        with self._lock:
+            return self._entries.get(cache_key)
+
+    def put(self, cache_key, data, expires, last_modified):
+        """Store a freshly downloaded forecast"""
+        with self._lock:
+            self._entries[cache_key] = {
+                'data': data,
+                'expires': expires,
+                'last_modified': last_modified
+            }
+
+    def refresh(self, cache_key, expires, last_modified=None):
+        """Extend an entry after a 304 Not Modified revalidation"""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry:
+                entry['expires'] = expires
+                if last_modified:
+                    entry['last_modified'] = last_modified
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+def quantize_to_grid_cell(lat, lon, cell_km=None):
+    """
+    Map coordinates to the centre of their forecast grid cell
+    met.no's model grid is about 2.5 km, so nearby points get the same forecast anyway
+    
+    Args:
+        lat (float): Latitude
+        lon (float): Longitude
+        cell_km (float): Cell size in km (uses config default if None)
+        
+    Returns:
+        tuple: (lat, lon) of the cell centre, rounded to 4 decimals
+    """
+    cell_km = cell_km or config.WEATHER_GRID_CELL_KM
+    
+    lat_step = cell_km / KM_PER_DEGREE_LAT
+    cell_lat = (math.floor(float(lat) / lat_step) + 0.5) * lat_step
+    
+    # Longitude degrees shrink towards the pole, so widen the step to keep cells square
+    lon_step = cell_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(cell_lat)))
+    cell_lon = (math.floor(float(lon) / lon_step) + 0.5) * lon_step
+    
+    return round(cell_lat, 4), round(cell_lon, 4)
+
+# Shared by every YrWeatherClient in the process
+_shared_forecast_cache = ForecastCache()
+_cell_flights = SingleFlight("Yr forecast")
+
+class YrWeatherClient:
+    def __init__(self, forecast_cache=None):
         self.api_url = config.YR_WEATHER_API
+        self.transport = get_transport()
         self.headers = {
             'User-Agent': config.USER_AGENT
         }
-        self.last_modified = {}  # Cache for If-Modified-Since headers
-    
+        self.forecast_cache = forecast_cache or _shared_forecast_cache
+
     def get_weather_forecast(self, lat, lon, location_name=""):
         """
         Get weather forecast for a specific location using Yr.no API
+        Locations in the same forecast grid cell share one request and cache entry
         
         Args:
-            lat (float): Latitude (max 4 decimals as per API requirements)
-            lon (float): Longitude (max 4 decimals as per API requirements)
+            lat (float): Latitude
+            lon (float): Longitude
             location_name (str): Name for logging purposes
             
         Returns:
             dict: Weather data from API, or None if failed
         """
-        # Round coordinates to 4 decimals as required by API
-        lat = round(float(lat), 4)
-        lon = round(float(lon), 4)
-        
+        # Snap to the model grid cell (already rounded to the API's 4 decimals)
+        lat, lon = quantize_to_grid_cell(lat, lon)
+        cache_key = f"{lat},{lon}"
+
+        # Concurrent lookups for the same cell share one cache check and download
+        return _cell_flights.do(cache_key, self._get_cell_forecast, lat, lon, cache_key, location_name)
+
+    def _get_cell_forecast(self, lat, lon, cache_key, location_name):
+        """Get the forecast for one grid cell from the cache or Yr.no"""
+        cached = self.forecast_cache.get(cache_key)
+
+        # Fresh cache entry - no network call needed
+        if cached and cached['expires'] > time.time():
+            if location_name:
+                print(f"🌤️  Using cached weather for {location_name} ({lat}, {lon})")
+            return cached['data']
+
         try:
             params = {
                 'lat': lat,
                 'lon': lon
             }
-            
-            # Add If-Modified-Since header if we have cached data
-            cache_key = f"{lat},{lon}"
+
+            # Revalidate expired entries with If-Modified-Since
             headers = self.headers.copy()
-            if cache_key in self.last_modified:
-                headers['If-Modified-Since'] = self.last_modified[cache_key]
-            
+            if cached and cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
             if location_name:
                 print(f"🌤️  Fetching weather for {location_name} ({lat}, {lon})...")
-            
-            response = requests.get(self.api_url, headers=headers, params=params)
-            
-            if response.status_code == 304:
+
+            response = self.transport.get(self.api_url, params=params, headers=headers)
+
+            if response.status_code == 304 and cached:
                 if location_name:
                     print(f"   Data not modified for {location_name}")
-                return None  # Data hasn't changed
-            
+                self.forecast_cache.refresh(
+                    cache_key, self._parse_expires(response.headers),
+                    response.headers.get('Last-Modified')
+                )
+                return cached['data']  # Data hasn't changed - reuse cached body
+
             response.raise_for_status()
-            
-            # Store Last-Modified header for future requests
-            if 'Last-Modified' in response.headers:
-                self.last_modified[cache_key] = response.headers['Last-Modified']
-            
+
             # Check if this is beta/deprecated (status 203)
             if response.status_code == 203:
                 print(f"⚠️  Warning: API returned 203 for {location_name} - product may be beta/deprecated")
-            
-            return response.json()
-            
+
+            data = response.json()
+            self.forecast_cache.put(
+                cache_key, data, self._parse_expires(response.headers),
+                response.headers.get('Last-Modified')
+            )
+            return data
+
         except requests.exceptions.RequestException as e:
             print(f"🚫 Error fetching weather data for {location_name}: {e}")
+            if cached:
+                print(f"   Using stale cached weather for {location_name}")
+                return cached['data']
             return None
+
+    def _parse_expires(self, headers):
+        """
+        Get expiry time (epoch seconds) from the Expires response header
+        Falls back to CACHE_DURATION_MINUTES if the header is missing or invalid
+        """
+        expires_header = headers.get('Expires')
+        if expires_header:
+            try:
+                return parsedate_to_datetime(expires_header).timestamp()
+            except (TypeError, ValueError):
+                pass
+        return time.time() + config.CACHE_DURATION_MINUTES * 60
+
+    def _temperature_offset(self, weather_data, elevation):
+        """
+        Temperature correction (Celsius) from the grid cell's model height to the requester's elevation
+        Uses the standard atmosphere lapse rate; 0 if either height is unknown
+        """
+        if elevation is None:
+            return 0
+        try:
+            model_altitude = weather_data['geometry']['coordinates'][2]
+        except (KeyError, IndexError, TypeError):
+            return 0
+        return (model_altitude - elevation) * config.TEMPERATURE_LAPSE_RATE
     
-    def extract_weather_summary(self, weather_data):
+    def get_forecast_columns(self, weather_data, elevation=None):
+        """
+        Convert a Yr.no API response to columnar arrays for window aggregation
+        
+        Args:
+            weather_data (dict): Raw weather data from API
+            elevation (float): Elevation of the requester in meters
+            
+        Returns:
+            ForecastColumns: Forecast arrays with elevation-corrected temperatures
+        """
+        return ForecastColumns.from_yr(weather_data, self._temperature_offset(weather_data, elevation))
+    
+    def extract_weather_summary(self, weather_data, elevation=None):
         """
         Extract useful weather information from Yr.no API response
         
         Args:
             weather_data (dict): Raw weather data from API
+            elevation (float): Elevation of the requester in meters - temperatures are
+                               corrected from the grid cell's model height if given
             
         Returns:
             dict: Processed weather summary, or None if failed
         """
         try:
-            timeseries = weather_data['properties']['timeseries']
-            
-            # Get current weather (first time point)
-            current = timeseries[0]['data']['instant']['details']
-            
-            # Get next 24 hours for daily summary
-            next_24h = timeseries[:24] if len(timeseries) >= 24 else timeseries
+            columns = self.get_forecast_columns(weather_data, elevation)
             
-            # Calculate averages for next 24 hours
-            temps = [t['data']['instant']['details']['air_temperature'] for t in next_24h]
-            precip = []
-            
-            for t in next_24h:
-                if 'next_1_hours' in t['data']:
-                    precip_amount = t['data']['next_1_hours']['details'].get('precipitation_amount', 0)
-                    precip.append(precip_amount)
+            # Next 24 hours from the first time step
+            start = datetime.fromtimestamp(int(columns.times[0]), timezone.utc)
+            next_24h = columns.aggregate(start, start + timedelta(hours=24))
             
             summary = {
-                'current_temp': current.get('air_temperature'),
-                'current_humidity': current.get('relative_humidity'),
-                'current_wind_speed': current.get('wind_speed'),
-                'avg_temp_24h': sum(temps) / len(temps) if temps else None,
-                'max_temp_24h': max(temps) if temps else None,
-                'min_temp_24h': min(temps) if temps else None,
-                'total_precipitation_24h': sum(precip) if precip else 0,
-                'precipitation_hours': len([p for p in precip if p > 0]) if precip else 0
+                'current_temp': _optional_float(columns.temperature[0]),
+                'current_humidity': _optional_float(columns.humidity[0]),
+                'current_wind_speed': _optional_float(columns.wind_speed[0]),
+                'cloud_cover_percentage': _optional_float(columns.cloud_cover[0]),
+                'avg_temp_24h': next_24h['avg_temp'],
+                'max_temp_24h': next_24h['max_temp'],
+                'min_temp_24h': next_24h['min_temp'],
+                'total_precipitation_24h': next_24h['total_precipitation'],
+                'precipitation_hours': next_24h['precipitation_hours'],
+                'forecast_windows': columns.summarize_windows()
             }
             
             return summary
             
-        except (KeyError, IndexError, TypeError) as e:
+        except (KeyError, IndexError, TypeError, ValueError) as e:
             print(f"🚫 Error extracting weather summary: {e}")
-            return None
\ No newline at end of file
+            return None
+
+def _optional_float(value):
+    """Convert a NumPy value to float, with None for missing (NaN) values"""
+    return None if math.isnan(value) else float(value)
\ No newline at end of file
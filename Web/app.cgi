@@ -139,7 +139,7 @@ try:
         try:
             # Get data from session
             user_profile_dict = session['user_profile']
-            user_profile = UserProfile(**user_profile_dict)
+            user_profile = UserProfile.from_dict(user_profile_dict)
             start_location = session['start_location']
             max_hours = session.get('max_hours', 3)
             
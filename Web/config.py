@@ -24,7 +24,12 @@ DRIVING_DISTANCES = {
 }
 
 # Average driving speed for time estimates (km/h)
-AVERAGE_DRIVING_SPEED = 70
+AVERAGE_DRIVING_SPEED = 70    # km/h straight-line, beyond the DRIVING_DISTANCES table
+MAX_STRAIGHT_LINE_SPEED_KMH = 100  # No drive covers straight-line distance faster; bounds radius prefilters
+
+# Road travel times (build with: python worker.py build-travel-times)
+TRAVEL_TIME_CELL_KM = 10      # Starting locations in the same cell share a row
+TRAVEL_TIME_MAX_ACCESS_KM = 40  # Origin cells farther than this from any road node are left out
 
 # Scoring parameters - Enhanced for ski touring
 WEATHER_SCORE_MAX = 100
@@ -66,14 +71,48 @@ AVALANCHE_PENALTIES = {
 # File paths
 DESTINATIONS_FILE = "data/ski_destinations.json"
 TERRAIN_TYPES_FILE = "data/terrain_types.json"
+AVALANCHE_REGIONS_FILE = "data/avalanche_regions.geojson"  # Simplified Varsom forecast region polygons
+SKI_TOURS_FILE = "data/enhanced_ski_tours.json"
+ROAD_NETWORK_FILE = "data/road_network.json"  # Main roads and ferries for the travel time build
+PLACE_NAMES_FILE = "data/place_names.json"  # Autocomplete index (rebuild with: python worker.py build-place-index)
 RESULTS_DIR = "data/results"
 
 # API rate limiting (seconds between requests)
-API_DELAY = 0.7  # Slightly longer for multiple APIs
+API_DELAY = 0.7  # Fallback quota for hosts missing from API_RATE_LIMITS
+
+# Per-host request quotas shared by all processes: (requests per second, burst size)
+API_RATE_LIMITS = {
+    'api.met.no': (10, 20),       # met.no allows up to 20 req/s per application
+    'ws.geonorge.no': (5, 10),
+    'api01.nve.no': (5, 10),
+    'api.regobs.no': (5, 10),
+    'thredds.met.no': (2, 4)
+}
+
+# HTTP transport settings (shared by all API clients)
+API_CONNECT_TIMEOUT = 5       # Seconds to establish a connection
+API_READ_TIMEOUT = 30         # Seconds to wait for a response
+API_RETRIES = 3               # Retries on connection errors, 429 and 5xx
+API_BACKOFF_FACTOR = 0.5      # Exponential backoff base (0.5s, 1s, 2s, ...)
+API_BACKOFF_JITTER = 0.5      # Max random seconds added to each backoff
+API_POOL_MAXSIZE = 4          # Default keep-alive connections per host
+API_HOST_POOL_SIZES = {       # Per-host connection pool limits
+    'api.met.no': 8,
+    'ws.geonorge.no': 4,
+    'api01.nve.no': 4,
+    'api.regobs.no': 4,
+    'thredds.met.no': 2
+}
+API_MAX_WORKERS = 8           # Threads used to fetch conditions for many locations at once
+
+# Weather grid settings
+WEATHER_GRID_CELL_KM = 2.5    # met.no forecast model grid spacing - one request per cell
+TEMPERATURE_LAPSE_RATE = 0.0065  # Degrees Celsius per meter of elevation
 
 # Default search parameters
 DEFAULT_MAX_RESULTS = 8
 DEFAULT_KARTVERKET_RESULTS = 5
+PLACE_TYPE_RANKING = ["By", "Tettsted", "Fjell", "Topp", "Fjellområde", "Bygd"]  # Autocomplete order; other types are not indexed
 
 # User profile defaults
 DEFAULT_USER_PROFILE = {
@@ -116,9 +155,40 @@ LOG_FILE = "logs/ski_touring.log"
 ENABLE_API_LOGGING = True     # Log API calls for debugging
 
 # Cache settings (for production)
-ENABLE_CACHING = False        # Enable caching to reduce API calls
+ENABLE_CACHING = True         # Enable caching to reduce API calls
 CACHE_DURATION_MINUTES = 30   # How long to cache weather/snow data
 CACHE_DIR = "cache"
+CACHE_TTL_MINUTES = {         # Per-source time to live (others use CACHE_DURATION_MINUTES)
+    'weather': 30,            # Forecasts update roughly every hour
+    'snow': 180,              # SeNorge grids are daily
+    'geocoding': 7 * 24 * 60  # Place names hardly ever move
+}
+CACHE_MAX_ENTRIES = 10000     # Entries closest to expiry are evicted beyond this
+CACHE_EVICT_INTERVAL = 200    # Writes per process between eviction passes (the table may briefly exceed the limit)
+GEOCODING_CACHE_SIZE = 2000   # In-memory LRU entries in front of the persisted geocoding table
+GEOCODING_NEGATIVE_TTL_MINUTES = 60  # "Not found" answers are retried after this
+GEOCODING_WARM_ENTRIES = 200  # Most frequent queries preloaded on startup and refreshed by the worker
+
+# seNorge snow grids (run with: python worker.py ingest-snow)
+SENORGE_SNOW_DEPTH_URL = SENORGE_THREDDS_BASE + "/dodsC/senorge/seNorge_snow/sd/sd_{year}.nc"
+SENORGE_NEW_SNOW_URL = SENORGE_THREDDS_BASE + "/dodsC/senorge/seNorge_snow/fsd/fsd_{year}.nc"
+SENORGE_SNOW_DEPTH_VARIABLE = "snow_depth"    # mm
+SENORGE_NEW_SNOW_VARIABLE = "fresh_snow_depth"  # mm per day
+SENORGE_MAX_GRID_AGE_DAYS = 3  # Older grids are ignored and estimated data is used
+
+# RegObs observations (run with: python worker.py ingest-regobs)
+REGOBS_SEARCH_RADIUS_KM = 15   # Default radius for nearby observations
+REGOBS_RETENTION_DAYS = 14     # Older observations are dropped at ingestion
+
+# Avalanche warnings (run with: python worker.py ingest-avalanche)
+AVALANCHE_WARNING_TTL_MINUTES = 15  # Region warnings are re-read from the store after this (picks up updates)
+AVALANCHE_REGION_FALLBACK_KM = 50   # Points outside every region outline use the nearest region within this distance
+
+# Background weather prefetch (run with: python worker.py prefetch)
+PREFETCH_INTERVAL_MINUTES = 60  # met.no updates locationforecast about once an hour
+PREFETCH_OFFSET_MINUTES = 5     # Refresh a little after each update cycle starts
+PREFETCH_MAX_AGE_MINUTES = 120  # Older snapshots are ignored and analysis runs in the request
+PREFETCH_POINTS_PER_REGION = 3  # Monitoring points analyzed per region
 
 # Development/testing settings
 MOCK_API_DATA = False          # Use mock data instead of real API calls (for testing)
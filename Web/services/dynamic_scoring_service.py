@@ -4,12 +4,48 @@ Dynamic scoring system that adapts to user preferences and handles missing data
 Enhanced to work with enhanced_snow_depth_service and latest updates
 """
 
+import heapq
 import json
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from services.user_personality_quiz import UserProfile
-from services.enhanced_snow_depth_service import EnhancedSnowDepthService, SnowDepthAnalysis
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+from dataclasses import dataclass, fields, replace
+import numpy as np
+from api_clients.singleflight import SingleFlight
+from services.user_personality_quiz import PROFILE_CACHE_ENTRIES, UserProfile
+from services.enhanced_snow_depth_service import EnhancedSnowDepthService, SnowDepthAnalysis, SnowDepthBatch
+from services.weather_prefetch_service import forecast_cycle
+from utils.distance_calculator import calculate_driving_time
 from utils.file_manager import load_json_file
+from utils.lazy_text import LazyText
+import config
+
+# Category codes used in ScoringFeatures (-1 for anything else)
+TEMPERATURE_TRENDS = ('stable', 'cooling', 'warming', 'unknown')  # 'unknown' (not measured) scores neutral
+WIND_EFFECTS = ('minimal', 'moderate', 'significant', 'unknown')
+
+# Avalanche safety by danger level (unknown levels count as 50)
+AVALANCHE_BASE_SCORES = {
+    1: 100,  # Low danger - generally safe
+    2: 80,   # Moderate danger - heightened awareness
+    3: 50,   # Considerable danger - dangerous conditions
+    4: 20,   # High danger - very dangerous
+    5: 0     # Very high danger - avoid avalanche terrain
+}
+
+RISK_ADJUSTMENTS = {
+    'conservative': {'multiplier': 1.0, 'penalty_increase': 1.5},
+    'moderate': {'multiplier': 1.0, 'penalty_increase': 1.0},
+    'aggressive': {'multiplier': 0.8, 'penalty_increase': 0.7}
+}
+
+AVALANCHE_PROBLEM_PENALTIES = {
+    'persistent_weak_layer': -15,  # Very concerning
+    'wind_slab': -8,               # Manageable with route choice
+    'new_snow': -8,                # Temporary problem
+    'wet_snow': -5                 # Timing dependent
+}
 
 @dataclass
 class ScoringResult:
@@ -23,9 +59,161 @@ class ScoringResult:
     view_terrain_score: float
     distance_score: float
     within_range: bool
-    personalized_summary: str
+    explanation: LazyText  # Personalized summary, formatted only when the result is shown
     avalanche_data_available: bool  # Track if avalanche data was available
     snow_depth_analysis: Optional[SnowDepthAnalysis] = None  # NEW: Enhanced snow analysis
+    
+    @property
+    def personalized_summary(self) -> str:
+        return self.explanation.text
+    
+    def to_dict(self) -> Dict:
+        """Fields with the summary formatted, as saved with results"""
+        data = {field.name: getattr(self, field.name) for field in fields(self) if field.name != 'explanation'}
+        data['personalized_summary'] = self.personalized_summary
+        return data
+
+@dataclass
+class ScoringFeatures:
+    """Scoring inputs of many candidates as columns, one NumPy array per feature (aligned with the candidates)"""
+    names: List[str]
+    # Weather (rows without weather data get a neutral score)
+    has_weather: np.ndarray
+    avg_temp: np.ndarray
+    precipitation: np.ndarray
+    wind_speed: np.ndarray
+    humidity: np.ndarray
+    # Snow (rows without snow data get a low score and no depth analysis)
+    has_snow: np.ndarray
+    snow_depth: np.ndarray
+    snowfall_3days: np.ndarray
+    temperature_trend: np.ndarray  # Index into TEMPERATURE_TRENDS
+    wind_effect: np.ndarray  # Index into WIND_EFFECTS
+    snow_reference_elevation: np.ndarray  # Elevation of the snow measurement
+    start_elevation: np.ndarray
+    summit_elevation: np.ndarray
+    # Avalanche (rows without a warning have their weight redistributed)
+    has_avalanche: np.ndarray
+    danger_level: np.ndarray
+    avalanche_problem_penalty: np.ndarray  # Sum of problem penalties before risk tolerance
+    # Terrain and distance
+    view_score: np.ndarray
+    view_multiplier: np.ndarray  # From the terrain type configuration
+    terrain_type: np.ndarray  # Terrain type names (object array)
+    access: np.ndarray  # Access type names (object array)
+    distance_km: np.ndarray
+    driving_hours: np.ndarray  # NaN where unknown
+
+    def __len__(self):
+        return len(self.names)
+
+@dataclass
+class BatchScores:
+    """Scores of a ScoringFeatures batch, one array per component (avalanche score is NaN without data)"""
+    total_score: np.ndarray
+    weather_score: np.ndarray
+    snow_score: np.ndarray
+    avalanche_score: np.ndarray
+    view_terrain_score: np.ndarray
+    distance_score: np.ndarray
+    within_range: np.ndarray
+    snow_analysis: SnowDepthBatch  # Only meaningful where the features have snow data
+
+    def ranking(self) -> np.ndarray:
+        """Candidate positions by total score, highest first (ties keep input order)"""
+        return np.argsort(-self.total_score, kind='stable')
+
+@dataclass
+class ConditionTable:
+    """
+    Component scores that don't depend on the user, one array per column (aligned with the destinations)
+    Built once per forecast cycle and shared by every request; score_conditions
+    only applies the user's multipliers and weights on top
+    """
+    # Inputs, kept for the personalized summaries
+    destinations: List[dict]
+    weather_data: List[dict]
+    snow_data: List[dict]
+    avalanche_data: List[Optional[dict]]
+    # Weather points
+    has_weather: np.ndarray
+    temp_points: np.ndarray
+    visibility_points: np.ndarray  # Weighted by view priority
+    wind_points: np.ndarray
+    humidity_points: np.ndarray
+    # Snow points and depth analysis factors
+    has_snow: np.ndarray
+    depth_points: np.ndarray
+    fresh_points: np.ndarray  # Weighted by powder priority
+    trend_points: np.ndarray
+    wind_effect_points: np.ndarray
+    walking_factor: np.ndarray  # Penalty for walking to snow
+    damage_factor: np.ndarray  # Penalty for rock damage risk
+    coverage_factor: np.ndarray  # Bonus for excellent coverage
+    snow_analysis: SnowDepthBatch  # Analyzed without walking; skiability is recomputed per user
+    # Avalanche safety score per risk tolerance (NaN without a warning)
+    has_avalanche: np.ndarray
+    avalanche_scores: Dict[str, np.ndarray]
+    # Terrain
+    terrain_view_score: np.ndarray  # View score times the terrain type multiplier
+    terrain_type: np.ndarray
+    access: np.ndarray
+    failed_fetches: int = 0  # Destinations left out or missing data because a fetch failed
+
+    def __len__(self):
+        return len(self.has_weather)
+
+def _optional_column(values: Optional[Sequence[float]], length: int) -> np.ndarray:
+    """Float array of optional values, NaN for None entries (or everywhere if values is None)"""
+    if values is None:
+        return np.full(length, np.nan)
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+@lru_cache(maxsize=2 * PROFILE_CACHE_ENTRIES)
+def _personalized_weights(base_weights: Tuple[Tuple[str, float], ...], user_profile: UserProfile,
+                          avalanche_data_available: bool) -> Mapping[str, float]:
+    """Weights behind DynamicScoringService._calculate_personalized_weights, computed once per profile"""
+    weights = dict(base_weights)
+    
+    # Adjust based on powder priority (0-10 scale)
+    powder_adjustment = (user_profile.powder_priority - 5) * 0.02  # -0.1 to +0.1
+    weights['snow'] += powder_adjustment
+    weights['weather'] -= powder_adjustment * 0.5
+    
+    # Adjust based on view priority
+    view_adjustment = (user_profile.view_priority - 5) * 0.02
+    weights['weather'] += view_adjustment * 0.75  # Clear weather needed for views
+    weights['view_terrain'] += view_adjustment * 0.5
+    weights['snow'] -= view_adjustment * 0.5
+    
+    # Adjust based on safety priority
+    safety_adjustment = (user_profile.safety_priority - 5) * 0.02
+    weights['avalanche'] += safety_adjustment
+    weights['distance'] += safety_adjustment * 0.3  # Prefer closer = safer
+    weights['snow'] -= safety_adjustment * 0.3
+    
+    # Adjust based on adventure seeking
+    adventure_adjustment = (user_profile.adventure_seeking - 5) * 0.01
+    weights['view_terrain'] += adventure_adjustment
+    weights['distance'] -= adventure_adjustment * 0.5  # Willing to travel farther
+    
+    # Handle missing avalanche data by redistributing weight
+    if not avalanche_data_available:
+        avalanche_weight = weights['avalanche']
+        weights['avalanche'] = 0  # Set to 0 since no data
+        
+        # Redistribute avalanche weight proportionally to other components
+        redistribution_factor = avalanche_weight / (1 - avalanche_weight)
+        weights['snow'] += weights['snow'] * redistribution_factor * 0.4  # 40% to snow
+        weights['weather'] += weights['weather'] * redistribution_factor * 0.3  # 30% to weather
+        weights['view_terrain'] += weights['view_terrain'] * redistribution_factor * 0.2  # 20% to terrain
+        weights['distance'] += weights['distance'] * redistribution_factor * 0.1  # 10% to distance
+    
+    # Normalize weights to sum to 1.0
+    total_weight = sum(weights.values())
+    weights = {k: v/total_weight for k, v in weights.items()}
+    
+    return MappingProxyType(weights)
 
 class DynamicScoringService:
     def __init__(self):
@@ -59,7 +247,9 @@ class DynamicScoringService:
                                    snow_data: dict, avalanche_data: Optional[dict], 
                                    distance_km: float, max_distance_km: float,
                                    user_profile: UserProfile, 
-                                   max_walking_hours: float = 0) -> ScoringResult:
+                                   max_walking_hours: float = 0,
+                                   driving_hours: Optional[float] = None,
+                                   max_driving_hours: Optional[float] = None) -> ScoringResult:
         """
         Calculate personalized score for a destination based on user profile
         Enhanced with snow depth analysis and walking requirements
@@ -73,6 +263,8 @@ class DynamicScoringService:
             max_distance_km: Maximum allowed distance
             user_profile: User's personality profile
             max_walking_hours: Maximum hours user is willing to walk
+            driving_hours: Road driving time, if known (shown instead of a distance estimate)
+            max_driving_hours: When given with driving_hours, range and distance score use time instead of km
             
         Returns:
             ScoringResult: Comprehensive scoring result
@@ -104,10 +296,13 @@ class DynamicScoringService:
         snow_score = self._calculate_enhanced_snow_score(snow_data, snow_depth_analysis, user_profile)
         avalanche_score = self._calculate_avalanche_score(avalanche_data, user_profile) if avalanche_data_available else None
         view_terrain_score = self._calculate_view_terrain_score(destination, user_profile)
-        distance_score = self._calculate_distance_score(distance_km, max_distance_km)
-        
-        # Check if within range and skiable
-        within_range = distance_km <= max_distance_km
+        # Check if within range (by road time when known)
+        if driving_hours is not None and max_driving_hours:
+            distance_score = self._calculate_distance_score(driving_hours, max_driving_hours)
+            within_range = driving_hours <= max_driving_hours
+        else:
+            distance_score = self._calculate_distance_score(distance_km, max_distance_km)
+            within_range = distance_km <= max_distance_km
         
         # NEW: Apply penalties for poor snow conditions
         if snow_depth_analysis and not snow_depth_analysis.is_skiable:
@@ -147,15 +342,16 @@ class DynamicScoringService:
             'avalanche': avalanche_score,
             'view_terrain': view_terrain_score,
             'distance': distance_score,
-            'weights_applied': weights,
+            'weights_applied': dict(weights),
             'avalanche_data_available': avalanche_data_available,
             'snow_depth_analyzed': snow_depth_analysis is not None
         }
         
-        # Generate personalized summary with enhanced snow info
-        summary = self._generate_enhanced_personalized_summary(
+        # Personalized summary with enhanced snow info (formatted when shown)
+        summary = LazyText(
+            self._generate_enhanced_personalized_summary,
             destination, weather_data, snow_data, avalanche_data, 
-            distance_km, user_profile, component_scores, snow_depth_analysis
+            distance_km, user_profile, component_scores, snow_depth_analysis, driving_hours
         )
         
         return ScoringResult(
@@ -168,58 +364,497 @@ class DynamicScoringService:
             view_terrain_score=view_terrain_score,
             distance_score=distance_score,
             within_range=within_range,
-            personalized_summary=summary,
+            explanation=summary,
             avalanche_data_available=avalanche_data_available,
             snow_depth_analysis=snow_depth_analysis
         )
     
-    def _calculate_personalized_weights(self, user_profile: UserProfile, 
-                                      avalanche_data_available: bool) -> Dict[str, float]:
+    def score_many(self, destinations: List[dict], weather_data: List[dict], snow_data: List[dict],
+                   avalanche_data: List[Optional[dict]], distances_km: Sequence[float], max_distance_km: float,
+                   user_profile: UserProfile, max_walking_hours: float = 0,
+                   driving_hours: Optional[Sequence[float]] = None,
+                   max_driving_hours: Optional[float] = None) -> List[ScoringResult]:
         """
-        Calculate scoring weights based on user personality
-        Redistributes avalanche weight if no avalanche data available
+        calculate_personalized_score for many destinations, scored in one batch
+        
+        Args:
+            destinations, weather_data, snow_data, avalanche_data: One entry per destination
+            distances_km: Distance to each destination
+            driving_hours: Road driving time per destination, if known
+            (other arguments as in calculate_personalized_score)
+            
+        Returns:
+            list: ScoringResult per destination, in input order
+        """
+        table = self.build_condition_table(destinations, weather_data, snow_data, avalanche_data)
+        return self.score_table(table, distances_km, max_distance_km, user_profile, max_walking_hours,
+                                driving_hours, max_driving_hours)
+    
+    def score_table(self, table: 'ConditionTable', distances_km: Sequence[float], max_distance_km: float,
+                    user_profile: UserProfile, max_walking_hours: float = 0,
+                    driving_hours: Optional[Sequence[float]] = None,
+                    max_driving_hours: Optional[float] = None) -> List[ScoringResult]:
+        """
+        Personalized ScoringResults for every destination of a condition table
+        
+        Args:
+            table: Condition table (e.g. the shared one for the current forecast cycle)
+            distances_km: Distance to each destination of the table
+            driving_hours: Road driving time per destination, if known
+            (other arguments as in calculate_personalized_score)
+            
+        Returns:
+            list: ScoringResult per destination, in table order
+        """
+        distances_km = np.asarray(distances_km, dtype=float)
+        driving_hours = _optional_column(driving_hours, len(table))
+        scores = self.score_conditions(table, user_profile, distances_km, max_distance_km, max_walking_hours,
+                                       driving_hours, max_driving_hours)
+        weights = {
+            True: self._calculate_personalized_weights(user_profile, True),
+            False: self._calculate_personalized_weights(user_profile, False)
+        }
+        
+        results = []
+        for i, destination in enumerate(table.destinations):
+            avalanche_data_available = bool(table.has_avalanche[i])
+            snow_depth_analysis = None
+            if table.has_snow[i]:
+                snow_depth_analysis = self.snow_depth_service.build_analysis(
+                    scores.snow_analysis, i, destination.get('name', 'Unknown')
+                )
+            avalanche_score = float(scores.avalanche_score[i]) if avalanche_data_available else None
+            component_scores = {
+                'weather': float(scores.weather_score[i]),
+                'snow': float(scores.snow_score[i]),
+                'avalanche': avalanche_score,
+                'view_terrain': float(scores.view_terrain_score[i]),
+                'distance': float(scores.distance_score[i]),
+                'weights_applied': dict(weights[avalanche_data_available]),
+                'avalanche_data_available': avalanche_data_available,
+                'snow_depth_analyzed': snow_depth_analysis is not None
+            }
+            destination_driving_hours = None if np.isnan(driving_hours[i]) else float(driving_hours[i])
+            summary = LazyText(
+                self._generate_enhanced_personalized_summary,
+                destination, table.weather_data[i], table.snow_data[i], table.avalanche_data[i],
+                float(distances_km[i]), user_profile, component_scores, snow_depth_analysis,
+                destination_driving_hours
+            )
+            results.append(ScoringResult(
+                destination_name=destination['name'],
+                total_score=float(scores.total_score[i]),
+                component_scores=component_scores,
+                weather_score=component_scores['weather'],
+                snow_score=component_scores['snow'],
+                avalanche_score=avalanche_score,
+                view_terrain_score=component_scores['view_terrain'],
+                distance_score=component_scores['distance'],
+                within_range=bool(scores.within_range[i]),
+                explanation=summary,
+                avalanche_data_available=avalanche_data_available,
+                snow_depth_analysis=snow_depth_analysis
+            ))
+        return results
+    
+    def build_scoring_features(self, destinations: List[dict], weather_data: List[dict], snow_data: List[dict],
+                               avalanche_data: List[Optional[dict]], distances_km: Optional[Sequence[float]] = None,
+                               driving_hours: Optional[Sequence[float]] = None) -> ScoringFeatures:
         """
-        weights = self.base_weights.copy()
-        
-        # Adjust based on powder priority (0-10 scale)
-        powder_adjustment = (user_profile.powder_priority - 5) * 0.02  # -0.1 to +0.1
-        weights['snow'] += powder_adjustment
-        weights['weather'] -= powder_adjustment * 0.5
-        
-        # Adjust based on view priority
-        view_adjustment = (user_profile.view_priority - 5) * 0.02
-        weights['weather'] += view_adjustment * 0.75  # Clear weather needed for views
-        weights['view_terrain'] += view_adjustment * 0.5
-        weights['snow'] -= view_adjustment * 0.5
-        
-        # Adjust based on safety priority
-        safety_adjustment = (user_profile.safety_priority - 5) * 0.02
-        weights['avalanche'] += safety_adjustment
-        weights['distance'] += safety_adjustment * 0.3  # Prefer closer = safer
-        weights['snow'] -= safety_adjustment * 0.3
-        
-        # Adjust based on adventure seeking
-        adventure_adjustment = (user_profile.adventure_seeking - 5) * 0.01
-        weights['view_terrain'] += adventure_adjustment
-        weights['distance'] -= adventure_adjustment * 0.5  # Willing to travel farther
-        
-        # Handle missing avalanche data by redistributing weight
-        if not avalanche_data_available:
-            avalanche_weight = weights['avalanche']
-            weights['avalanche'] = 0  # Set to 0 since no data
+        Collect the scoring inputs of many destinations into columns
+        Uses the same defaults for missing values as calculate_personalized_score
+        
+        Args:
+            destinations, weather_data, snow_data, avalanche_data: One entry per destination
+            distances_km: Distance to each destination (not needed for a condition table)
+            driving_hours: Road driving time per destination (None entries or no list = unknown)
             
-            # Redistribute avalanche weight proportionally to other components
-            redistribution_factor = avalanche_weight / (1 - avalanche_weight)
-            weights['snow'] += weights['snow'] * redistribution_factor * 0.4  # 40% to snow
-            weights['weather'] += weights['weather'] * redistribution_factor * 0.3  # 30% to weather
-            weights['view_terrain'] += weights['view_terrain'] * redistribution_factor * 0.2  # 20% to terrain
-            weights['distance'] += weights['distance'] * redistribution_factor * 0.1  # 10% to distance
+        Returns:
+            ScoringFeatures: Feature arrays aligned with destinations
+        """
+        terrain_config = self.terrain_types.get('terrain_types', {})
+        trend_codes = {name: code for code, name in enumerate(TEMPERATURE_TRENDS)}
+        wind_effect_codes = {name: code for code, name in enumerate(WIND_EFFECTS)}
+        
+        weather_rows, snow_rows, avalanche_rows, terrain_rows = [], [], [], []
+        for destination, weather, snow, avalanche in zip(destinations, weather_data, snow_data, avalanche_data):
+            weather = weather or {}
+            weather_rows.append((
+                bool(weather), weather.get('avg_temp_24h', 0), weather.get('total_precipitation_24h', 0),
+                weather.get('current_wind_speed', 0), weather.get('current_humidity', 50)
+            ))
+            
+            elevation_range = destination.get('elevation_range', [500, 1200])
+            snow = snow or {}
+            snow_rows.append((
+                bool(snow), snow.get('snow_depth_cm', 0), snow.get('snowfall_3days_cm', 0),
+                trend_codes.get(snow.get('temperature_trend', 'stable'), -1),
+                wind_effect_codes.get(snow.get('wind_effect', 'minimal'), -1),
+                snow.get('elevation', 500), elevation_range[0], elevation_range[1]
+            ))
+            
+            if avalanche is None:
+                avalanche_rows.append((False, 3, 0))
+            else:
+                avalanche_rows.append((
+                    True, avalanche.get('danger_level', 3),
+                    sum(AVALANCHE_PROBLEM_PENALTIES.get(problem, 0)
+                        for problem in avalanche.get('avalanche_problems', []))
+                ))
+            
+            terrain_type = destination.get('terrain_type', 'forest_valley')
+            terrain_rows.append((
+                destination.get('view_score', 70),
+                terrain_config.get(terrain_type, {}).get('view_score_multiplier', 1.0),
+                terrain_type, destination.get('access', 'road_access')
+            ))
+        
+        def columns(rows, dtypes):
+            if not rows:
+                return [np.empty(0, dtype=dtype) for dtype in dtypes]
+            return [np.array(column, dtype=dtype) for column, dtype in zip(zip(*rows), dtypes)]
+        
+        has_weather, avg_temp, precipitation, wind_speed, humidity = columns(
+            weather_rows, (bool, float, float, float, float))
+        (has_snow, snow_depth, snowfall_3days, temperature_trend, wind_effect,
+         snow_reference_elevation, start_elevation, summit_elevation) = columns(
+            snow_rows, (bool, float, float, np.int8, np.int8, float, float, float))
+        has_avalanche, danger_level, avalanche_problem_penalty = columns(avalanche_rows, (bool, float, float))
+        view_score, view_multiplier, terrain_type, access = columns(terrain_rows, (float, float, object, object))
+        
+        return ScoringFeatures(
+            names=[destination.get('name', 'Unknown') for destination in destinations],
+            has_weather=has_weather, avg_temp=avg_temp, precipitation=precipitation,
+            wind_speed=wind_speed, humidity=humidity,
+            has_snow=has_snow, snow_depth=snow_depth, snowfall_3days=snowfall_3days,
+            temperature_trend=temperature_trend, wind_effect=wind_effect,
+            snow_reference_elevation=snow_reference_elevation,
+            start_elevation=start_elevation, summit_elevation=summit_elevation,
+            has_avalanche=has_avalanche, danger_level=danger_level,
+            avalanche_problem_penalty=avalanche_problem_penalty,
+            view_score=view_score, view_multiplier=view_multiplier, terrain_type=terrain_type, access=access,
+            distance_km=_optional_column(distances_km, len(destinations)),
+            driving_hours=_optional_column(driving_hours, len(destinations))
+        )
+    
+    def score_batch(self, features: ScoringFeatures, user_profile: UserProfile, max_distance_km: float,
+                    max_walking_hours: float = 0, max_driving_hours: Optional[float] = None) -> BatchScores:
+        """
+        Score every candidate of a feature batch for one user with vectorized threshold logic
+        Mirrors calculate_personalized_score component by component, so the totals
+        (and therefore rankings) are the same as scoring one destination at a time
         
-        # Normalize weights to sum to 1.0
-        total_weight = sum(weights.values())
-        weights = {k: v/total_weight for k, v in weights.items()}
+        Args:
+            features: Candidate features from build_scoring_features
+            user_profile: User's personality profile
+            max_distance_km: Maximum allowed distance
+            max_walking_hours: Maximum hours user is willing to walk
+            max_driving_hours: When given, candidates with known driving hours use time instead of km
+            
+        Returns:
+            BatchScores: Component and total scores aligned with the features
+        """
+        table = self._condition_table_from_features(features, [], [], [], [])
+        return self.score_conditions(table, user_profile, features.distance_km, max_distance_km,
+                                     max_walking_hours, features.driving_hours, max_driving_hours)
+    
+    def build_condition_table(self, destinations: List[dict], weather_data: List[dict], snow_data: List[dict],
+                              avalanche_data: List[Optional[dict]]) -> 'ConditionTable':
+        """
+        Compute the component scores that depend only on the destinations and current conditions
         
-        return weights
+        Args:
+            destinations, weather_data, snow_data, avalanche_data: One entry per destination
+            
+        Returns:
+            ConditionTable: Profile-independent columns, ready for score_conditions with any user
+        """
+        features = self.build_scoring_features(destinations, weather_data, snow_data, avalanche_data)
+        return self._condition_table_from_features(features, list(destinations), list(weather_data),
+                                                   list(snow_data), list(avalanche_data))
+    
+    def _condition_table_from_features(self, f: ScoringFeatures, destinations, weather_data, snow_data,
+                                       avalanche_data) -> 'ConditionTable':
+        # Weather points (visibility is weighted per user)
+        temp, precip, wind = f.avg_temp, f.precipitation, f.wind_speed
+        temp_points = np.select([(-5 <= temp) & (temp <= 5), (-10 <= temp) & (temp <= 10),
+                                 (-15 <= temp) & (temp <= 15)], [40, 30, 20], 10)
+        visibility_points = np.select([precip == 0, precip < 2, precip < 5], [30, 20, 10], 0)
+        wind_points = np.select([wind < 5, wind < 10, wind < 15], [15, 10, 5], 0)
+        humidity_points = np.where((40 <= f.humidity) & (f.humidity <= 70), 15, 0)
+        
+        # Snow points (fresh snow is weighted per user) and depth analysis factors
+        depth, recent = f.snow_depth, f.snowfall_3days
+        depth_points = np.select([depth >= 50, depth >= 30, depth >= 20], [40, 25, 10], 0)
+        fresh_points = np.select([recent >= 30, recent >= 15, recent >= 5], [30, 20, 10], 0)
+        trend_points = np.select([f.temperature_trend == 0, f.temperature_trend == 1, f.temperature_trend == 2,
+                                  f.temperature_trend == 3], [20, 15, 5, 10], 0)
+        wind_effect_points = np.select([f.wind_effect == 0, f.wind_effect == 1, f.wind_effect == 3], [10, 5, 5], 0)
+        
+        analysis = self.snow_depth_service.analyze_many(
+            f.start_elevation, f.summit_elevation, f.snow_depth, f.snow_reference_elevation
+        )
+        walking_time = analysis.walking_time_hours
+        walking_factor = np.where(
+            analysis.walking_required,
+            np.select([walking_time > 2, walking_time > 1, walking_time > 0.5], [0.5, 0.7, 0.9], 1.0),
+            1.0
+        )
+        damage_factor = np.where(analysis.damage_risk, 0.8, 1.0)
+        coverage_factor = np.where((analysis.min_snow_depth > 75) & ~analysis.walking_required, 1.1, 1.0)
+        
+        # Avalanche safety for every risk tolerance
+        level = f.danger_level
+        base_safety = np.select([level == danger for danger in AVALANCHE_BASE_SCORES],
+                                list(AVALANCHE_BASE_SCORES.values()), 50)
+        avalanche_scores = {}
+        for risk_tolerance, adjustment in RISK_ADJUSTMENTS.items():
+            score = np.where(level >= 3, 100 - (100 - base_safety) * adjustment['penalty_increase'], base_safety)
+            score = np.clip(score + f.avalanche_problem_penalty * adjustment['penalty_increase'], 0, 100)
+            avalanche_scores[risk_tolerance] = np.where(f.has_avalanche, score, np.nan)
+        
+        return ConditionTable(
+            destinations=destinations, weather_data=weather_data, snow_data=snow_data,
+            avalanche_data=avalanche_data,
+            has_weather=f.has_weather, temp_points=temp_points, visibility_points=visibility_points,
+            wind_points=wind_points, humidity_points=humidity_points,
+            has_snow=f.has_snow, depth_points=depth_points, fresh_points=fresh_points,
+            trend_points=trend_points, wind_effect_points=wind_effect_points,
+            walking_factor=walking_factor, damage_factor=damage_factor, coverage_factor=coverage_factor,
+            snow_analysis=analysis,
+            has_avalanche=f.has_avalanche, avalanche_scores=avalanche_scores,
+            terrain_view_score=f.view_score * f.view_multiplier,
+            terrain_type=f.terrain_type, access=f.access
+        )
+    
+    def score_conditions(self, table: 'ConditionTable', user_profile: UserProfile, distances_km: np.ndarray,
+                         max_distance_km: float, max_walking_hours: float = 0,
+                         driving_hours: Optional[np.ndarray] = None,
+                         max_driving_hours: Optional[float] = None) -> BatchScores:
+        """
+        Apply one user's preferences to a condition table
+        Only the profile-dependent multipliers, the distance score and the weighted
+        sum are computed here; everything else comes from the table
+        
+        Args:
+            table: Condition table from build_condition_table
+            user_profile: User's personality profile
+            distances_km: Distance to each destination of the table
+            max_distance_km: Maximum allowed distance
+            max_walking_hours: Maximum hours user is willing to walk
+            driving_hours: Road driving hours per destination (NaN where unknown)
+            max_driving_hours: When given, destinations with known driving hours use time instead of km
+            
+        Returns:
+            BatchScores: Component and total scores aligned with the table
+        """
+        t = table
+        distances_km = np.asarray(distances_km, dtype=float)
+        driving_hours = _optional_column(driving_hours, len(t))
+        
+        # Weather and snow: per-user weighting of visibility and fresh snow
+        view_multiplier = 0.5 + (user_profile.view_priority / 10) * 0.5
+        weather_score = np.minimum(t.temp_points + t.visibility_points * view_multiplier +
+                                   t.wind_points + t.humidity_points, 100)
+        weather_score = np.where(t.has_weather, weather_score, 50.0)
+        
+        powder_multiplier = 0.5 + (user_profile.powder_priority / 10) * 0.5
+        snow_score = np.minimum(t.depth_points + t.fresh_points * powder_multiplier +
+                                t.trend_points + t.wind_effect_points, 100)
+        snow_score = snow_score * t.walking_factor * t.damage_factor * t.coverage_factor
+        snow_score = np.where(t.has_snow, np.minimum(snow_score, 100), 30.0)
+        
+        avalanche_score = t.avalanche_scores.get(user_profile.risk_tolerance, t.avalanche_scores['moderate'])
+        
+        view_terrain_score = self._view_terrain_scores(t.terrain_view_score, t.terrain_type, t.access, user_profile)
+        distance_score, within_range = self._distance_scores(distances_km, max_distance_km,
+                                                             driving_hours, max_driving_hours)
+        
+        # Poor snow penalties (skiability depends on the user's walking tolerance)
+        is_skiable = self.snow_depth_service.skiable_within(t.snow_analysis, max_walking_hours)
+        not_skiable = t.has_snow & ~is_skiable
+        snow_score = np.where(not_skiable, snow_score * 0.3,
+                              np.where(t.has_snow & t.snow_analysis.damage_risk, snow_score * 0.7, snow_score))
+        within_range &= ~not_skiable
+        
+        # Personalized weighting (avalanche weight redistributed where there is no warning)
+        with_avalanche = self._calculate_personalized_weights(user_profile, True)
+        without_avalanche = self._calculate_personalized_weights(user_profile, False)
+        total_with_avalanche = (
+            weather_score * with_avalanche['weather'] +
+            snow_score * with_avalanche['snow'] +
+            avalanche_score * with_avalanche['avalanche'] +
+            view_terrain_score * with_avalanche['view_terrain'] +
+            distance_score * with_avalanche['distance']
+        )
+        total_without_avalanche = (
+            weather_score * without_avalanche['weather'] +
+            snow_score * without_avalanche['snow'] +
+            view_terrain_score * without_avalanche['view_terrain'] +
+            distance_score * without_avalanche['distance']
+        )
+        total_score = np.where(t.has_avalanche, total_with_avalanche, total_without_avalanche)
+        total_score = np.where(within_range, total_score, total_score * 0.7)
+        
+        return BatchScores(
+            total_score=total_score,
+            weather_score=weather_score,
+            snow_score=snow_score,
+            avalanche_score=avalanche_score,
+            view_terrain_score=view_terrain_score,
+            distance_score=distance_score,
+            within_range=within_range,
+            snow_analysis=replace(t.snow_analysis, is_skiable=is_skiable)
+        )
+    
+    def _view_terrain_scores(self, terrain_view_score: np.ndarray, terrain_type: np.ndarray, access: np.ndarray,
+                             user_profile: UserProfile) -> np.ndarray:
+        """Vectorized _calculate_view_terrain_score"""
+        terrain_score = np.where(terrain_type == user_profile.terrain_preference,
+                                 terrain_view_score + 15, terrain_view_score)
+        view_terrain_score = terrain_score * (0.3 + (user_profile.view_priority / 10) * 0.7)
+        access_bonus = np.zeros(len(terrain_view_score))
+        for access_type, bonus in self._access_adjustments(user_profile).items():
+            access_bonus[access == access_type] = bonus
+        return np.clip(view_terrain_score + access_bonus, 0, 100)
+    
+    def _distance_scores(self, distances_km: np.ndarray, max_distance_km: float, driving_hours: np.ndarray,
+                         max_driving_hours: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized distance score and range check (by road time where known)
+        
+        Returns:
+            tuple: (distance scores, within range flags)
+        """
+        by_time = ~np.isnan(driving_hours) if max_driving_hours else np.zeros(len(distances_km), dtype=bool)
+        measure = np.where(by_time, driving_hours, distances_km)
+        limit = np.where(by_time, max_driving_hours or 0, max_distance_km)
+        within_range = measure <= limit
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance_score = np.where(within_range, 100 * (1 - measure / limit), 0.0)
+        return distance_score, within_range
+    
+    def score_upper_bounds(self, destinations: List[dict], distances_km: Sequence[float], max_distance_km: float,
+                           user_profile: UserProfile, driving_hours: Optional[Sequence[float]] = None,
+                           max_driving_hours: Optional[float] = None) -> np.ndarray:
+        """
+        Highest total score each destination could reach under any conditions
+        View/terrain and distance come from static attributes; weather, snow and
+        avalanche safety are taken at their best possible values, with or without
+        an avalanche warning, so no real score can exceed the bound
+        
+        Returns:
+            np.ndarray: Upper bound of the total score per destination
+        """
+        n = len(destinations)
+        features = self.build_scoring_features(destinations, [None] * n, [None] * n, [None] * n,
+                                               distances_km, driving_hours)
+        view_terrain_score = self._view_terrain_scores(features.view_score * features.view_multiplier,
+                                                       features.terrain_type, features.access, user_profile)
+        distance_score, within_range = self._distance_scores(features.distance_km, max_distance_km,
+                                                             features.driving_hours, max_driving_hours)
+        
+        # Best points of every threshold (perfect temperature, clear, calm, deep fresh snow, danger level 1)
+        view_multiplier = 0.5 + (user_profile.view_priority / 10) * 0.5
+        best_weather = min(40 + 30 * view_multiplier + 15 + 15, 100)
+        powder_multiplier = 0.5 + (user_profile.powder_priority / 10) * 0.5
+        best_snow = min(min(40 + 30 * powder_multiplier + 20 + 10, 100) * 1.1, 100)
+        
+        with_avalanche = self._calculate_personalized_weights(user_profile, True)
+        without_avalanche = self._calculate_personalized_weights(user_profile, False)
+        bound_with_avalanche = (
+            best_weather * with_avalanche['weather'] +
+            best_snow * with_avalanche['snow'] +
+            100 * with_avalanche['avalanche'] +
+            view_terrain_score * with_avalanche['view_terrain'] +
+            distance_score * with_avalanche['distance']
+        )
+        bound_without_avalanche = (
+            best_weather * without_avalanche['weather'] +
+            best_snow * without_avalanche['snow'] +
+            view_terrain_score * without_avalanche['view_terrain'] +
+            distance_score * without_avalanche['distance']
+        )
+        bound = np.maximum(bound_with_avalanche, bound_without_avalanche)
+        return np.where(within_range, bound, bound * 0.7)
+    
+    def rank_top_k(self, destinations: List[dict], k: int,
+                   fetch_conditions: Callable[[List[int]], List[Optional[Tuple[dict, dict, Optional[dict]]]]],
+                   distances_km: Sequence[float], max_distance_km: float, user_profile: UserProfile,
+                   max_walking_hours: float = 0, driving_hours: Optional[Sequence[float]] = None,
+                   max_driving_hours: Optional[float] = None) -> List[Tuple[int, ScoringResult]]:
+        """
+        The k best destinations, fetching conditions only for those that can still make it
+        Destinations are fetched and scored in order of their upper bound, a chunk at a
+        time; once no remaining bound can beat the k-th best score the rest are skipped
+        
+        Args:
+            destinations: Destination dicts (static attributes only)
+            k: Number of results wanted
+            fetch_conditions: Called with destination positions, returns (weather, snow, avalanche)
+                              per position, or None where fetching failed
+            distances_km: Distance to each destination
+            driving_hours: Road driving time per destination, if known
+            (other arguments as in calculate_personalized_score)
+            
+        Returns:
+            list: (destination position, ScoringResult), best first - the same as the first k
+                  of a full ranking by total score
+        """
+        if k <= 0 or not destinations:
+            return []
+        distances_km = np.asarray(distances_km, dtype=float)
+        driving_hours = _optional_column(driving_hours, len(destinations))
+        bounds = self.score_upper_bounds(destinations, distances_km, max_distance_km, user_profile,
+                                         driving_hours, max_driving_hours)
+        order = np.argsort(-bounds, kind='stable').tolist()
+        chunk_size = max(k, config.API_MAX_WORKERS)
+        
+        best = []  # Min-heap of (score, -position): the worst of the k best so far on top
+        results = {}
+        fetched = 0
+        for start in range(0, len(order), chunk_size):
+            threshold = best[0][0] if len(best) == k else -np.inf
+            chunk = [position for position in order[start:start + chunk_size] if bounds[position] >= threshold]
+            if not chunk:
+                break  # Bounds are sorted, so nothing later can enter the top k either
+            
+            fetched += len(chunk)
+            scored = [(position, conditions) for position, conditions in zip(chunk, fetch_conditions(chunk))
+                      if conditions is not None]
+            if not scored:
+                continue
+            positions = [position for position, _ in scored]
+            weather, snow, avalanche = (list(column) for column in zip(*(conditions for _, conditions in scored)))
+            table = self.build_condition_table([destinations[p] for p in positions], weather, snow, avalanche)
+            chunk_results = self.score_table(table, distances_km[positions], max_distance_km, user_profile,
+                                             max_walking_hours, driving_hours[positions], max_driving_hours)
+            
+            for position, result in zip(positions, chunk_results):
+                entry = (result.total_score, -position)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+                else:
+                    continue
+                results[position] = result
+        
+        if fetched < len(destinations):
+            print(f"   ✂️  Top {k}: fetched conditions for {fetched} of {len(destinations)} destinations")
+        ranked = sorted(best, reverse=True)
+        return [(-negative_position, results[-negative_position]) for _, negative_position in ranked]
+    
+    def _calculate_personalized_weights(self, user_profile: UserProfile, 
+                                      avalanche_data_available: bool) -> Mapping[str, float]:
+        """
+        Calculate scoring weights based on user personality
+        Redistributes avalanche weight if no avalanche data available
+        
+        Returns:
+            Read-only weights, shared by every call with the same profile
+        """
+        return _personalized_weights(tuple(self.base_weights.items()), user_profile, avalanche_data_available)
     
     def _calculate_weather_score(self, weather_data: dict, user_profile: UserProfile) -> float:
         """Calculate weather score with user preference weighting"""
@@ -341,6 +976,8 @@ class DynamicScoringService:
             score += 15
         elif temp_trend == 'warming':
             score += 5
+        elif temp_trend == 'unknown':
+            score += 10  # Not measured (seNorge grids) - neutral
         
         # Wind Impact (10 points max)
         wind_effect = snow_data.get('wind_effect', 'minimal')
@@ -348,6 +985,8 @@ class DynamicScoringService:
             score += 10
         elif wind_effect == 'moderate':
             score += 5
+        elif wind_effect == 'unknown':
+            score += 5  # Not measured (seNorge grids) - neutral
         
         return min(score, 100)
     
@@ -362,24 +1001,10 @@ class DynamicScoringService:
         danger_level = avalanche_data.get('danger_level', 3)
         
         # Base safety scores by danger level
-        base_safety_scores = {
-            1: 100,  # Low danger - generally safe
-            2: 80,   # Moderate danger - heightened awareness
-            3: 50,   # Considerable danger - dangerous conditions
-            4: 20,   # High danger - very dangerous
-            5: 0     # Very high danger - avoid avalanche terrain
-        }
-        
-        base_score = base_safety_scores.get(danger_level, 50)
+        base_score = AVALANCHE_BASE_SCORES.get(danger_level, 50)
         
         # Adjust based on user risk tolerance
-        risk_adjustments = {
-            'conservative': {'multiplier': 1.0, 'penalty_increase': 1.5},
-            'moderate': {'multiplier': 1.0, 'penalty_increase': 1.0},
-            'aggressive': {'multiplier': 0.8, 'penalty_increase': 0.7}
-        }
-        
-        adjustment = risk_adjustments.get(user_profile.risk_tolerance, risk_adjustments['moderate'])
+        adjustment = RISK_ADJUSTMENTS.get(user_profile.risk_tolerance, RISK_ADJUSTMENTS['moderate'])
         
         # Apply risk tolerance multiplier
         if danger_level >= 3:  # Only apply to dangerous conditions
@@ -388,19 +1013,10 @@ class DynamicScoringService:
         else:
             adjusted_score = base_score
         
-        # Specific avalanche problems penalties
+        # Specific avalanche problems penalties, adjusted by risk tolerance
         problems = avalanche_data.get('avalanche_problems', [])
-        problem_penalties = {
-            'persistent_weak_layer': -15,  # Very concerning
-            'wind_slab': -8,               # Manageable with route choice
-            'new_snow': -8,                # Temporary problem
-            'wet_snow': -5                 # Timing dependent
-        }
-        
-        for problem in problems:
-            penalty = problem_penalties.get(problem, 0)
-            penalty *= adjustment['penalty_increase']  # Adjust penalty by risk tolerance
-            adjusted_score += penalty
+        penalty = sum(AVALANCHE_PROBLEM_PENALTIES.get(problem, 0) for problem in problems)
+        adjusted_score += penalty * adjustment['penalty_increase']
         
         return max(0, min(100, adjusted_score))
     
@@ -426,20 +1042,22 @@ class DynamicScoringService:
         
         # Add accessibility bonus/penalty based on user adventure seeking
         access_type = destination.get('access', 'road_access')
+        access_bonus = self._access_adjustments(user_profile).get(access_type, 0)
+        final_score += access_bonus
+        
+        return max(0, min(100, final_score))
+    
+    def _access_adjustments(self, user_profile: UserProfile) -> Dict[str, float]:
+        """View/terrain bonus per access type for the user's adventure seeking"""
         adventure_factor = user_profile.adventure_seeking / 10  # 0.0 to 1.0
         
-        access_adjustments = {
+        return {
             'road_access': -5 + (adventure_factor * 10),  # Boring for adventurers
             'lift_access': 0,  # Neutral
             'hut_access': 5 * adventure_factor,  # Good for adventurers
             'boat_or_snowmobile': 10 * adventure_factor,  # Great for adventurers
             'road_closed_winter': 8 * adventure_factor  # Adventure bonus
         }
-        
-        access_bonus = access_adjustments.get(access_type, 0)
-        final_score += access_bonus
-        
-        return max(0, min(100, final_score))
     
     def _calculate_distance_score(self, distance_km: float, max_distance_km: float) -> float:
         """Calculate distance score (closer is better)"""
@@ -454,13 +1072,14 @@ class DynamicScoringService:
                                               snow_data: dict, avalanche_data: Optional[dict], 
                                               distance_km: float, user_profile: UserProfile,
                                               component_scores: dict, 
-                                              snow_depth_analysis: Optional[SnowDepthAnalysis]) -> str:
+                                              snow_depth_analysis: Optional[SnowDepthAnalysis],
+                                              driving_hours: Optional[float] = None) -> str:
         """Generate enhanced personalized summary with snow depth analysis"""
         
         summary_parts = []
         
         # Distance and access
-        driving_time = distance_km / 70  # Assume 70 km/h average
+        driving_time = driving_hours if driving_hours is not None else calculate_driving_time(distance_km)
         summary_parts.append(f"🚗 {distance_km:.0f}km ({driving_time:.1f}h drive)")
         
         # Enhanced snow summary with depth analysis
@@ -604,4 +1223,98 @@ class DynamicScoringService:
         # Add snow depth analysis note
         explanations.append("🎿 Enhanced with walking requirements and snow depth analysis")
         
-        return "🎯 Your personalized scoring: " + " • ".join(explanations)
\ No newline at end of file
+        return "🎯 Your personalized scoring: " + " • ".join(explanations)
+
+class ConditionTableCache:
+    def __init__(self):
+        """Condition tables of the current forecast cycle, shared by every request in the process"""
+        self._cycle = None
+        self._tables: Dict[Hashable, ConditionTable] = {}
+        self._conditions: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight('condition table')
+    
+    def _start_cycle(self, cycle: int):
+        # A new forecast cycle makes every table and fetched condition stale (call with the lock held)
+        if cycle != self._cycle:
+            self._cycle = cycle
+            self._tables = {}
+            self._conditions = {}
+    
+    def get(self, key: Hashable, build: Callable[[], ConditionTable]) -> ConditionTable:
+        """
+        Get the table for a set of destinations, building it once per forecast cycle
+        
+        Args:
+            key: Identifies the destinations (e.g. ('region', 'Lyngen'))
+            build: Fetches current conditions and returns a new ConditionTable
+            
+        Returns:
+            ConditionTable: Shared table; callers must not modify it (a table with
+                            failed fetches is not remembered, so the next request retries)
+        """
+        cycle = forecast_cycle()
+        with self._lock:
+            self._start_cycle(cycle)
+            table = self._tables.get(key)
+        if table is not None:
+            return table
+        return self._flights.do((cycle, key), self._build, cycle, key, build)
+    
+    def get_conditions(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Get the conditions of a single destination, fetching them once per forecast cycle
+        Used when only some destinations are scored (see DynamicScoringService.rank_top_k)
+        
+        Args:
+            key: Identifies the destination (e.g. ('tour', 'Lyngen', 'Kavringen'))
+            fetch: Returns the destination's (weather, snow, avalanche), or None on failure
+            
+        Returns:
+            The fetched conditions (failures are not remembered)
+        """
+        cycle = forecast_cycle()
+        with self._lock:
+            self._start_cycle(cycle)
+            if key in self._conditions:
+                return self._conditions[key]
+        
+        conditions = self._flights.do((cycle, 'conditions', key), fetch)
+        if conditions is not None:
+            with self._lock:
+                if cycle == self._cycle:
+                    self._conditions[key] = conditions
+        return conditions
+    
+    def _build(self, cycle: int, key: Hashable, build: Callable[[], ConditionTable]) -> ConditionTable:
+        with self._lock:
+            table = self._tables.get(key) if cycle == self._cycle else None
+        if table is not None:
+            return table  # Finished by another request just before this one started
+        
+        table = build()
+        if table.failed_fetches:
+            print(f"⚠️  Condition table {key} is missing {table.failed_fetches} destinations - not cached")
+            return table
+        with self._lock:
+            if cycle == self._cycle:
+                self._tables[key] = table
+        print(f"🧮 Built condition table {key} for {len(table)} destinations")
+        return table
+
+
+_condition_table_cache = None
+_condition_table_cache_lock = threading.Lock()
+
+def get_condition_table_cache() -> ConditionTableCache:
+    """
+    Get the process-wide condition table cache
+    
+    Returns:
+        ConditionTableCache: Shared cache instance
+    """
+    global _condition_table_cache
+    with _condition_table_cache_lock:
+        if _condition_table_cache is None:
+            _condition_table_cache = ConditionTableCache()
+    return _condition_table_cache
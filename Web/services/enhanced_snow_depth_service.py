@@ -6,7 +6,11 @@ Handles walking requirements and snow depth validation throughout trip elevation
 
 import math
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from utils.lazy_text import format_once
 
 @dataclass
 class SnowDepthAnalysis:
@@ -24,8 +28,49 @@ class SnowDepthAnalysis:
     walking_elevation_gain: float  # Elevation gain while walking
     
     damage_risk: bool  # Risk of damaging skis due to rocks
-    snow_warnings: List[str]  # List of warnings about snow conditions
-    recommendation_notes: str  # Human-readable summary
+    
+    @property
+    def snow_warnings(self) -> List[str]:
+        """List of warnings about snow conditions (formatted on first use)"""
+        return list(format_once(
+            EnhancedSnowDepthService._generate_snow_warnings,
+            self.base_snow_depth, self.mid_elevation_snow_depth, self.summit_snow_depth,
+            self.walking_required, self.damage_risk
+        ))
+    
+    @property
+    def recommendation_notes(self) -> str:
+        """Human-readable summary (formatted on first use)"""
+        return format_once(
+            EnhancedSnowDepthService._create_recommendation_notes,
+            self.base_snow_depth, self.mid_elevation_snow_depth, self.summit_snow_depth,
+            self.walking_required, self.walking_time_hours, self.damage_risk, self.destination_name
+        )
+    
+    def to_dict(self) -> Dict:
+        """Fields plus the formatted warnings and notes, as saved with results"""
+        data = {field.name: getattr(self, field.name) for field in fields(self)}
+        data['snow_warnings'] = self.snow_warnings
+        data['recommendation_notes'] = self.recommendation_notes
+        return data
+
+@dataclass
+class SnowDepthBatch:
+    """Snow depth analysis for many tours, one NumPy array per field (aligned with the inputs)"""
+    base_snow_depth: np.ndarray
+    mid_elevation_snow_depth: np.ndarray
+    summit_snow_depth: np.ndarray
+    min_snow_depth: np.ndarray
+    snow_start_elevation: np.ndarray  # Start elevation where no walking is needed
+    is_skiable: np.ndarray
+    walking_required: np.ndarray
+    walking_distance_km: np.ndarray
+    walking_time_hours: np.ndarray
+    walking_elevation_gain: np.ndarray
+    damage_risk: np.ndarray
+
+    def __len__(self):
+        return len(self.base_snow_depth)
 
 class EnhancedSnowDepthService:
     def __init__(self):
@@ -33,6 +78,7 @@ class EnhancedSnowDepthService:
         self.MIN_SKIABLE_DEPTH = 25  # cm - minimum for skiing without damage
         self.PARKING_MIN_DEPTH = 10  # cm - minimum to even consider destination
         self.SAFE_SKIING_DEPTH = 50  # cm - safe skiing with no rock damage risk
+        self.SNOW_INCREASE_PER_100M = 7  # cm more snow per 100m elevation gain
         
         # Walking pace assumptions
         self.WALKING_SPEED_KMH = 3.5  # km/hour on flat terrain
@@ -52,114 +98,128 @@ class EnhancedSnowDepthService:
         Returns:
             SnowDepthAnalysis: Comprehensive analysis of snow conditions
         """
-        dest_name = destination.get('name', 'Unknown')
-        base_elevation = destination.get('start_elevation', 500)
-        summit_elevation = destination.get('summit_elevation', 1200)
-        trip_distance = destination.get('distance_km', 5)
+        batch = self.analyze_many(
+            start_elevations=[destination.get('start_elevation', 500)],
+            summit_elevations=[destination.get('summit_elevation', 1200)],
+            snow_depths=[snow_data.get('snow_depth_cm', 0)],
+            reference_elevations=[snow_data.get('elevation', 500)],  # Elevation where measurement was taken
+            trip_distances=[destination.get('distance_km', 5)],
+            max_walking_hours=max_walking_hours
+        )
+        return self.build_analysis(batch, 0, destination.get('name', 'Unknown'))
+    
+    def analyze_many(self, start_elevations, summit_elevations, snow_depths, reference_elevations,
+                     trip_distances=None, max_walking_hours: float = 0) -> SnowDepthBatch:
+        """
+        Analyze snow conditions for many tours in one vectorized pass
         
-        # Calculate elevations for analysis
-        mid_elevation = (base_elevation + summit_elevation) / 2
+        Args:
+            start_elevations: Parking/start elevation per tour (m)
+            summit_elevations: Summit elevation per tour (m)
+            snow_depths: Measured snow depth per tour (cm)
+            reference_elevations: Elevation of each snow measurement (m)
+            trip_distances: Tour length per tour (km, default 5)
+            max_walking_hours: Maximum hours user is willing to walk (0 = no walking)
+            
+        Returns:
+            SnowDepthBatch: Arrays of results, aligned with the inputs
+        """
+        base_elevation = np.asarray(start_elevations, dtype=float)
+        summit_elevation = np.asarray(summit_elevations, dtype=float)
+        snow_depth = np.asarray(snow_depths, dtype=float)
+        reference_elevation = np.asarray(reference_elevations, dtype=float)
+        trip_distance = (np.full(base_elevation.shape, 5.0) if trip_distances is None
+                         else np.asarray(trip_distances, dtype=float))
         
         # Get snow depths at different elevations
-        base_snow = self._estimate_snow_at_elevation(snow_data, base_elevation)
-        mid_snow = self._estimate_snow_at_elevation(snow_data, mid_elevation)
-        summit_snow = self._estimate_snow_at_elevation(snow_data, summit_elevation)
-        min_snow = min(base_snow, mid_snow, summit_snow)
+        mid_elevation = (base_elevation + summit_elevation) / 2
+        base_snow = self._estimate_snow_at_elevation(snow_depth, reference_elevation, base_elevation)
+        mid_snow = self._estimate_snow_at_elevation(snow_depth, reference_elevation, mid_elevation)
+        summit_snow = self._estimate_snow_at_elevation(snow_depth, reference_elevation, summit_elevation)
+        min_snow = np.minimum(np.minimum(base_snow, mid_snow), summit_snow)
         
-        # Determine if walking is required
+        # Walking is required up to where adequate snow starts
         walking_required = base_snow < self.PARKING_MIN_DEPTH
-        walking_distance = 0
-        walking_time = 0
-        walking_elevation = 0
-        
-        if walking_required:
-            # Calculate where adequate snow starts
-            snow_start_elevation = self._find_snow_start_elevation(
-                snow_data, base_elevation, summit_elevation, self.PARKING_MIN_DEPTH
-            )
-            
-            # Calculate walking requirements
-            walking_elevation = snow_start_elevation - base_elevation
-            walking_distance = self._calculate_walking_distance(walking_elevation, trip_distance)
-            walking_time = self._calculate_walking_time(walking_distance, walking_elevation)
-        
-        # Determine if destination is skiable
-        skiing_portion_snow = max(mid_snow, summit_snow)  # Best snow in skiing area
-        is_skiable = (
-            skiing_portion_snow >= self.MIN_SKIABLE_DEPTH and 
-            (not walking_required or walking_time <= max_walking_hours)
+        snow_start_elevation = self._find_snow_start_elevation(
+            snow_depth, reference_elevation, base_elevation, summit_elevation, self.PARKING_MIN_DEPTH
         )
-        
-        # Check for damage risk
-        damage_risk = min_snow < self.SAFE_SKIING_DEPTH
-        
-        # Generate warnings
-        warnings = self._generate_snow_warnings(
-            base_snow, mid_snow, summit_snow, walking_required, damage_risk
+        walking_elevation = np.where(walking_required, snow_start_elevation - base_elevation, 0.0)
+        walking_distance = np.where(
+            walking_required, self._calculate_walking_distance(walking_elevation, trip_distance), 0.0
         )
-        
-        # Create recommendation notes
-        notes = self._create_recommendation_notes(
-            base_snow, mid_snow, summit_snow, walking_required, 
-            walking_time, damage_risk, dest_name
+        walking_time = np.where(
+            walking_required, self._calculate_walking_time(walking_distance, walking_elevation), 0.0
         )
         
-        return SnowDepthAnalysis(
-            destination_name=dest_name,
+        batch = SnowDepthBatch(
             base_snow_depth=base_snow,
             mid_elevation_snow_depth=mid_snow,
             summit_snow_depth=summit_snow,
             min_snow_depth=min_snow,
-            is_skiable=is_skiable,
+            snow_start_elevation=np.where(walking_required, snow_start_elevation, base_elevation),
+            is_skiable=np.zeros(base_snow.shape, dtype=bool),
             walking_required=walking_required,
             walking_distance_km=walking_distance,
             walking_time_hours=walking_time,
             walking_elevation_gain=walking_elevation,
-            damage_risk=damage_risk,
-            snow_warnings=warnings,
-            recommendation_notes=notes
+            damage_risk=min_snow < self.SAFE_SKIING_DEPTH
         )
+        batch.is_skiable = self.skiable_within(batch, max_walking_hours)
+        return batch
     
-    def _estimate_snow_at_elevation(self, snow_data: Dict, elevation: float) -> float:
-        """
-        Estimate snow depth at a specific elevation
-        Uses base snow data and elevation-based adjustments
+    def skiable_within(self, batch: SnowDepthBatch, max_walking_hours: float) -> np.ndarray:
         """
-        base_snow_depth = snow_data.get('snow_depth_cm', 0)
-        reference_elevation = snow_data.get('elevation', 500)  # Elevation where measurement was taken
+        Skiability of analyzed tours for a walking tolerance (the only user-dependent part of the analysis)
         
+        Returns:
+            np.ndarray: True where the skiing area has enough snow and any walk is within tolerance
+        """
+        skiing_portion_snow = np.maximum(batch.mid_elevation_snow_depth, batch.summit_snow_depth)
+        return (
+            (skiing_portion_snow >= self.MIN_SKIABLE_DEPTH) &
+            (~batch.walking_required | (batch.walking_time_hours <= max_walking_hours))
+        )
+    
+    def build_analysis(self, batch: SnowDepthBatch, index: int, dest_name: str) -> SnowDepthAnalysis:
+        """Create the SnowDepthAnalysis for one tour of a batch (warnings and notes are formatted on first use)"""
+        return SnowDepthAnalysis(
+            destination_name=dest_name,
+            base_snow_depth=float(batch.base_snow_depth[index]),
+            mid_elevation_snow_depth=float(batch.mid_elevation_snow_depth[index]),
+            summit_snow_depth=float(batch.summit_snow_depth[index]),
+            min_snow_depth=float(batch.min_snow_depth[index]),
+            is_skiable=bool(batch.is_skiable[index]),
+            walking_required=bool(batch.walking_required[index]),
+            walking_distance_km=float(batch.walking_distance_km[index]),
+            walking_time_hours=float(batch.walking_time_hours[index]),
+            walking_elevation_gain=float(batch.walking_elevation_gain[index]),
+            damage_risk=bool(batch.damage_risk[index])
+        )
+    
+    def _estimate_snow_at_elevation(self, snow_depth, reference_elevation, elevation):
+        """
+        Estimate snow depth at a specific elevation (works on scalars and arrays)
+        Uses the measured depth and an elevation-based adjustment
+        """
         # Snow generally increases with elevation (roughly 5-10cm per 100m)
         elevation_diff = elevation - reference_elevation
-        snow_increase_rate = 7  # cm per 100m elevation gain
-        
-        estimated_snow = base_snow_depth + (elevation_diff / 100) * snow_increase_rate
+        estimated_snow = snow_depth + (elevation_diff / 100) * self.SNOW_INCREASE_PER_100M
         
-        return max(0, estimated_snow)  # Snow can't be negative
+        return np.maximum(0, estimated_snow)  # Snow can't be negative
     
-    def _find_snow_start_elevation(self, snow_data: Dict, base_elevation: float, 
-                                  summit_elevation: float, min_required_depth: float) -> float:
+    def _find_snow_start_elevation(self, snow_depth, reference_elevation, base_elevation,
+                                  summit_elevation, min_required_depth):
         """
         Find the elevation where adequate snow depth begins
+        The snow model is linear in elevation, so this is solved directly
+        and clamped to the route between start and summit
         """
-        # Binary search for snow start elevation
-        low_elev = base_elevation
-        high_elev = summit_elevation
-        
-        for _ in range(10):  # Max 10 iterations for precision
-            mid_elev = (low_elev + high_elev) / 2
-            snow_depth = self._estimate_snow_at_elevation(snow_data, mid_elev)
-            
-            if snow_depth >= min_required_depth:
-                high_elev = mid_elev
-            else:
-                low_elev = mid_elev
-            
-            if abs(high_elev - low_elev) < 10:  # 10m precision
-                break
-        
-        return high_elev
+        required_elevation = (
+            reference_elevation + (min_required_depth - snow_depth) * 100 / self.SNOW_INCREASE_PER_100M
+        )
+        return np.minimum(np.maximum(required_elevation, base_elevation), summit_elevation)
     
-    def _calculate_walking_distance(self, elevation_gain: float, total_trip_distance: float) -> float:
+    def _calculate_walking_distance(self, elevation_gain, total_trip_distance):
         """
         Estimate horizontal walking distance based on elevation gain and trip profile
         """
@@ -170,9 +230,9 @@ class EnhancedSnowDepthService:
         # Don't exceed half the total trip distance
         max_walking = total_trip_distance * 0.4
         
-        return min(walking_distance, max_walking)
+        return np.minimum(walking_distance, max_walking)
     
-    def _calculate_walking_time(self, distance_km: float, elevation_gain: float) -> float:
+    def _calculate_walking_time(self, distance_km, elevation_gain):
         """
         Calculate walking time including both distance and elevation components
         """
@@ -183,12 +243,13 @@ class EnhancedSnowDepthService:
         elevation_time = elevation_gain / 400
         
         # Take the maximum (they're not additive since elevation affects horizontal speed)
-        total_time = max(horizontal_time, elevation_time)
+        total_time = np.maximum(horizontal_time, elevation_time)
         
         # Apply pace buffer for realistic timing
         return total_time * self.PACE_BUFFER_FACTOR
     
-    def _generate_snow_warnings(self, base_snow: float, mid_snow: float, 
+    @staticmethod
+    def _generate_snow_warnings(base_snow: float, mid_snow: float, 
                                summit_snow: float, walking_required: bool, 
                                damage_risk: bool) -> List[str]:
         """Generate list of warnings about snow conditions"""
@@ -211,7 +272,8 @@ class EnhancedSnowDepthService:
         
         return warnings
     
-    def _create_recommendation_notes(self, base_snow: float, mid_snow: float, 
+    @staticmethod
+    def _create_recommendation_notes(base_snow: float, mid_snow: float, 
                                    summit_snow: float, walking_required: bool,
                                    walking_time: float, damage_risk: bool, 
                                    dest_name: str) -> str:
@@ -3,11 +3,17 @@
 High-level location services
 """
 
+import requests
+
+import config
 from api_clients.kartverket_client import KartverketClient
+from utils.geocoding_cache import get_geocoding_cache, normalize_query
+from utils.place_index import get_place_index
 
 class LocationService:
     def __init__(self):
         self.kartverket_client = KartverketClient()
+        self.geocoding_cache = get_geocoding_cache()
     
     def get_location_coordinates(self, location_input):
         """
@@ -20,8 +26,8 @@ class LocationService:
             dict: Location data with coordinates, or None if failed
         """
         if isinstance(location_input, str):
-            # String input - look up using Kartverket
-            return self.kartverket_client.search_place(location_input)
+            # String input - look up using the geocoding cache, then Kartverket
+            return self._lookup_place(location_input)
         elif isinstance(location_input, dict):
             # Dict input - validate it has required fields
             if 'lat' in location_input and 'lon' in location_input:
@@ -47,7 +53,105 @@ class LocationService:
         Returns:
             list: List of location dictionaries
         """
-        return self.kartverket_client.get_multiple_results(place_name, max_results)
+        key = f"search:{max_results}:{normalize_query(place_name)}"
+        found, results = self.geocoding_cache.get(key)
+        if not found:
+            try:
+                results = self.kartverket_client.fetch_places(place_name, max_results)
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                # Failures are not cached, only real "not found" answers
+                print(f"🚫 Error searching for locations: {e}")
+                return []
+            self.geocoding_cache.set(key, results)
+        
+        return [dict(result, original_search=place_name) for result in results or []]
+    
+    def _lookup_place(self, place_name):
+        """
+        Resolve a place name to its most relevant location, caching both hits and misses
+        
+        Args:
+            place_name (str): Place name to look up
+            
+        Returns:
+            dict: Location data with coordinates, or None if not found
+        """
+        key = f"place:{normalize_query(place_name)}"
+        found, result = self.geocoding_cache.get(key)
+        if found:
+            if result is None:
+                print(f"❌ No results found for '{place_name}' (cached)")
+                return None
+            print(f"✅ Found (cached): {result['name']} in {result['municipality']}, {result['county']}")
+            return dict(result, original_search=place_name)
+        
+        try:
+            print(f"🔍 Searching for '{place_name}' using Kartverket...")
+            results = self.kartverket_client.fetch_places(place_name, config.DEFAULT_KARTVERKET_RESULTS)
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            print(f"🚫 Error searching for location: {e}")
+            return None
+        
+        result = results[0] if results else None
+        self.geocoding_cache.set(key, result)
+        if result is None:
+            print(f"❌ No results found for '{place_name}'")
+            return None
+        
+        print(f"✅ Found: {result['name']} in {result['municipality']}, {result['county']}")
+        print(f"📍 Coordinates: {result['lat']:.4f}, {result['lon']:.4f}")
+        return result
+    
+    def refresh_frequent_locations(self, limit=None, expiring_within_minutes=24 * 60):
+        """
+        Re-resolve the most requested queries before their cached answers expire
+        
+        Args:
+            limit (int): Maximum number of queries to refresh
+            expiring_within_minutes (float): Refresh entries expiring within this window
+            
+        Returns:
+            int: Number of queries refreshed
+        """
+        limit = limit or config.GEOCODING_WARM_ENTRIES
+        refreshed = 0
+        for key in self.geocoding_cache.frequent_keys(limit, expiring_within_minutes):
+            kind, _, query = key.partition(':')
+            try:
+                if kind == 'place':
+                    results = self.kartverket_client.fetch_places(query, config.DEFAULT_KARTVERKET_RESULTS)
+                    self.geocoding_cache.set(key, results[0] if results else None)
+                elif kind == 'search':
+                    max_results, _, query = query.partition(':')
+                    self.geocoding_cache.set(key, self.kartverket_client.fetch_places(query, int(max_results)))
+                else:
+                    continue
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                print(f"   ⚠️  Could not refresh '{query}': {e}")
+                continue
+            refreshed += 1
+        
+        print(f"✅ Refreshed {refreshed} frequent geocoding queries")
+        return refreshed
+    
+    def suggest_locations(self, query, max_results=5):
+        """
+        Autocomplete suggestions from the local place name index
+        Places the index doesn't know are searched with Kartverket (answers are cached)
+        
+        Args:
+            query (str): What the user has typed so far
+            max_results (int): Maximum number of suggestions
+            
+        Returns:
+            list: List of location dictionaries, best match first
+        """
+        place_index = get_place_index()
+        suggestions = place_index.suggest(query, max_results) if place_index is not None else []
+        if not suggestions and query.strip():
+            # No local index or no match in it - fall back to the Kartverket API
+            return self.search_multiple_locations(query, max_results)
+        return suggestions
     
     def validate_coordinates(self, lat, lon):
         """
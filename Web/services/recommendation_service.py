@@ -3,10 +3,10 @@
 Recommendation service that combines location, weather, and distance data
 """
 
-import time
 from services.weather_service import WeatherService
-from utils.distance_calculator import calculate_distance, calculate_driving_time, get_max_distance_for_hours, is_within_driving_range
+from utils.distance_calculator import calculate_distances, get_max_distance_for_hours
 from utils.file_manager import load_destinations
+from utils.travel_time import estimate_driving_hours
 import config
 
 class RecommendationService:
@@ -36,21 +36,23 @@ class RecommendationService:
         
         recommendations = []
         
-        for destination in destinations:
-            # Calculate distance
-            distance_km = calculate_distance(
-                starting_location['lat'], starting_location['lon'],
-                destination['lat'], destination['lon']
-            )
-            
-            driving_time_hours = calculate_driving_time(distance_km)
-            within_range = is_within_driving_range(distance_km, max_driving_hours)
+        # Calculate all distances and road driving times at once
+        dest_lats = [dest['lat'] for dest in destinations]
+        dest_lons = [dest['lon'] for dest in destinations]
+        all_distances = calculate_distances(starting_location['lat'], starting_location['lon'], dest_lats, dest_lons)
+        all_driving_hours = estimate_driving_hours(starting_location['lat'], starting_location['lon'], dest_lats, dest_lons)
+        
+        for destination, distance_km, driving_time_hours in zip(
+                destinations, all_distances.tolist(), all_driving_hours.tolist()):
+            within_range = driving_time_hours <= max_driving_hours
             
             print(f"  🔍 Checking {destination['name']} ({distance_km:.0f}km away)...")
             
-            # Get weather data
+            # Get weather data at mid-tour elevation
+            elevation_range = destination.get('elevation_range')
+            elevation = sum(elevation_range) / 2 if elevation_range else None
             weather_summary = self.weather_service.get_weather_data(
-                destination['lat'], destination['lon'], destination['name']
+                destination['lat'], destination['lon'], destination['name'], elevation
             )
             
             if weather_summary:
@@ -77,9 +79,6 @@ class RecommendationService:
                 }
                 
                 recommendations.append(recommendation)
-            
-            # Be respectful to APIs
-            time.sleep(config.API_DELAY)
         
         # Sort by total score (higher is better)
         recommendations.sort(key=lambda x: x['total_score'], reverse=True)
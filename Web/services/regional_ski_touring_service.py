@@ -7,17 +7,24 @@ Enhanced ski touring service that:
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 
 from services.weather_monitoring_service import WeatherMonitoringService, RegionalWeather
+from services.weather_prefetch_service import WeatherPrefetchService
 from services.user_personality_quiz import UserProfile, SkiTouringPersonalityQuiz
-from services.dynamic_scoring_service import DynamicScoringService, ScoringResult
+from services.dynamic_scoring_service import DynamicScoringService, ScoringResult, get_condition_table_cache
 from api_clients.senorge_client import SeNorgeClient
 from api_clients.varsom_client import VarsomClient
-from utils.distance_calculator import calculate_distance
+from utils.distance_calculator import calculate_distances
+from utils.spatial_index import SpatialIndex
+from utils.travel_time import estimate_driving_hours
 from utils.file_manager import load_json_file
+from utils.lazy_text import LazyText
+
+import config
 
 @dataclass
 class SkiTour:
@@ -35,8 +42,10 @@ class SkiTour:
     avalanche_exposure: str
     technical_grade: int
     distance_from_start: Optional[float] = None
+    driving_hours: Optional[float] = None  # Road time from the starting location
     current_conditions: Optional[Dict] = None
     total_score: Optional[float] = None
+    avalanche_region_id: Optional[int] = None
 
 @dataclass
 class RegionalRecommendation:
@@ -46,23 +55,53 @@ class RegionalRecommendation:
     recommended_tours: List[Tuple[SkiTour, ScoringResult]]
     region_score: float
     accessibility_from_start: str
-    why_recommended: str
+    rationale: LazyText  # Why the region is recommended, formatted only when shown
+    
+    @property
+    def why_recommended(self) -> str:
+        return self.rationale.text
+    
+    def to_dict(self) -> Dict:
+        """Fields with the rationale formatted, as saved with results"""
+        data = {field.name: getattr(self, field.name) for field in fields(self) if field.name != 'rationale'}
+        data['why_recommended'] = self.why_recommended
+        return data
 
 class RegionalSkiTouringService:
     def __init__(self):
         self.weather_monitor = WeatherMonitoringService()
+        self.weather_prefetch = WeatherPrefetchService(self.weather_monitor)
         self.quiz_service = SkiTouringPersonalityQuiz()
         self.scoring_service = DynamicScoringService()
         self.snow_client = SeNorgeClient()
         self.avalanche_client = VarsomClient()
         self.ski_tours_data = {}
+        self.tour_index = None      # SpatialIndex of all tours, grouped by region
+        self._indexed_tours = []    # (region name, tour data) per index position
         
     def load_ski_tours_database(self):
         """Load the enhanced ski tours database"""
         try:
-            self.ski_tours_data = load_json_file("data/enhanced_ski_tours.json")
-            total_tours = sum(len(region_data['ski_tours']) 
-                            for region_data in self.ski_tours_data.get('regions', {}).values())
+            self.ski_tours_data = load_json_file(config.SKI_TOURS_FILE)
+            
+            # Precompute each tour's avalanche forecast region
+            for region_data in self.ski_tours_data.get('regions', {}).values():
+                for tour_data in region_data['ski_tours']:
+                    tour_data['avalanche_region_id'] = self.avalanche_client.find_avalanche_region(
+                        tour_data['lat'], tour_data['lon']
+                    )
+            
+            self._indexed_tours = [
+                (region_name, tour_data)
+                for region_name, region_data in self.ski_tours_data.get('regions', {}).items()
+                for tour_data in region_data['ski_tours']
+            ]
+            self.tour_index = SpatialIndex(
+                [tour_data['lat'] for _, tour_data in self._indexed_tours],
+                [tour_data['lon'] for _, tour_data in self._indexed_tours],
+                groups=[region_name for region_name, _ in self._indexed_tours]
+            )
+            total_tours = len(self._indexed_tours)
             print(f"📊 Loaded {total_tours} ski tours across {len(self.ski_tours_data.get('regions', {}))} regions")
             return True
         except Exception as e:
@@ -103,9 +142,14 @@ class RegionalSkiTouringService:
             user_profile = self.quiz_service.conduct_quiz()
             print()
         
-        # Step 3: Analyze regional weather patterns
-        print("🌤️ Analyzing weather across Norwegian ski regions...")
-        regional_weather = self.weather_monitor.analyze_regional_weather(max_points_per_region=3)
+        # Step 3: Get regional weather patterns (prefetched by worker.py when running)
+        snapshot = self.weather_prefetch.get_latest_snapshot()
+        if snapshot:
+            print(f"🌤️ Using regional weather snapshot from {snapshot.age_minutes:.0f} min ago")
+        else:
+            print("🌤️ Analyzing weather across Norwegian ski regions...")
+            snapshot = self.weather_prefetch.refresh()
+        regional_weather = snapshot.get_regions()
         print()
         
         # Step 4: Filter regions by driving distance
@@ -150,25 +194,34 @@ class RegionalSkiTouringService:
                                    regional_weather: Dict[str, RegionalWeather]) -> Dict[str, RegionalWeather]:
         """Filter regions that are within driving distance"""
         
-        max_distance_km = max_hours * 70  # Assume 70 km/h average
         accessible_regions = {}
+        if self.tour_index is None:
+            return accessible_regions
+        lat, lon = starting_location['lat'], starting_location['lon']
+        
+        # A region is reachable if any of its tours is; only tours inside the
+        # straight-line bound can be, so just those get a driving time
+        nearest_by_region = self.tour_index.nearest_by_group(lat, lon)
+        in_reach = self.tour_index.within_radius(lat, lon, max_hours * config.MAX_STRAIGHT_LINE_SPEED_KMH)
+        tours_in_reach = [self._indexed_tours[i] for i, _ in in_reach]
+        hours = estimate_driving_hours(lat, lon, [tour['lat'] for _, tour in tours_in_reach],
+                                       [tour['lon'] for _, tour in tours_in_reach])
+        fastest_by_region = {}
+        for (region_name, _), driving_hours in zip(tours_in_reach, hours.tolist()):
+            fastest_by_region[region_name] = min(driving_hours, fastest_by_region.get(region_name, driving_hours))
         
         for region_name, weather_summary in regional_weather.items():
-            if region_name in self.ski_tours_data.get('regions', {}):
-                # Use the first ski tour in the region as a reference point
-                region_data = self.ski_tours_data['regions'][region_name]
-                if region_data['ski_tours']:
-                    ref_tour = region_data['ski_tours'][0]
-                    distance = calculate_distance(
-                        starting_location['lat'], starting_location['lon'],
-                        ref_tour['lat'], ref_tour['lon']
-                    )
-                    
-                    if distance <= max_distance_km:
-                        accessible_regions[region_name] = weather_summary
-                        print(f"   ✅ {region_name}: {distance:.0f}km ({distance/70:.1f}h) - {weather_summary.weather_summary}")
-                    else:
-                        print(f"   ❌ {region_name}: {distance:.0f}km (too far)")
+            if region_name not in nearest_by_region:
+                continue
+            distance = nearest_by_region[region_name][1]
+            driving_hours = fastest_by_region.get(region_name)
+            if driving_hours is not None and driving_hours <= max_hours:
+                accessible_regions[region_name] = weather_summary
+                print(f"   ✅ {region_name}: {distance:.0f}km ({driving_hours:.1f}h) - {weather_summary.weather_summary}")
+            elif driving_hours is not None:
+                print(f"   ❌ {region_name}: {distance:.0f}km ({driving_hours:.1f}h, too far)")
+            else:
+                print(f"   ❌ {region_name}: {distance:.0f}km (too far)")
         
         return accessible_regions
     
@@ -186,16 +239,17 @@ class RegionalSkiTouringService:
             region_data = self.ski_tours_data['regions'][region_name]
             ski_tours = self._load_ski_tours_for_region(region_name, region_data)
             
-            # Score each tour in the region
-            scored_tours = []
-            for tour in ski_tours:
-                tour_score = self._score_individual_tour(tour, user_profile, starting_location)
-                if tour_score:
-                    scored_tours.append((tour, tour_score))
+            # Distances and driving times for the whole region in one vectorized step
+            tour_lats = [tour.lat for tour in ski_tours]
+            tour_lons = [tour.lon for tour in ski_tours]
+            distances = calculate_distances(starting_location['lat'], starting_location['lon'], tour_lats, tour_lons)
+            hours = estimate_driving_hours(starting_location['lat'], starting_location['lon'], tour_lats, tour_lons)
+            for tour, distance, driving_hours in zip(ski_tours, distances.tolist(), hours.tolist()):
+                tour.distance_from_start = distance
+                tour.driving_hours = driving_hours
             
-            # Select best tours in region
-            scored_tours.sort(key=lambda x: x[1].total_score, reverse=True)
-            recommended_tours = scored_tours[:tours_per_region]
+            # Select best tours in region (only promising tours get their conditions fetched)
+            recommended_tours = self._score_tours(ski_tours, user_profile, tours_per_region)
             
             # Calculate overall region score
             region_score = self._calculate_region_score(weather_summary, recommended_tours, user_profile)
@@ -207,7 +261,8 @@ class RegionalSkiTouringService:
                 recommended_tours=recommended_tours,
                 region_score=region_score,
                 accessibility_from_start=self._describe_accessibility(region_name, starting_location),
-                why_recommended=self._generate_region_rationale(region_name, weather_summary, user_profile)
+                rationale=LazyText(self._generate_region_rationale, region_name, weather_summary.avg_score,
+                                   user_profile.terrain_preference)
             )
             
             recommendations.append(recommendation)
@@ -231,53 +286,73 @@ class RegionalSkiTouringService:
                 description=tour_data['description'],
                 features=tour_data['features'],
                 avalanche_exposure=tour_data['avalanche_exposure'],
-                technical_grade=tour_data['technical_grade']
+                technical_grade=tour_data['technical_grade'],
+                avalanche_region_id=tour_data.get('avalanche_region_id')
             )
             tours.append(tour)
         
         return tours
     
-    def _score_individual_tour(self, tour: SkiTour, user_profile: UserProfile, 
-                             starting_location: Dict) -> Optional[ScoringResult]:
-        """Score an individual ski tour based on current conditions"""
+    def _score_tours(self, tours: List[SkiTour], user_profile: UserProfile,
+                     top_k: int) -> List[Tuple[SkiTour, ScoringResult]]:
+        """
+        The top_k best ski tours (with distances already set) on current conditions, best first
+        Tours that can't make the top_k on their static attributes are never fetched
+        """
+        destinations = [self._tour_destination(tour) for tour in tours]
+        
+        def fetch_conditions(positions: List[int]) -> List[Optional[Tuple[Dict, Dict, Optional[Dict]]]]:
+            with ThreadPoolExecutor(max_workers=config.API_MAX_WORKERS) as executor:
+                return list(executor.map(lambda position: self._get_cached_tour_conditions(tours[position]),
+                                         positions))
         
         try:
-            # Calculate distance
-            distance = calculate_distance(
-                starting_location['lat'], starting_location['lon'],
-                tour.lat, tour.lon
+            ranked = self.scoring_service.rank_top_k(
+                destinations, top_k, fetch_conditions,
+                [tour.distance_from_start for tour in tours],
+                1000,  # Large max distance since we pre-filtered
+                user_profile, driving_hours=[tour.driving_hours for tour in tours]
             )
-            tour.distance_from_start = distance
-            
+        except Exception as e:
+            print(f"      ❌ Error scoring tours: {e}")
+            return []
+        return [(tours[position], result) for position, result in ranked]
+    
+    def _tour_destination(self, tour: SkiTour) -> Dict:
+        """Convert tour to destination format for scoring"""
+        return {
+            'name': tour.name,
+            'lat': tour.lat,
+            'lon': tour.lon,
+            'type': 'ski_touring',
+            'terrain_type': self._map_region_to_terrain_type(tour.region),
+            'view_score': self._estimate_view_score(tour),
+            'technical_level': tour.technical_grade,
+            'accessibility': self._estimate_accessibility_score(tour),
+            'avalanche_exposure': tour.avalanche_exposure
+        }
+    
+    def _get_cached_tour_conditions(self, tour: SkiTour) -> Optional[Tuple[Dict, Dict, Optional[Dict]]]:
+        """Tour conditions, fetched once per forecast cycle and shared by all users"""
+        return get_condition_table_cache().get_conditions(
+            ('tour', tour.region, tour.name), lambda: self._get_tour_conditions(tour)
+        )
+    
+    def _get_tour_conditions(self, tour: SkiTour) -> Optional[Tuple[Dict, Dict, Optional[Dict]]]:
+        """Current weather, snow and avalanche data for scoring a tour"""
+        
+        try:
             # Get current conditions (using mock data for now)
             weather_data = self._get_mock_weather_for_tour(tour)
-            snow_data = self._get_mock_snow_for_tour(tour)
-            avalanche_data = self.avalanche_client.get_avalanche_warning(tour.lat, tour.lon, tour.name)
-            
-            # Convert tour to destination format for scoring
-            destination = {
-                'name': tour.name,
-                'lat': tour.lat,
-                'lon': tour.lon,
-                'type': 'ski_touring',
-                'terrain_type': self._map_region_to_terrain_type(tour.region),
-                'view_score': self._estimate_view_score(tour),
-                'technical_level': tour.technical_grade,
-                'accessibility': self._estimate_accessibility_score(tour),
-                'avalanche_exposure': tour.avalanche_exposure
-            }
-            
-            # Score the tour
-            scoring_result = self.scoring_service.calculate_personalized_score(
-                destination, weather_data, snow_data, avalanche_data,
-                distance, 1000,  # Large max distance since we pre-filtered
-                user_profile
+            snow_data = (self.snow_client.get_grid_snow_data(tour.lat, tour.lon, tour.name, tour.elevation_range[0])
+                         or self._get_mock_snow_for_tour(tour))
+            avalanche_data = self.avalanche_client.get_avalanche_warning(
+                tour.lat, tour.lon, tour.name, tour.avalanche_region_id
             )
-            
-            return scoring_result
+            return weather_data, snow_data, avalanche_data
             
         except Exception as e:
-            print(f"      ❌ Error scoring {tour.name}: {e}")
+            print(f"      ❌ Error getting conditions for {tour.name}: {e}")
             return None
     
     def _get_mock_weather_for_tour(self, tour: SkiTour) -> Dict:
@@ -407,21 +482,21 @@ class RegionalSkiTouringService:
         }
         return distances.get(region_name, 'Accessible by car')
     
-    def _generate_region_rationale(self, region_name: str, weather_summary: RegionalWeather,
-                                 user_profile: UserProfile) -> str:
+    def _generate_region_rationale(self, region_name: str, avg_weather_score: float,
+                                 terrain_preference: str) -> str:
         """Generate explanation for why this region is recommended"""
         
         reasons = []
         
         # Weather-based reasons
-        if weather_summary.avg_score >= 80:
+        if avg_weather_score >= 80:
             reasons.append("excellent weather conditions")
-        elif weather_summary.avg_score >= 65:
+        elif avg_weather_score >= 65:
             reasons.append("good weather outlook")
         
         # User preference matching
         region_terrain = self._map_region_to_terrain_type(region_name)
-        if region_terrain == user_profile.terrain_preference:
+        if region_terrain == terrain_preference:
             reasons.append("matches your terrain preference")
         
         # Regional characteristics
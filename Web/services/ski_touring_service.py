@@ -3,15 +3,18 @@
 Main ski touring recommendation service that integrates all components
 """
 
-import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, replace
+from typing import List, Dict, Optional, Tuple
 from services.weather_service import WeatherService
-from services.dynamic_scoring_service import DynamicScoringService, ScoringResult
+from services.dynamic_scoring_service import (ConditionTable, DynamicScoringService, ScoringResult,
+                                              get_condition_table_cache)
 from services.user_personality_quiz import SkiTouringPersonalityQuiz, UserProfile
 from api_clients.senorge_client import SeNorgeClient
 from api_clients.varsom_client import VarsomClient
-from utils.distance_calculator import calculate_distance, calculate_driving_time, get_max_distance_for_hours, is_within_driving_range
+from utils.distance_calculator import calculate_distances, calculate_driving_time, get_max_distance_for_hours, is_within_driving_range
 from utils.file_manager import load_json_file
+from utils.travel_time import estimate_driving_hours
 from services.enhanced_snow_depth_service import EnhancedSnowDepthService 
 
 import config
@@ -69,50 +72,34 @@ class SkiTouringRecommendationService:
         print(self.scoring_service.get_scoring_explanation(user_profile))
         print()
         
-        # Analyze each destination
-        scoring_results = []
-        destinations_analyzed = []
+        # Condition scores of every destination, computed once per forecast cycle for all users
+        condition_table = get_condition_table_cache().get(
+            'ski_destinations', lambda: self._build_condition_table(destinations)
+        )
+        destinations_analyzed = condition_table.destinations
         
-        for destination in destinations:
-            try:
-                print(f"  🔍 Analyzing {destination['name']}...")
-                
-                # Calculate distance
-                distance_km = calculate_distance(
-                    starting_location['lat'], starting_location['lon'],
-                    destination['lat'], destination['lon']
-                )
-                
-                # Get all data sources
-                weather_data = self.weather_service.get_weather_data(
-                    destination['lat'], destination['lon'], destination['name']
-                )
-                
-                snow_data = self.senorge_client.get_snow_data(
-                    destination['lat'], destination['lon'], destination['name']
-                )
-                
-                avalanche_data = self.varsom_client.get_avalanche_warning(
-                    destination['lat'], destination['lon'], destination['name']
-                )
-                
-                # Calculate personalized score
-                scoring_result = self.scoring_service.calculate_personalized_score(
-                    destination, weather_data, snow_data, avalanche_data,
-                    distance_km, max_distance_km, user_profile, max_walking_hours
-                )
-                
-                scoring_results.append(scoring_result)
-                destinations_analyzed.append(destination)
-                
-                # Be respectful to APIs
-                time.sleep(config.API_DELAY)
-                
-            except Exception as e:
-                print(f"    ❌ Error analyzing {destination['name']}: {e}")
-                continue
+        # Distances and road driving times to every destination in one vectorized step
+        dest_lats = [dest['lat'] for dest in destinations_analyzed]
+        dest_lons = [dest['lon'] for dest in destinations_analyzed]
+        all_distances = calculate_distances(starting_location['lat'], starting_location['lon'], dest_lats, dest_lons)
+        all_driving_hours = estimate_driving_hours(starting_location['lat'], starting_location['lon'], dest_lats, dest_lons)
         
-            # Check if we found any skiable destinations
+        # Apply this user's preferences to the shared condition scores
+        print(f"  🔍 Analyzing {len(destinations_analyzed)} destinations...")
+        try:
+            scoring_results = self.scoring_service.score_table(
+                condition_table, all_distances, max_distance_km, user_profile, max_walking_hours,
+                driving_hours=all_driving_hours, max_driving_hours=max_driving_hours
+            )
+        except Exception as e:
+            # Don't let one bad record empty the results - score one by one, skipping those that fail
+            print(f"    ⚠️  Error analyzing destinations together ({e}) - analyzing them one by one")
+            destinations_analyzed, scoring_results = self._score_individually(
+                condition_table, all_distances, all_driving_hours, max_distance_km, user_profile,
+                max_walking_hours, max_driving_hours
+            )
+        
+        # Check if we found any skiable destinations
         skiable_destinations = [
             (dest, result) for dest, result in zip(destinations_analyzed, scoring_results)
             if not result.snow_depth_analysis or result.snow_depth_analysis.is_skiable
@@ -167,10 +154,109 @@ class SkiTouringRecommendationService:
             'scoring_explanation': self.scoring_service.get_scoring_explanation(user_profile, avalanche_data_available)
         }
     
+    def _fetch_destination_conditions(self, destinations: List[dict]) -> List[Optional[Dict]]:
+        """
+        Fetch weather, snow and avalanche data for all destinations concurrently
+        The shared HTTP transport caps connections per host, which keeps us polite to each API
+        
+        Returns:
+            List aligned with destinations: dicts with 'weather', 'snow' and 'avalanche',
+            or None where fetching failed
+        """
+        with ThreadPoolExecutor(max_workers=config.API_MAX_WORKERS) as executor:
+            pending = []
+            for destination in destinations:
+                lat, lon, name = destination['lat'], destination['lon'], destination['name']
+                elevation_range = destination.get('elevation_range')
+                elevation = sum(elevation_range) / 2 if elevation_range else None  # Mid-tour elevation
+                pending.append({
+                    'weather': executor.submit(self.weather_service.get_weather_data, lat, lon, name, elevation),
+                    'snow': executor.submit(self.senorge_client.get_snow_data, lat, lon, name,
+                                            elevation_range[0] if elevation_range else None),  # Trailhead
+                    'avalanche': executor.submit(self.varsom_client.get_avalanche_warning, lat, lon, name,
+                                                 destination.get('avalanche_region_id'))
+                })
+            
+            all_conditions = []
+            for destination, futures in zip(destinations, pending):
+                try:
+                    all_conditions.append({source: future.result() for source, future in futures.items()})
+                except Exception as e:
+                    print(f"    ❌ Error fetching conditions for {destination['name']}: {e}")
+                    all_conditions.append(None)
+        
+        return all_conditions
+    
+    def _score_individually(self, table: ConditionTable, distances_km, driving_hours, max_distance_km: float,
+                            user_profile: UserProfile, max_walking_hours: float,
+                            max_driving_hours: float) -> Tuple[List[dict], List[ScoringResult]]:
+        """
+        Score each destination of a condition table on its own
+        
+        Returns:
+            tuple: (destinations, ScoringResults) for the destinations that could be scored
+        """
+        destinations, results = [], []
+        for i, destination in enumerate(table.destinations):
+            try:
+                result = self.scoring_service.calculate_personalized_score(
+                    destination, table.weather_data[i], table.snow_data[i], table.avalanche_data[i],
+                    float(distances_km[i]), max_distance_km, user_profile, max_walking_hours,
+                    driving_hours=float(driving_hours[i]), max_driving_hours=max_driving_hours
+                )
+            except Exception as e:
+                print(f"    ❌ Error analyzing {destination.get('name', 'destination')}: {e}")
+                continue
+            destinations.append(destination)
+            results.append(result)
+        return destinations, results
+    
+    def _build_condition_table(self, destinations: List[dict]) -> ConditionTable:
+        """Fetch current conditions and compute the profile-independent scores of every destination"""
+        print(f"📡 Fetching conditions for {len(destinations)} destinations...")
+        all_conditions = self._fetch_destination_conditions(destinations)
+        with_conditions = [
+            (destination, conditions) for destination, conditions in zip(destinations, all_conditions)
+            if conditions is not None
+        ]
+        # Weather and snow clients answer None when their lookup failed (no avalanche warning is normal)
+        incomplete = sum(1 for _, conditions in with_conditions
+                         if conditions['weather'] is None or conditions['snow'] is None)
+        try:
+            table = self._condition_table_for(with_conditions)
+        except Exception as e:
+            # Leave out the records that can't be scored (a retry wouldn't fix them, so the table is still shared)
+            print(f"    ⚠️  Error computing condition scores ({e}) - checking destinations one by one")
+            valid = []
+            for destination, conditions in with_conditions:
+                try:
+                    self._condition_table_for([(destination, conditions)])
+                except Exception as row_error:
+                    print(f"    ❌ Skipping {destination.get('name', 'destination')}: {row_error}")
+                    continue
+                valid.append((destination, conditions))
+            table = self._condition_table_for(valid)
+        return replace(table, failed_fetches=len(destinations) - len(with_conditions) + incomplete)
+    
+    def _condition_table_for(self, with_conditions: List[Tuple[dict, Dict]]) -> ConditionTable:
+        return self.scoring_service.build_condition_table(
+            [destination for destination, _ in with_conditions],
+            [conditions['weather'] for _, conditions in with_conditions],
+            [conditions['snow'] for _, conditions in with_conditions],
+            [conditions['avalanche'] for _, conditions in with_conditions]
+        )
+    
     def _load_ski_destinations(self) -> List[dict]:
         """Load ski touring destinations from JSON file"""
         try:
-            return load_json_file("data/ski_destinations.json")
+            destinations = load_json_file("data/ski_destinations.json")
+            
+            # Precompute each destination's avalanche forecast region
+            for destination in destinations:
+                destination['avalanche_region_id'] = self.varsom_client.find_avalanche_region(
+                    destination['lat'], destination['lon']
+                )
+            return destinations
         except Exception as e:
             print(f"❌ Error loading ski destinations: {e}")
             return []
@@ -292,14 +378,12 @@ class SkiTouringRecommendationService:
             preference_updates: Dict of preferences to update
             
         Returns:
-            Updated UserProfile
+            Updated UserProfile (a new profile; profiles are immutable)
         """
         
-        for key, value in preference_updates.items():
-            if hasattr(user_profile, key):
-                setattr(user_profile, key, value)
-        
-        return user_profile
+        profile_fields = {field.name for field in fields(UserProfile)}
+        return replace(user_profile, **{key: value for key, value in preference_updates.items()
+                                        if key in profile_fields})
     
     def get_destination_details(self, destination_name: str) -> Optional[Dict]:
         """Get detailed information about a specific destination"""
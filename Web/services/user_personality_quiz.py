@@ -4,8 +4,13 @@ Interactive personality quiz to determine user preferences for ski touring
 """
 
 import json
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+PROFILE_TRAITS = ('powder_priority', 'view_priority', 'safety_priority', 'adventure_seeking', 'social_preference')
+PROFILE_CACHE_ENTRIES = 1024  # Distinct profiles whose scoring weights are kept
 
 @dataclass
 class QuizAnswer:
@@ -21,9 +26,12 @@ class QuizQuestion:
     description: str
     answers: List[QuizAnswer]
 
-@dataclass
+@dataclass(frozen=True)
 class UserProfile:
-    """User personality profile for ski touring preferences"""
+    """
+    User personality profile for ski touring preferences
+    Immutable and hashable, so it can key caches; use dataclasses.replace to change it
+    """
     powder_priority: int = 5      # 0-10 scale (how much they prioritize fresh snow)
     view_priority: int = 5        # 0-10 scale (how much they prioritize scenic views)
     safety_priority: int = 5      # 0-10 scale (how safety-conscious they are)
@@ -46,6 +54,26 @@ class UserProfile:
             'risk_tolerance': self.risk_tolerance,
             'experience_level': self.experience_level
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'UserProfile':
+        """
+        Rebuild a profile from to_dict() output (e.g. the session), ignoring unknown keys
+        
+        Returns:
+            UserProfile with trait scores as ints clamped to 0-10
+        """
+        values = {field.name: data[field.name] for field in fields(cls) if field.name in data}
+        for trait in PROFILE_TRAITS:
+            if trait in values:
+                values[trait] = max(0, min(10, int(values[trait])))
+        return cls(**values)
+    
+    @property
+    def key(self) -> str:
+        """Compact canonical form, e.g. '5.5.5.5.5|balanced|moderate|intermediate'"""
+        traits = '.'.join(str(getattr(self, trait)) for trait in PROFILE_TRAITS)
+        return f"{traits}|{self.terrain_preference}|{self.risk_tolerance}|{self.experience_level}"
 
 class SkiTouringPersonalityQuiz:
     def __init__(self):
@@ -243,24 +271,21 @@ class SkiTouringPersonalityQuiz:
                     print("Please enter a valid number")
             
             # Apply scoring from selected answer
-            self._apply_answer_scores(profile, selected_answer, terrain_votes, risk_votes)
+            profile = self._apply_answer_scores(profile, selected_answer, terrain_votes, risk_votes)
             print()
         
         # Finalize profile based on votes
-        self._finalize_profile(profile, terrain_votes, risk_votes)
-        
-        return profile
+        return self._finalize_profile(profile, terrain_votes, risk_votes)
     
     def _apply_answer_scores(self, profile: UserProfile, answer: QuizAnswer, 
-                           terrain_votes: dict, risk_votes: dict):
-        """Apply scoring from a quiz answer to the user profile"""
+                           terrain_votes: dict, risk_votes: dict) -> UserProfile:
+        """Apply scoring from a quiz answer, returning the updated profile"""
         
+        changes = {}
         for trait, score_change in answer.scores.items():
-            if trait in ['powder_priority', 'view_priority', 'safety_priority', 
-                        'adventure_seeking', 'social_preference']:
+            if trait in PROFILE_TRAITS:
                 current_value = getattr(profile, trait)
-                new_value = max(0, min(10, current_value + score_change))
-                setattr(profile, trait, new_value)
+                changes[trait] = max(0, min(10, current_value + score_change))
                 
             elif trait == 'terrain_preference':
                 terrain_type = answer.scores[trait]
@@ -269,25 +294,31 @@ class SkiTouringPersonalityQuiz:
             elif trait == 'risk_tolerance':
                 risk_level = answer.scores[trait]
                 risk_votes[risk_level] = risk_votes.get(risk_level, 0) + 1
+        
+        return replace(profile, **changes)
     
-    def _finalize_profile(self, profile: UserProfile, terrain_votes: dict, risk_votes: dict):
+    def _finalize_profile(self, profile: UserProfile, terrain_votes: dict, risk_votes: dict) -> UserProfile:
         """Finalize profile based on accumulated votes and scores"""
         
+        changes = {}
+        
         # Determine terrain preference from votes
         if terrain_votes:
-            profile.terrain_preference = max(terrain_votes, key=terrain_votes.get)
+            changes['terrain_preference'] = max(terrain_votes, key=terrain_votes.get)
         
         # Determine risk tolerance from votes  
         if risk_votes:
-            profile.risk_tolerance = max(risk_votes, key=risk_votes.get)
+            changes['risk_tolerance'] = max(risk_votes, key=risk_votes.get)
         
         # Determine experience level from other factors
         if profile.safety_priority >= 8:
-            profile.experience_level = "beginner"
+            changes['experience_level'] = "beginner"
         elif profile.adventure_seeking >= 8 and profile.safety_priority <= 4:
-            profile.experience_level = "advanced"
+            changes['experience_level'] = "advanced"
         else:
-            profile.experience_level = "intermediate"
+            changes['experience_level'] = "intermediate"
+        
+        return replace(profile, **changes)
     
     def get_profile_summary(self, profile: UserProfile) -> str:
         """Generate a human-readable summary of the user profile"""
@@ -341,47 +372,53 @@ Terrain Preference: {profile.terrain_preference.replace('_', ' ').title()}
         Returns:
             dict: Scoring weights for different criteria
         """
-        # Base weights
-        weights = {
-            'snow': 0.35,
-            'weather': 0.25,
-            'avalanche': 0.25,
-            'view_terrain': 0.10,
-            'distance': 0.05
-        }
-        
-        # Adjust based on powder priority
-        if profile.powder_priority >= 7:
-            weights['snow'] += 0.15
-            weights['weather'] -= 0.10
-            weights['view_terrain'] -= 0.05
-        elif profile.powder_priority <= 3:
-            weights['snow'] -= 0.10
-            weights['weather'] += 0.05
-            weights['view_terrain'] += 0.05
-        
-        # Adjust based on view priority
-        if profile.view_priority >= 7:
-            weights['weather'] += 0.15
-            weights['view_terrain'] += 0.10
-            weights['snow'] -= 0.15
-        elif profile.view_priority <= 3:
-            weights['view_terrain'] -= 0.05
-            weights['snow'] += 0.05
-        
-        # Adjust based on safety priority
-        if profile.safety_priority >= 8:
-            weights['avalanche'] += 0.15
-            weights['snow'] -= 0.05
-            weights['weather'] -= 0.05
-            weights['distance'] -= 0.05
-        elif profile.safety_priority <= 3:
-            weights['avalanche'] -= 0.10
-            weights['snow'] += 0.05
-            weights['weather'] += 0.05
-        
-        # Ensure weights sum to 1.0
-        total_weight = sum(weights.values())
-        weights = {k: v/total_weight for k, v in weights.items()}
-        
-        return weights
\ No newline at end of file
+        return dict(_quiz_scoring_weights(profile))
+
+
+@lru_cache(maxsize=PROFILE_CACHE_ENTRIES)
+def _quiz_scoring_weights(profile: UserProfile) -> Mapping[str, float]:
+    """Weights behind SkiTouringPersonalityQuiz.calculate_scoring_weights, computed once per profile"""
+    # Base weights
+    weights = {
+        'snow': 0.35,
+        'weather': 0.25,
+        'avalanche': 0.25,
+        'view_terrain': 0.10,
+        'distance': 0.05
+    }
+    
+    # Adjust based on powder priority
+    if profile.powder_priority >= 7:
+        weights['snow'] += 0.15
+        weights['weather'] -= 0.10
+        weights['view_terrain'] -= 0.05
+    elif profile.powder_priority <= 3:
+        weights['snow'] -= 0.10
+        weights['weather'] += 0.05
+        weights['view_terrain'] += 0.05
+    
+    # Adjust based on view priority
+    if profile.view_priority >= 7:
+        weights['weather'] += 0.15
+        weights['view_terrain'] += 0.10
+        weights['snow'] -= 0.15
+    elif profile.view_priority <= 3:
+        weights['view_terrain'] -= 0.05
+        weights['snow'] += 0.05
+    
+    # Adjust based on safety priority
+    if profile.safety_priority >= 8:
+        weights['avalanche'] += 0.15
+        weights['snow'] -= 0.05
+        weights['weather'] -= 0.05
+        weights['distance'] -= 0.05
+    elif profile.safety_priority <= 3:
+        weights['avalanche'] -= 0.10
+        weights['snow'] += 0.05
+        weights['weather'] += 0.05
+    
+    # Ensure weights sum to 1.0
+    total_weight = sum(weights.values())
+    weights = {k: v/total_weight for k, v in weights.items()}
+    
+    return MappingProxyType(weights)
\ No newline at end of file
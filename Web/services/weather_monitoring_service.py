@@ -6,10 +6,10 @@ to assess regional weather patterns for ski touring
 
 import requests
 import json
-import time
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from services.weather_service import WeatherService
+from utils.spatial_index import SpatialIndex
 from utils.file_manager import load_json_file
 import config
 
@@ -39,6 +39,7 @@ class WeatherMonitoringService:
     def __init__(self):
         self.weather_service = WeatherService()
         self.monitoring_points = []
+        self._point_index = None  # SpatialIndex of monitoring_points, built when the grid loads
         self.regional_summaries = {}
         
     def load_monitoring_grid(self):
@@ -55,6 +56,10 @@ class WeatherMonitoringService:
         
         # Combine all monitoring points
         self.monitoring_points = dnt_cabins + strategic_points
+        self._point_index = SpatialIndex(
+            [point.lat for point in self.monitoring_points],
+            [point.lon for point in self.monitoring_points]
+        )
         print(f"   ✅ Total monitoring grid: {len(self.monitoring_points)} points")
         
         return len(self.monitoring_points)
@@ -195,14 +200,11 @@ class WeatherMonitoringService:
             for point in selected_points:
                 try:
                     weather_data = self.weather_service.get_weather_data(
-                        point.lat, point.lon, point.name
+                        point.lat, point.lon, point.name, point.elevation
                     )
                     point.weather_data = weather_data
                     point.weather_score = self._calculate_point_weather_score(weather_data)
                     
-                    # API rate limiting
-                    time.sleep(config.API_DELAY)
-                    
                 except Exception as e:
                     print(f"      ❌ Failed to get weather for {point.name}: {e}")
                     point.weather_score = 0
@@ -316,18 +318,16 @@ class WeatherMonitoringService:
     
     def find_weather_points_near_location(self, lat: float, lon: float, 
                                         radius_km: float = 50) -> List[WeatherPoint]:
-        """Find weather monitoring points near a specific location"""
-        from utils.distance_calculator import calculate_distance
-        
-        nearby_points = []
-        for point in self.monitoring_points:
-            distance = calculate_distance(lat, lon, point.lat, point.lon)
-            if distance <= radius_km:
-                nearby_points.append((point, distance))
-        
-        # Sort by distance
-        nearby_points.sort(key=lambda x: x[1])
-        return [point for point, distance in nearby_points]
+        """Find weather monitoring points near a specific location, nearest first"""
+        if self._point_index is None:
+            return []
+        return [self.monitoring_points[i] for i, _ in self._point_index.within_radius(lat, lon, radius_km)]
+    
+    def find_nearest_weather_points(self, lat: float, lon: float, k: int = 1) -> List[Tuple[WeatherPoint, float]]:
+        """Find the k monitoring points closest to a location, with their distances in km"""
+        if self._point_index is None:
+            return []
+        return [(self.monitoring_points[i], distance) for i, distance in self._point_index.nearest(lat, lon, k)]
     
     def get_monitoring_grid_summary(self) -> Dict:
         """Get summary statistics about the monitoring grid"""
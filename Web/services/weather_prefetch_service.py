@@ -0,0 +1,167 @@
+# services/weather_prefetch_service.py
+"""
+Background refresh of the weather monitoring grid
+Analyzes all regions on a schedule aligned with met.no's forecast updates and
+publishes immutable regional snapshots, so user requests only read the latest one
+"""
+
+import copy
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from services.weather_monitoring_service import WeatherMonitoringService, WeatherPoint, RegionalWeather
+from utils.data_cache import get_data_cache
+import config
+
+SNAPSHOT_CACHE_SOURCE = 'regional_snapshot'
+SNAPSHOT_CACHE_KEY = 'latest'
+
+def forecast_cycle(now: Optional[float] = None) -> int:
+    """
+    Number of the forecast update cycle a time falls in
+    A new cycle starts PREFETCH_OFFSET_MINUTES after each PREFETCH_INTERVAL_MINUTES boundary
+    """
+    now = time.time() if now is None else now
+    interval = config.PREFETCH_INTERVAL_MINUTES * 60
+    offset = config.PREFETCH_OFFSET_MINUTES * 60
+    return int((now - offset) // interval)
+
+@dataclass(frozen=True)
+class RegionalWeatherSnapshot:
+    """Regional weather summaries from one refresh of the monitoring grid"""
+    created_at: float  # Epoch seconds
+    regions: Mapping[str, RegionalWeather]
+
+    @property
+    def age_minutes(self) -> float:
+        return (time.time() - self.created_at) / 60
+
+    def is_fresh(self) -> bool:
+        return self.age_minutes <= config.PREFETCH_MAX_AGE_MINUTES
+
+    def get_regions(self) -> Dict[str, RegionalWeather]:
+        """Private copy of the regional summaries, safe for the caller to modify"""
+        return copy.deepcopy(dict(self.regions))
+
+    def to_dict(self) -> Dict:
+        return {
+            'created_at': self.created_at,
+            'regions': {name: asdict(region) for name, region in self.regions.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RegionalWeatherSnapshot':
+        regions = {}
+        for name, region in data['regions'].items():
+            region = dict(region)
+            region['best_points'] = [WeatherPoint(**point) for point in region['best_points']]
+            regions[name] = RegionalWeather(**region)
+        return cls(created_at=data['created_at'], regions=MappingProxyType(regions))
+
+    @classmethod
+    def from_regions(cls, regions: Dict[str, RegionalWeather]) -> 'RegionalWeatherSnapshot':
+        # Deep copy so later grid refreshes can't change a published snapshot
+        return cls(created_at=time.time(), regions=MappingProxyType(copy.deepcopy(regions)))
+
+
+class WeatherPrefetchService:
+    def __init__(self, weather_monitor: Optional[WeatherMonitoringService] = None):
+        self.weather_monitor = weather_monitor or WeatherMonitoringService()
+        self.data_cache = get_data_cache()
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> RegionalWeatherSnapshot:
+        """
+        Analyze the whole monitoring grid and publish a new snapshot
+
+        Returns:
+            The published snapshot
+        """
+        with self._refresh_lock:
+            started = time.time()
+            regional_weather = self.weather_monitor.analyze_regional_weather(
+                max_points_per_region=config.PREFETCH_POINTS_PER_REGION
+            )
+            snapshot = RegionalWeatherSnapshot.from_regions(regional_weather)
+            self.publish(snapshot)
+            print(f"🔄 Published regional weather snapshot ({len(snapshot.regions)} regions, "
+                  f"{time.time() - started:.1f}s)")
+            return snapshot
+
+    def publish(self, snapshot: RegionalWeatherSnapshot):
+        """Make a snapshot the latest one, in this process and for other processes"""
+        self._snapshot = snapshot
+        self.data_cache.set(
+            SNAPSHOT_CACHE_SOURCE, SNAPSHOT_CACHE_KEY, snapshot.to_dict(),
+            ttl_minutes=config.PREFETCH_MAX_AGE_MINUTES
+        )
+
+    def get_latest_snapshot(self) -> Optional[RegionalWeatherSnapshot]:
+        """
+        Get the latest fresh snapshot, from memory or from the shared cache
+
+        Returns:
+            RegionalWeatherSnapshot, or None if no fresh snapshot is available
+        """
+        snapshot = self._snapshot
+        if snapshot and snapshot.is_fresh():
+            return snapshot
+
+        cached = self.data_cache.get(SNAPSHOT_CACHE_SOURCE, SNAPSHOT_CACHE_KEY)
+        if cached:
+            try:
+                snapshot = RegionalWeatherSnapshot.from_dict(cached)
+            except (KeyError, TypeError) as e:
+                print(f"⚠️  Ignoring invalid regional weather snapshot: {e}")
+                return None
+            if snapshot.is_fresh():
+                self._snapshot = snapshot
+                return snapshot
+        return None
+
+    def seconds_until_next_refresh(self, now: Optional[float] = None) -> float:
+        """
+        Time until the next refresh, aligned to the forecast update cycle
+        Refreshes run PREFETCH_OFFSET_MINUTES after each interval boundary,
+        giving met.no time to publish the new model run
+        """
+        now = time.time() if now is None else now
+        interval = config.PREFETCH_INTERVAL_MINUTES * 60
+        offset = config.PREFETCH_OFFSET_MINUTES * 60
+        next_run = (forecast_cycle(now) + 1) * interval + offset
+        return next_run - now
+
+    def run_forever(self):
+        """Refresh now and then on every update cycle until stop() is called"""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"❌ Regional weather refresh failed: {e}")
+
+            wait = self.seconds_until_next_refresh()
+            next_run = datetime.fromtimestamp(time.time() + wait)
+            print(f"⏰ Next weather refresh at {next_run.strftime('%H:%M')}")
+            self._stop_event.wait(wait)
+
+    def start(self):
+        """Start refreshing in a background daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='weather-prefetch', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after its current refresh"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -3,14 +3,16 @@
 Weather data processing and scoring services
 """
 
-from api_clients.yr_weather_client import YrWeatherClient
+from api_clients.yr_weather_client import YrWeatherClient, quantize_to_grid_cell
+from utils.data_cache import get_data_cache
 import config
 
 class WeatherService:
     def __init__(self):
         self.yr_client = YrWeatherClient()
+        self.data_cache = get_data_cache()
     
-    def get_weather_data(self, lat, lon, location_name=""):
+    def get_weather_data(self, lat, lon, location_name="", elevation=None):
         """
         Get and process weather data for a location
         
@@ -18,13 +20,22 @@ class WeatherService:
             lat (float): Latitude
             lon (float): Longitude
             location_name (str): Name for logging
+            elevation (float): Elevation in meters, used to correct grid cell temperatures
             
         Returns:
             dict: Processed weather summary, or None if failed
         """
+        cell_lat, cell_lon = quantize_to_grid_cell(lat, lon)
+        cache_key = f"{cell_lat},{cell_lon},{elevation}"
+        cached = self.data_cache.get('weather', cache_key)
+        if cached:
+            return cached
+        
         raw_weather = self.yr_client.get_weather_forecast(lat, lon, location_name)
         if raw_weather:
-            return self.yr_client.extract_weather_summary(raw_weather)
+            summary = self.yr_client.extract_weather_summary(raw_weather, elevation)
+            self.data_cache.set('weather', cache_key, summary)
+            return summary
         return None
     
     def calculate_weather_score(self, weather_summary):
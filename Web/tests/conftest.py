@@ -0,0 +1,22 @@
+# tests/conftest.py
+"""
+Shared test setup: run from the Web directory (data files are loaded with
+relative paths) and keep caches and saved results out of the working tree
+"""
+
+import os
+import sys
+
+import pytest
+
+WEB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WEB_DIR)
+
+import config
+
+
+@pytest.fixture(autouse=True)
+def web_environment(monkeypatch, tmp_path):
+    monkeypatch.chdir(WEB_DIR)
+    monkeypatch.setattr(config, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(config, 'RESULTS_DIR', str(tmp_path / 'results'))
@@ -0,0 +1,41 @@
+# tests/test_condition_table_cache.py
+"""
+Condition tables are shared for a forecast cycle, unless a fetch failed while building them
+"""
+
+from dataclasses import replace
+
+from services.dynamic_scoring_service import ConditionTableCache, DynamicScoringService
+
+DESTINATION = {'name': 'Test Peak', 'terrain_type': 'coastal_alpine', 'view_score': 85,
+               'access': 'road_access', 'elevation_range': [100, 1200]}
+WEATHER = {'avg_temp_24h': -3, 'total_precipitation_24h': 0, 'current_wind_speed': 4, 'current_humidity': 60}
+SNOW = {'snow_depth_cm': 80, 'snowfall_3days_cm': 15, 'temperature_trend': 'stable', 'wind_effect': 'minimal'}
+
+
+def _builder(failed_fetches):
+    table = DynamicScoringService().build_condition_table([DESTINATION], [WEATHER], [SNOW], [None])
+    builds = []
+
+    def build():
+        builds.append(1)
+        return replace(table, failed_fetches=failed_fetches)
+    return build, builds
+
+
+def test_complete_table_is_built_once():
+    cache = ConditionTableCache()
+    build, builds = _builder(0)
+
+    first = cache.get('destinations', build)
+    assert cache.get('destinations', build) is first
+    assert len(builds) == 1
+
+
+def test_table_with_failed_fetches_is_rebuilt():
+    cache = ConditionTableCache()
+    build, builds = _builder(1)
+
+    cache.get('destinations', build)
+    cache.get('destinations', build)
+    assert len(builds) == 2
@@ -0,0 +1,36 @@
+# tests/test_data_cache.py
+"""
+Persistent data cache: expiry and periodic eviction
+"""
+
+import sqlite3
+
+from utils.data_cache import DataCache
+
+
+def _count(cache):
+    return sqlite3.connect(cache.db_path).execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+def test_values_round_trip_and_expire(tmp_path):
+    cache = DataCache(db_path=str(tmp_path / 'cache.sqlite'), enabled=True)
+
+    cache.set('weather', 'a', {'temp': -3})
+    cache.set('weather', 'b', {'temp': -5}, ttl_minutes=-1)
+
+    assert cache.get('weather', 'a') == {'temp': -3}
+    assert cache.get('weather', 'b') is None
+
+
+def test_eviction_runs_every_interval(tmp_path):
+    cache = DataCache(db_path=str(tmp_path / 'cache.sqlite'), max_entries=3, evict_interval=4, enabled=True)
+
+    for i in range(3):
+        cache.set('weather', str(i), i)
+    cache.set('weather', 'expired', 0, ttl_minutes=-1)
+    assert _count(cache) == 3  # Evicted on the 4th write: the expired entry
+
+    for i in range(3, 7):
+        cache.set('weather', str(i), i, ttl_minutes=60 + i)
+    assert _count(cache) == 3
+    assert [cache.get('weather', str(i)) for i in range(4, 7)] == [4, 5, 6]
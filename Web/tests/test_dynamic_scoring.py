@@ -0,0 +1,114 @@
+# tests/test_dynamic_scoring.py
+"""
+Randomized checks that the batch scoring paths agree with the scalar one:
+score_many gives the same scores as calculate_personalized_score, upper
+bounds are never below a real score, and rank_top_k matches a full ranking
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from services.dynamic_scoring_service import DynamicScoringService
+from services.user_personality_quiz import UserProfile
+
+TERRAIN_TYPES = ['coastal_alpine', 'high_alpine', 'forest_valley', 'plateau_ridge', 'fjord_valley', 'unknown']
+ACCESS_TYPES = ['road_access', 'lift_access', 'hut_access', 'boat_or_snowmobile', 'road_closed_winter', 'unknown']
+AVALANCHE_PROBLEMS = ['persistent_weak_layer', 'wind_slab', 'new_snow', 'wet_snow', 'glide']
+MAX_DISTANCE_KM = 250
+
+
+def _candidate(rng, i):
+    destination = {
+        'name': f"Tour {i}", 'terrain_type': rng.choice(TERRAIN_TYPES), 'view_score': rng.randint(50, 100),
+        'access': rng.choice(ACCESS_TYPES), 'technical_level': rng.randint(1, 9),
+        'elevation_range': [rng.randint(0, 900), rng.randint(900, 2400)]
+    }
+    weather = rng.choice([None, {
+        'avg_temp_24h': rng.uniform(-20, 15), 'total_precipitation_24h': rng.choice([0, rng.uniform(0, 8)]),
+        'current_wind_speed': rng.uniform(0, 20), 'current_humidity': rng.uniform(20, 95)
+    }])
+    snow = rng.choice([None, {
+        'snow_depth_cm': rng.uniform(0, 150), 'snowfall_3days_cm': rng.uniform(0, 40),
+        'temperature_trend': rng.choice(['cooling', 'stable', 'warming', 'unknown', 'other']),
+        'wind_effect': rng.choice(['minimal', 'moderate', 'significant', 'unknown']),
+        'elevation': rng.randint(100, 1200)
+    }])
+    avalanche = rng.choice([None, {
+        'danger_level': rng.randint(1, 5), 'danger_text': 'Moderate',
+        'avalanche_problems': rng.sample(AVALANCHE_PROBLEMS, rng.randint(0, 3))
+    }])
+    return destination, weather, snow, avalanche
+
+
+def _profile(rng):
+    return UserProfile(powder_priority=rng.randint(0, 10), view_priority=rng.randint(0, 10),
+                       safety_priority=rng.randint(0, 10), adventure_seeking=rng.randint(0, 10),
+                       terrain_preference=rng.choice(TERRAIN_TYPES),
+                       risk_tolerance=rng.choice(['conservative', 'moderate', 'aggressive']))
+
+
+def _scenario(seed, n):
+    rng = random.Random(seed)
+    rows = [_candidate(rng, i) for i in range(n)]
+    distances = [rng.uniform(0, 400) for _ in range(n)]
+    driving_hours = [rng.choice([None, rng.uniform(0, 6)]) for _ in range(n)]
+    options = {'max_walking_hours': rng.choice([0, 1.0]), 'max_driving_hours': rng.choice([None, 4])}
+    return rows, distances, driving_hours, _profile(rng), options
+
+
+@pytest.fixture(scope='module')
+def service():
+    return DynamicScoringService()
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_score_many_matches_scalar_scoring(service, seed):
+    rows, distances, driving_hours, profile, options = _scenario(seed, 300)
+
+    scalar = [
+        service.calculate_personalized_score(destination, weather, snow, avalanche, distance, MAX_DISTANCE_KM,
+                                             profile, options['max_walking_hours'], hours,
+                                             options['max_driving_hours'])
+        for (destination, weather, snow, avalanche), distance, hours in zip(rows, distances, driving_hours)
+    ]
+    batch = service.score_many(*[list(column) for column in zip(*rows)], distances, MAX_DISTANCE_KM, profile,
+                               options['max_walking_hours'], driving_hours, options['max_driving_hours'])
+
+    for expected, actual in zip(scalar, batch):
+        assert actual.total_score == expected.total_score  # Bit-identical, so rankings agree too
+        assert actual.within_range == expected.within_range
+        assert actual.component_scores == expected.component_scores
+        assert actual.personalized_summary == expected.personalized_summary
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_upper_bounds_are_never_below_real_scores(service, seed):
+    rows, distances, driving_hours, profile, options = _scenario(seed, 500)
+
+    scores = service.score_many(*[list(column) for column in zip(*rows)], distances, MAX_DISTANCE_KM, profile,
+                                options['max_walking_hours'], driving_hours, options['max_driving_hours'])
+    bounds = service.score_upper_bounds([row[0] for row in rows], distances, MAX_DISTANCE_KM, profile,
+                                        driving_hours, options['max_driving_hours'])
+
+    assert np.all(bounds >= np.array([result.total_score for result in scores]))
+
+
+@pytest.mark.parametrize('seed, k', [(0, 1), (1, 3), (2, 10), (3, 10), (4, 25), (5, 600)])
+def test_rank_top_k_matches_full_ranking(service, seed, k):
+    rows, distances, driving_hours, profile, options = _scenario(seed, 500)
+    failed = {i for i in range(len(rows)) if i % 97 == 5}
+
+    def fetch_conditions(positions):
+        return [None if i in failed else rows[i][1:] for i in positions]
+
+    scores = service.score_many(*[list(column) for column in zip(*rows)], distances, MAX_DISTANCE_KM, profile,
+                                options['max_walking_hours'], driving_hours, options['max_driving_hours'])
+    top = service.rank_top_k([row[0] for row in rows], k, fetch_conditions, distances, MAX_DISTANCE_KM, profile,
+                             options['max_walking_hours'], driving_hours, options['max_driving_hours'])
+
+    fetched = [i for i in range(len(rows)) if i not in failed]
+    expected = sorted(fetched, key=lambda i: -scores[i].total_score)[:k]
+    assert [position for position, _ in top] == expected
+    assert [result.total_score for _, result in top] == [scores[i].total_score for i in expected]
@@ -0,0 +1,70 @@
+# tests/test_file_manager.py
+"""
+Saving recommendations: lazily formatted text must end up in the file
+"""
+
+from services.dynamic_scoring_service import DynamicScoringService
+from services.regional_ski_touring_service import RegionalRecommendation, SkiTour
+from services.user_personality_quiz import UserProfile
+from services.weather_monitoring_service import RegionalWeather
+from utils.file_manager import load_recommendations, save_recommendations
+from utils.lazy_text import LazyText
+
+DESTINATION = {
+    'name': 'Test Peak', 'terrain_type': 'coastal_alpine', 'view_score': 85, 'access': 'road_access',
+    'elevation_range': [100, 1200], 'technical_level': 5
+}
+WEATHER = {'avg_temp_24h': -3, 'total_precipitation_24h': 0, 'current_wind_speed': 4, 'current_humidity': 60}
+SNOW = {'snow_depth_cm': 80, 'snowfall_3days_cm': 15, 'temperature_trend': 'stable',
+        'wind_effect': 'minimal', 'elevation': 400}
+AVALANCHE = {'danger_level': 2, 'danger_text': '2 - Moderat', 'avalanche_problems': ['wind_slab']}
+
+
+def _scoring_result():
+    return DynamicScoringService().calculate_personalized_score(
+        DESTINATION, WEATHER, SNOW, AVALANCHE, 40, 250, UserProfile(), max_walking_hours=1.0)
+
+
+def test_saved_scoring_result_includes_formatted_text():
+    result = _scoring_result()
+
+    path = save_recommendations({'recommendations': [result]}, {'starting_location': {'name': 'Tromsø'}})
+    saved = load_recommendations(path)['recommendations'][0]
+
+    assert saved['destination_name'] == 'Test Peak'
+    assert saved['total_score'] == result.total_score
+    assert saved['personalized_summary'] == result.personalized_summary
+    assert 'explanation' not in saved
+    analysis = saved['snow_depth_analysis']
+    assert analysis['snow_warnings'] == result.snow_depth_analysis.snow_warnings
+    assert analysis['recommendation_notes'] == result.snow_depth_analysis.recommendation_notes
+
+
+def test_saved_regional_recommendation_round_trips():
+    result = _scoring_result()
+    tour = SkiTour(name='Test Peak', lat=69.6, lon=19.0, region='Lyngen Alps', elevation_range=[100, 1200],
+                   difficulty='intermediate', duration_hours='4-6', approach='road', description='Test tour',
+                   features=['summit_to_sea'], avalanche_exposure='moderate', technical_grade=5)
+    weather = RegionalWeather(region_name='Lyngen Alps', avg_score=72.5, point_count=3, best_points=[],
+                              weather_summary='Clear', conditions={'avg_temp': -3})
+    recommendation = RegionalRecommendation(
+        region_name='Lyngen Alps', weather_summary=weather, recommended_tours=[(tour, result)], region_score=72.5,
+        accessibility_from_start='2.0h drive', rationale=LazyText(lambda name: f"Recommended for {name}", 'Lyngen')
+    )
+
+    path = save_recommendations({'regional_recommendations': [recommendation]},
+                                {'starting_location': {'name': 'Tromsø'}}, filename='regional.json')
+    saved = load_recommendations(path)['regional_recommendations'][0]
+
+    assert saved['why_recommended'] == 'Recommended for Lyngen'
+    assert 'rationale' not in saved
+    assert saved['weather_summary']['avg_score'] == 72.5
+    saved_tour, saved_result = saved['recommended_tours'][0]
+    assert saved_tour['name'] == 'Test Peak'
+    assert saved_result['personalized_summary'] == result.personalized_summary
+
+
+def test_lazy_text_is_saved_formatted():
+    path = save_recommendations({'note': LazyText(str.upper, 'powder')}, {}, filename='note.json')
+
+    assert load_recommendations(path) == {'note': 'POWDER'}
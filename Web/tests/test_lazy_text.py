@@ -0,0 +1,44 @@
+# tests/test_lazy_text.py
+"""
+LazyText: formatted once, shared between equal inputs, safe to read from many threads
+"""
+
+import threading
+
+from utils.lazy_text import LazyText
+
+
+def test_text_is_formatted_on_first_use():
+    calls = []
+
+    def build(name):
+        calls.append(name)
+        return f"Hello {name}"
+
+    handle = LazyText(build, 'Tromsø-unique-input')
+    assert calls == []
+    assert handle.text == 'Hello Tromsø-unique-input'
+    assert str(handle) == 'Hello Tromsø-unique-input'
+    assert calls == ['Tromsø-unique-input']
+
+
+def test_concurrent_readers_all_get_the_text():
+    handles = [LazyText(lambda i: f"text {i}", i) for i in range(2000)]
+    errors = []
+    barrier = threading.Barrier(8)
+
+    def read():
+        barrier.wait()
+        try:
+            for i, handle in enumerate(handles):
+                assert handle.text == f"text {i}"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
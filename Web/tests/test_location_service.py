@@ -0,0 +1,39 @@
+# tests/test_location_service.py
+"""
+Autocomplete: local place name index first, Kartverket for places it doesn't know
+"""
+
+import pytest
+
+from services.location_service import LocationService
+
+
+class FakeKartverketClient:
+    def __init__(self):
+        self.queries = []
+
+    def fetch_places(self, place_name, max_results):
+        self.queries.append(place_name)
+        return [{'name': 'Skibotn', 'lat': 69.39, 'lon': 20.27, 'municipality': 'Storfjord', 'county': 'Troms'}]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = LocationService()
+    service.kartverket_client = FakeKartverketClient()
+    monkeypatch.setattr(service.geocoding_cache, 'enabled', False)
+    return service
+
+
+def test_indexed_places_are_suggested_locally(service):
+    suggestions = service.suggest_locations('Tromsø')
+
+    assert suggestions and suggestions[0]['name'] == 'Tromsø'
+    assert service.kartverket_client.queries == []
+
+
+def test_unknown_places_fall_back_to_kartverket(service):
+    suggestions = service.suggest_locations('Skibotn')
+
+    assert [suggestion['name'] for suggestion in suggestions] == ['Skibotn']
+    assert service.kartverket_client.queries == ['Skibotn']
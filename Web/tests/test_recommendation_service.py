@@ -0,0 +1,28 @@
+# tests/test_recommendation_service.py
+"""
+Destination weather is requested at the tour's elevation
+"""
+
+from services import recommendation_service
+from services.recommendation_service import RecommendationService
+
+
+class FakeWeatherService:
+    def __init__(self):
+        self.elevations = []
+
+    def get_weather_data(self, lat, lon, location_name="", elevation=None):
+        self.elevations.append(elevation)
+        return None
+
+
+def test_weather_is_fetched_at_mid_tour_elevation(monkeypatch):
+    service = RecommendationService()
+    service.weather_service = FakeWeatherService()
+    destinations = [{'name': 'Test Peak', 'lat': 69.6, 'lon': 20.2, 'elevation_range': [100, 1300]},
+                    {'name': 'No Range', 'lat': 69.7, 'lon': 20.1}]
+    monkeypatch.setattr(recommendation_service, 'load_destinations', lambda: destinations)
+
+    service.find_best_destinations({'name': 'Tromsø', 'lat': 69.65, 'lon': 18.96}, 8)
+
+    assert service.weather_service.elevations == [700, None]
@@ -0,0 +1,31 @@
+# tests/test_region_index.py
+"""
+Region lookup: containing polygon first, nearest outline within the fallback distance
+"""
+
+from utils.region_index import RegionIndex
+
+
+def _square(region_id, name, min_lon, min_lat, max_lon, max_lat):
+    ring = [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+    return {'type': 'Feature', 'properties': {'id': region_id, 'name': name},
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]}}
+
+
+INDEX = RegionIndex([_square(3010, 'Lyngen', 19.6, 69.25, 20.9, 70.1),
+                     _square(3011, 'Tromsø', 17.8, 69.35, 19.6, 70.3)])
+
+
+def test_point_inside_a_region():
+    assert INDEX.lookup(69.6, 20.2)['id'] == 3010
+    assert INDEX.lookup(69.65, 18.96)['id'] == 3011
+
+
+def test_point_outside_every_region_needs_a_fallback():
+    # About 11 km south of Lyngen
+    assert INDEX.lookup(69.15, 20.2) is None
+    assert INDEX.lookup(69.15, 20.2, fallback_km=50)['id'] == 3010
+
+
+def test_fallback_is_limited_to_nearby_regions():
+    assert INDEX.lookup(63.43, 10.39, fallback_km=50) is None
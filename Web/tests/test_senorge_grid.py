@@ -0,0 +1,89 @@
+# tests/test_senorge_grid.py
+"""
+Ingested seNorge grids: lookups, the snow data built from them and store refreshes
+"""
+
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from api_clients.senorge_client import SeNorgeClient
+from api_clients.senorge_grid import GRID_META_FILE, SnowGridStore, get_grid_root, ingest_snow_grids
+from utils.projection import latlon_to_utm33
+
+LAT, LON = 69.65, 18.96  # Tromsø
+
+
+def _ingest(tmp_path, day, depth_mm, elevation_m=None):
+    x0, y0 = (float(value) for value in latlon_to_utm33(LAT, LON))
+    x = x0 - 5000 + 1000 * np.arange(10)
+    y = y0 - 5000 + 1000 * np.arange(10)
+    grids = {'x': x, 'y': y, 'snow_depth': np.full((10, 10), depth_mm), 'new_snow': np.full((10, 10), 20.0)}
+    if elevation_m is not None:
+        grids['elevation'] = np.full((10, 10), elevation_m)
+    source = tmp_path / f"source_{day}.npz"
+    np.savez(source, **grids)
+    assert ingest_snow_grids(day, str(source))
+
+
+def _client():
+    client = SeNorgeClient()
+    client.grid_store = SnowGridStore(get_grid_root())
+    return client
+
+
+def test_grid_snow_data_uses_the_cell_elevation(tmp_path):
+    _ingest(tmp_path, date.today(), 800.0, elevation_m=320.0)
+
+    snow = _client().get_grid_snow_data(LAT, LON, 'Tromsø', elevation=50)
+
+    assert snow['snow_depth_cm'] == 80.0
+    assert snow['snowfall_3days_cm'] == 2.0
+    assert snow['elevation'] == 320.0
+
+
+def test_grid_snow_data_falls_back_to_the_given_elevation(tmp_path):
+    _ingest(tmp_path, date.today(), 800.0)
+
+    snow = _client().get_grid_snow_data(LAT, LON, 'Tromsø', elevation=50)
+
+    assert snow['elevation'] == 50
+
+
+def test_unmeasured_trend_and_wind_score_neutral(tmp_path):
+    _ingest(tmp_path, date.today(), 800.0)
+    client = _client()
+    snow = client.get_grid_snow_data(LAT, LON, 'Tromsø')
+
+    best = dict(snow, temperature_trend='stable', wind_effect='minimal')
+    worst = dict(snow, temperature_trend='warming', wind_effect='significant')
+    assert (client.calculate_snow_quality_score(worst) < client.calculate_snow_quality_score(snow)
+            < client.calculate_snow_quality_score(best))
+
+
+def test_reingested_day_is_reopened(tmp_path):
+    _ingest(tmp_path, date.today(), 800.0)
+    store = SnowGridStore(get_grid_root())
+    assert store.lookup(LAT, LON)['snow_depth_cm'] == 80.0
+
+    _ingest(tmp_path, date.today(), 1200.0)
+    meta_path = os.path.join(get_grid_root(), date.today().isoformat(), GRID_META_FILE)
+    os.utime(meta_path, (time.time() + 10, time.time() + 10))  # Coarse file system clocks
+
+    assert store.lookup(LAT, LON)['snow_depth_cm'] == 120.0
+
+
+def test_days_outside_the_window_are_unmapped(tmp_path):
+    today = date.today()
+    for offset in range(5):
+        _ingest(tmp_path, today - timedelta(days=offset), 800.0)
+    store = SnowGridStore(get_grid_root())
+    store.available_dates()
+    old_day = today - timedelta(days=4)
+    assert store.get_grid(old_day) is not None
+
+    store.lookup(LAT, LON)
+
+    assert sorted(store._grids) == [today - timedelta(days=offset) for offset in (2, 1, 0)]
@@ -0,0 +1,46 @@
+# tests/test_ski_touring_service.py
+"""
+A malformed destination record is skipped without emptying the results
+"""
+
+import numpy as np
+
+from services.ski_touring_service import SkiTouringRecommendationService
+from services.user_personality_quiz import UserProfile
+
+WEATHER = {'avg_temp_24h': -3, 'total_precipitation_24h': 0, 'current_wind_speed': 4, 'current_humidity': 60}
+
+
+def _destination(name):
+    return {'name': name, 'lat': 69.6, 'lon': 20.2, 'terrain_type': 'coastal_alpine', 'view_score': 85,
+            'access': 'road_access', 'elevation_range': [100, 1200]}
+
+
+def _conditions(snow_depth):
+    return {'weather': WEATHER, 'avalanche': None,
+            'snow': {'snow_depth_cm': snow_depth, 'snowfall_3days_cm': 10, 'elevation': 100}}
+
+
+def test_bad_record_is_left_out_of_the_condition_table(monkeypatch):
+    service = SkiTouringRecommendationService()
+    destinations = [_destination('Good'), _destination('Bad'), _destination('Also Good')]
+    monkeypatch.setattr(service, '_fetch_destination_conditions',
+                        lambda _: [_conditions(80), _conditions('deep'), _conditions(60)])
+
+    table = service._build_condition_table(destinations)
+
+    assert [destination['name'] for destination in table.destinations] == ['Good', 'Also Good']
+    assert table.failed_fetches == 0  # A retry wouldn't fix it, so the table can be shared
+
+
+def test_destinations_are_scored_one_by_one_when_needed():
+    service = SkiTouringRecommendationService()
+    table = service._condition_table_for([(_destination('Good'), _conditions(80)),
+                                          (_destination('Also Good'), _conditions(60))])
+    table.snow_data[0] = {'snow_depth_cm': 'deep'}  # Breaks the scalar path for this destination only
+
+    destinations, results = service._score_individually(table, np.array([40.0, 60.0]), np.array([1.0, 1.5]),
+                                                        250, UserProfile(), 0, 4)
+
+    assert [destination['name'] for destination in destinations] == ['Also Good']
+    assert results[0].destination_name == 'Also Good'
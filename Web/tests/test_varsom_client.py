@@ -0,0 +1,58 @@
+# tests/test_varsom_client.py
+"""
+Region warning cache: "no warning" is retried, found warnings expire, old days are dropped
+"""
+
+import pytest
+
+import config
+from api_clients import varsom_client
+from api_clients.varsom_client import VarsomClient
+
+
+class FakeWarningStore:
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def get_warning(self, region_id, valid_date):
+        self.calls += 1
+        answer = self.answers.pop(0)
+        return dict(answer) if answer else answer
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(config, 'MOCK_API_DATA', False)
+    monkeypatch.setattr(varsom_client, '_region_warnings', {})
+    client = VarsomClient()
+    client._region_warnings = varsom_client._region_warnings
+    return client
+
+
+def test_missing_warning_is_looked_up_again(client):
+    client.warning_store = FakeWarningStore([None, {'danger_level': 3}])
+
+    assert client._get_cached_regional_warning(3010, True, False) is None
+    assert client._get_cached_regional_warning(3010, True, False)['danger_level'] == 3
+    assert client._get_cached_regional_warning(3010, True, False)['danger_level'] == 3
+    assert client.warning_store.calls == 2
+
+
+def test_found_warning_expires(client, monkeypatch):
+    client.warning_store = FakeWarningStore([{'danger_level': 2}, {'danger_level': 4}])
+    now = varsom_client.time.time()
+    monkeypatch.setattr(varsom_client.time, 'time', lambda: now)
+
+    assert client._get_cached_regional_warning(3010, True, False)['danger_level'] == 2
+    monkeypatch.setattr(varsom_client.time, 'time', lambda: now + config.AVALANCHE_WARNING_TTL_MINUTES * 60 + 1)
+    assert client._get_cached_regional_warning(3010, True, False)['danger_level'] == 4
+
+
+def test_earlier_days_are_dropped(client):
+    client._region_warnings[(3010, '2000-01-01')] = ({'danger_level': 1}, float('inf'))
+    client.warning_store = FakeWarningStore([{'danger_level': 2}])
+
+    client._get_cached_regional_warning(3011, True, False)
+
+    assert [key[0] for key in client._region_warnings] == [3011]
@@ -0,0 +1,173 @@
+# utils/data_cache.py
+"""
+Persistent cache for API results shared by all processes
+Entries live in a SQLite database under CACHE_DIR, so CGI invocations and
+WSGI workers on the same machine read and warm the same cache
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+class DataCache:
+    def __init__(self, db_path=None, ttl_minutes=None, max_entries=None, enabled=None, evict_interval=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, 'data_cache.sqlite')
+        self.ttl_minutes = ttl_minutes if ttl_minutes is not None else config.CACHE_TTL_MINUTES
+        self.max_entries = max_entries or config.CACHE_MAX_ENTRIES
+        self.evict_interval = evict_interval or config.CACHE_EVICT_INTERVAL
+        self.enabled = config.ENABLE_CACHING if enabled is None else enabled
+        self._local = threading.local()
+        self._writes = 0  # Since the last eviction pass
+        self._writes_lock = threading.Lock()
+        if self.enabled:
+            self.enabled = self._init_database()
+
+    def _init_database(self):
+        """Create the entry table, disabling the cache on failure"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            conn.execute('PRAGMA journal_mode=WAL')  # Readers never block the writer
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'source TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+                'expires_at REAL NOT NULL, PRIMARY KEY (source, key))'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expires_at)')
+            return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Data cache unavailable ({e}) - caching disabled")
+            return False
+
+    def _connect(self):
+        """One connection per thread, in autocommit mode so we control transactions"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get_ttl_minutes(self, source):
+        """Time to live for a data source, falling back to CACHE_DURATION_MINUTES"""
+        return self.ttl_minutes.get(source, config.CACHE_DURATION_MINUTES)
+
+    def get(self, source, key):
+        """
+        Get a cached value if it exists and has not expired
+
+        Args:
+            source (str): Data source, e.g. 'weather' or 'geocoding'
+            key (str): Key within the source
+
+        Returns:
+            Cached value (JSON types), or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            row = self._connect().execute(
+                'SELECT value FROM entries WHERE source = ? AND key = ? AND expires_at > ?',
+                (source, key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️  Data cache read failed ({e})")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, source, key, value, ttl_minutes=None):
+        """
+        Store a JSON-serializable value, replacing any previous entry atomically
+
+        Args:
+            source (str): Data source, e.g. 'weather' or 'geocoding'
+            key (str): Key within the source
+            value: JSON-serializable value
+            ttl_minutes (float): Override of the source's time to live
+        """
+        if not self.enabled or value is None:
+            return
+        if ttl_minutes is None:
+            ttl_minutes = self.get_ttl_minutes(source)
+
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️  Cannot cache {source} entry '{key}': {e}")
+            return
+
+        conn = self._connect()
+        try:
+            # A single statement commits atomically on its own, so the write lock is held only briefly
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (source, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                (source, key, payload, time.time() + ttl_minutes * 60)
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️  Data cache write failed ({e})")
+            return
+
+        with self._writes_lock:
+            self._writes += 1
+            evict = self._writes >= self.evict_interval
+            if evict:
+                self._writes = 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the ones closest to expiry while over max_entries"""
+        if not self.enabled:
+            return
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('DELETE FROM entries WHERE expires_at <= ?', (time.time(),))
+                count = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+                if count > self.max_entries:
+                    conn.execute(
+                        'DELETE FROM entries WHERE rowid IN '
+                        '(SELECT rowid FROM entries ORDER BY expires_at LIMIT ?)',
+                        (count - self.max_entries,)
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            print(f"⚠️  Data cache eviction failed ({e})")
+
+    def clear(self, source=None):
+        """Remove all entries, or only those of one source"""
+        if not self.enabled:
+            return
+        try:
+            if source is None:
+                self._connect().execute('DELETE FROM entries')
+            else:
+                self._connect().execute('DELETE FROM entries WHERE source = ?', (source,))
+        except sqlite3.Error as e:
+            print(f"⚠️  Data cache clear failed ({e})")
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_data_cache():
+    """
+    Get the process-wide data cache
+
+    Returns:
+        DataCache: Shared cache instance
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = DataCache()
+    return _shared_cache
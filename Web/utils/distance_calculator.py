@@ -4,8 +4,14 @@ Geographic distance calculation utilities
 """
 
 import math
+
+import numpy as np
+
 import config
 
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE_LAT = 111.32
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """
     Calculate the great circle distance between two points using Haversine formula
@@ -27,25 +33,112 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     c = 2 * math.asin(math.sqrt(a))
     
     # Radius of earth in kilometers
-    r = 6371
+    r = EARTH_RADIUS_KM
     
     return c * r
 
+class CoordinateArray:
+    """
+    Many points converted to radians once, for repeated batch distance calculations
+    Build one per catalog (destinations, tours, monitoring points) and reuse it for every request
+    """
+    
+    def __init__(self, lats, lons):
+        """
+        Args:
+            lats: Latitudes in degrees (sequence or array)
+            lons: Longitudes in degrees (sequence or array)
+        """
+        self.lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+        self.lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+        self.cos_lat = np.cos(self.lat_rad)
+    
+    def __len__(self):
+        return len(self.lat_rad)
+    
+    def distances_from(self, lat, lon):
+        """
+        Haversine distances from one origin to every point
+        
+        Args:
+            lat, lon: Origin in degrees
+            
+        Returns:
+            np.ndarray: Distances in kilometers, one per point
+        """
+        lat_rad, lon_rad = math.radians(lat), math.radians(lon)
+        a = (np.sin((self.lat_rad - lat_rad) / 2) ** 2
+             + math.cos(lat_rad) * self.cos_lat * np.sin((self.lon_rad - lon_rad) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    
+    def distance_matrix(self, other):
+        """
+        Haversine distances between every point here and every point in another array
+        
+        Args:
+            other (CoordinateArray): Second set of points
+            
+        Returns:
+            np.ndarray: M x N distances in kilometers (rows are this array's points)
+        """
+        dlat = self.lat_rad[:, np.newaxis] - other.lat_rad[np.newaxis, :]
+        dlon = self.lon_rad[:, np.newaxis] - other.lon_rad[np.newaxis, :]
+        a = (np.sin(dlat / 2) ** 2
+             + np.outer(self.cos_lat, other.cos_lat) * np.sin(dlon / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def calculate_distances(lat, lon, lats, lons):
+    """
+    Calculate distances from one point to many points in one vectorized step
+    
+    Args:
+        lat, lon: Latitude and longitude of the origin
+        lats, lons: Latitudes and longitudes of the other points
+        
+    Returns:
+        np.ndarray: Distances in kilometers
+    """
+    return CoordinateArray(lats, lons).distances_from(lat, lon)
+
+def calculate_distance_matrix(lats1, lons1, lats2, lons2):
+    """
+    Calculate distances between every pair of points from two sets
+    
+    Args:
+        lats1, lons1: First set of points (M)
+        lats2, lons2: Second set of points (N)
+        
+    Returns:
+        np.ndarray: M x N distances in kilometers
+    """
+    return CoordinateArray(lats1, lons1).distance_matrix(CoordinateArray(lats2, lons2))
+
+def _driving_table():
+    """(hours, straight-line km) points of config.DRIVING_DISTANCES, extended at AVERAGE_DRIVING_SPEED"""
+    hours = [0] + sorted(config.DRIVING_DISTANCES)
+    distances = [0] + [config.DRIVING_DISTANCES[h] for h in hours[1:]]
+    hours.append(hours[-1] + 100)
+    distances.append(distances[-1] + 100 * config.AVERAGE_DRIVING_SPEED)
+    return hours, distances
+
 def calculate_driving_time(distance_km, speed_kmh=None):
     """
-    Calculate estimated driving time
+    Calculate estimated driving time from straight-line distance
     
     Args:
-        distance_km (float): Distance in kilometers
-        speed_kmh (float): Average speed in km/h (uses config default if None)
+        distance_km (float or array): Distance in kilometers
+        speed_kmh (float): Average speed in km/h (if None, follows config.DRIVING_DISTANCES,
+                           the same table get_max_distance_for_hours uses)
         
     Returns:
-        float: Driving time in hours
+        float (or array): Driving time in hours
     """
-    if speed_kmh is None:
-        speed_kmh = config.AVERAGE_DRIVING_SPEED
+    if speed_kmh is not None:
+        return distance_km / speed_kmh
     
-    return distance_km / speed_kmh
+    hours, distances = _driving_table()
+    driving_hours = np.interp(distance_km, distances, hours)
+    return float(driving_hours) if np.ndim(distance_km) == 0 else driving_hours
 
 def get_max_distance_for_hours(hours):
     """
@@ -55,9 +148,12 @@ def get_max_distance_for_hours(hours):
         hours (int): Number of driving hours
         
     Returns:
-        int: Maximum distance in kilometers
+        float: Maximum distance in kilometers
     """
-    return config.DRIVING_DISTANCES.get(hours, hours * config.AVERAGE_DRIVING_SPEED)
+    if hours in config.DRIVING_DISTANCES:
+        return config.DRIVING_DISTANCES[hours]
+    table_hours, distances = _driving_table()
+    return float(np.interp(hours, table_hours, distances))
 
 def is_within_driving_range(distance_km, max_hours):
     """
@@ -8,6 +8,7 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import config
+from utils.lazy_text import LazyText
 
 def load_destinations():
     """
@@ -99,12 +100,15 @@ def _make_json_serializable(data: Any) -> Any:
         return [_make_json_serializable(item) for item in data]
     elif isinstance(data, tuple):
         return [_make_json_serializable(item) for item in data]
+    elif isinstance(data, LazyText):
+        # Deferred text is saved formatted
+        return _make_json_serializable(data.text)
+    elif hasattr(data, 'to_dict'):
+        # Use to_dict method if available (it includes formatted properties that __dict__ lacks)
+        return _make_json_serializable(data.to_dict())
     elif hasattr(data, '__dict__'):
         # Convert objects with __dict__ to dictionaries
         return _make_json_serializable(data.__dict__)
-    elif hasattr(data, 'to_dict'):
-        # Use to_dict method if available
-        return _make_json_serializable(data.to_dict())
     else:
         # For basic types (str, int, float, bool, None)
         return data
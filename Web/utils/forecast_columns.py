@@ -0,0 +1,144 @@
+# utils/forecast_columns.py
+"""
+Columnar representation of a Yr.no forecast
+One NumPy array per variable, so any time window can be aggregated without
+walking the nested JSON timeseries again
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+NORWAY_TZ = ZoneInfo("Europe/Oslo")
+
+class ForecastColumns:
+    """
+    Forecast time series for one location
+
+    Arrays are aligned by index. precipitation is the amount falling in the
+    period starting at that time, and period_hours is the length of that period
+    (1 hour for the first ~2.5 days, 6 hours after that).
+    """
+
+    def __init__(self, times, temperature, wind_speed, cloud_cover, humidity,
+                 precipitation, period_hours):
+        self.times = times                  # Epoch seconds (int64)
+        self.temperature = temperature      # Celsius
+        self.wind_speed = wind_speed        # m/s
+        self.cloud_cover = cloud_cover      # Percent
+        self.humidity = humidity            # Percent
+        self.precipitation = precipitation  # mm per period
+        self.period_hours = period_hours
+
+    @classmethod
+    def from_yr(cls, weather_data: Dict, temp_offset: float = 0) -> 'ForecastColumns':
+        """
+        Build the columns from a Yr.no locationforecast response in a single pass
+
+        Args:
+            weather_data: Raw weather data from the API
+            temp_offset: Correction added to every temperature (e.g. for elevation)
+        """
+        timeseries = weather_data['properties']['timeseries']
+        n = len(timeseries)
+        if n == 0:
+            raise ValueError("Forecast has no time steps")
+
+        times = np.empty(n, dtype=np.int64)
+        temperature = np.full(n, np.nan)
+        wind_speed = np.full(n, np.nan)
+        cloud_cover = np.full(n, np.nan)
+        humidity = np.full(n, np.nan)
+        precipitation = np.zeros(n)
+        period_hours = np.zeros(n)
+
+        for i, step in enumerate(timeseries):
+            times[i] = datetime.fromisoformat(step['time'].replace('Z', '+00:00')).timestamp()
+            data = step['data']
+            details = data['instant']['details']
+            temperature[i] = details.get('air_temperature', np.nan)
+            wind_speed[i] = details.get('wind_speed', np.nan)
+            cloud_cover[i] = details.get('cloud_area_fraction', np.nan)
+            humidity[i] = details.get('relative_humidity', np.nan)
+
+            for period_key, hours in (('next_1_hours', 1), ('next_6_hours', 6)):
+                if period_key in data:
+                    precipitation[i] = data[period_key].get('details', {}).get('precipitation_amount', 0)
+                    period_hours[i] = hours
+                    break
+
+        return cls(times, temperature + temp_offset, wind_speed, cloud_cover, humidity,
+                   precipitation, period_hours)
+
+    def __len__(self):
+        return len(self.times)
+
+    def window_mask(self, start: datetime, end: datetime) -> np.ndarray:
+        """Boolean mask of time steps with start <= time < end"""
+        return (self.times >= start.timestamp()) & (self.times < end.timestamp())
+
+    def aggregate(self, start: datetime, end: datetime) -> Optional[Dict]:
+        """
+        Aggregate all variables over a time window
+
+        Returns:
+            dict of window statistics, or None if the forecast doesn't cover the window
+        """
+        mask = self.window_mask(start, end)
+        if not mask.any():
+            return None
+
+        precipitation = self.precipitation[mask]
+        period_hours = self.period_hours[mask]
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'avg_temp': _nan_stat(np.nanmean, self.temperature[mask]),
+            'max_temp': _nan_stat(np.nanmax, self.temperature[mask]),
+            'min_temp': _nan_stat(np.nanmin, self.temperature[mask]),
+            'avg_wind_speed': _nan_stat(np.nanmean, self.wind_speed[mask]),
+            'max_wind_speed': _nan_stat(np.nanmax, self.wind_speed[mask]),
+            'avg_cloud_cover': _nan_stat(np.nanmean, self.cloud_cover[mask]),
+            'total_precipitation': float(precipitation.sum()),
+            'precipitation_hours': int(period_hours[precipitation > 0].sum()),
+            'time_steps': int(mask.sum())
+        }
+
+    def named_windows(self, now: Optional[datetime] = None) -> Dict[str, Tuple[datetime, datetime]]:
+        """
+        Standard planning windows in Norwegian local time
+
+        Returns:
+            dict mapping 'today', 'tomorrow', 'weekend' and 'next_72h' to (start, end)
+        """
+        now = now.astimezone(NORWAY_TZ) if now else datetime.now(NORWAY_TZ)
+        now = now.replace(minute=0, second=0, microsecond=0)  # Include the current hour's step
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow = midnight + timedelta(days=1)
+
+        # Upcoming weekend, or the rest of the current one
+        saturday = midnight + timedelta(days=(5 - midnight.weekday()) % 7)
+        if midnight.weekday() == 6:
+            saturday = midnight - timedelta(days=1)
+        weekend_end = saturday + timedelta(days=2)
+
+        return {
+            'today': (now, tomorrow),
+            'tomorrow': (tomorrow, tomorrow + timedelta(days=1)),
+            'weekend': (max(now, saturday), weekend_end),
+            'next_72h': (now, now + timedelta(hours=72))
+        }
+
+    def summarize_windows(self, now: Optional[datetime] = None) -> Dict[str, Optional[Dict]]:
+        """Aggregate every named window (None for windows beyond the forecast)"""
+        return {name: self.aggregate(start, end)
+                for name, (start, end) in self.named_windows(now).items()}
+
+
+def _nan_stat(func, values):
+    """Apply a nan-aware reduction, returning None when every value is missing"""
+    if values.size == 0 or np.isnan(values).all():
+        return None
+    return float(func(values))
@@ -0,0 +1,218 @@
+# utils/geocoding_cache.py
+"""
+Geocoding cache: an in-memory LRU in front of a persisted SQLite table
+Caches "not found" answers for a shorter time than found places, counts
+hits per query and preloads the most frequent queries on startup
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import config
+
+HIT_FLUSH_INTERVAL = 25  # Buffered hits written to the table at a time
+
+def normalize_query(text: str) -> str:
+    """Cache key form of a query: lowercase with collapsed whitespace"""
+    return ' '.join(text.lower().split())
+
+
+class GeocodingCache:
+    def __init__(self, db_path=None, max_entries=None, enabled=None):
+        """
+        Args:
+            db_path: SQLite file (defaults to cache/geocoding.sqlite)
+            max_entries: Size of the in-memory LRU (defaults to config.GEOCODING_CACHE_SIZE)
+            enabled: Turn caching on/off (defaults to config.ENABLE_CACHING)
+        """
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, 'geocoding.sqlite')
+        self.max_entries = max_entries or config.GEOCODING_CACHE_SIZE
+        self.enabled = config.ENABLE_CACHING if enabled is None else enabled
+        self._memory = OrderedDict()  # key -> (value, expires_at), least recently used first
+        self._lock = threading.Lock()
+        self._pending_hits = Counter()
+        self._local = threading.local()
+        self._initialized = False
+
+    def _connect(self):
+        """One connection per thread, creating the table on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            if not self._initialized:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS geocodes ('
+                    'key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)'
+                )
+                self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached answer
+
+        Args:
+            key: Normalized cache key
+
+        Returns:
+            tuple: (found, value) - value is None for a cached "not found" answer
+        """
+        if not self.enabled:
+            return False, None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._memory[key]
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._load(key, now)
+            if entry is None:
+                return False, None
+            self._remember(key, entry)
+
+        self._count_hit(key)
+        return True, entry[0]
+
+    def set(self, key: str, value: Any):
+        """
+        Cache an answer; a falsy value (None or []) is cached as "not found"
+
+        Args:
+            key: Normalized cache key
+            value: Place dict or list of place dicts
+        """
+        if not self.enabled:
+            return
+
+        if value:
+            ttl_minutes = config.CACHE_TTL_MINUTES.get('geocoding', config.CACHE_DURATION_MINUTES)
+        else:
+            value = None
+            ttl_minutes = config.GEOCODING_NEGATIVE_TTL_MINUTES
+        entry = (value, time.time() + ttl_minutes * 60)
+        self._remember(key, entry)
+
+        try:
+            self._connect().execute(
+                'INSERT INTO geocodes (key, value, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at',
+                (key, json.dumps(value), entry[1])
+            )
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Could not persist geocoding cache entry ({e})")
+
+    def warm(self, limit: Optional[int] = None) -> int:
+        """
+        Preload the most frequently requested, still valid answers into memory
+
+        Returns:
+            int: Number of entries loaded
+        """
+        if not self.enabled:
+            return 0
+        limit = limit or config.GEOCODING_WARM_ENTRIES
+        try:
+            rows = self._connect().execute(
+                'SELECT key, value, expires_at FROM geocodes WHERE expires_at > ? ORDER BY hits DESC LIMIT ?',
+                (time.time(), min(limit, self.max_entries))
+            ).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Geocoding cache unavailable ({e})")
+            return 0
+
+        # Least frequent first, so the most frequent end up most recently used
+        for key, value, expires_at in reversed(rows):
+            self._remember(key, (json.loads(value), expires_at))
+        return len(rows)
+
+    def frequent_keys(self, limit: int, expiring_within_minutes: float) -> List[str]:
+        """
+        Most requested keys whose answer has expired or expires soon
+
+        Args:
+            limit: Maximum number of keys
+            expiring_within_minutes: Include entries expiring within this many minutes
+
+        Returns:
+            list: Keys, most requested first
+        """
+        self.flush_hits()
+        try:
+            rows = self._connect().execute(
+                'SELECT key FROM geocodes WHERE expires_at < ? AND hits > 0 ORDER BY hits DESC LIMIT ?',
+                (time.time() + expiring_within_minutes * 60, limit)
+            ).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Geocoding cache unavailable ({e})")
+            return []
+        return [key for (key,) in rows]
+
+    def flush_hits(self):
+        """Write buffered hit counts to the table"""
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, Counter()
+        if not pending:
+            return
+        try:
+            self._connect().executemany('UPDATE geocodes SET hits = hits + ? WHERE key = ?',
+                                        [(hits, key) for key, hits in pending.items()])
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Could not save geocoding cache hits ({e})")
+
+    def _load(self, key: str, now: float):
+        try:
+            row = self._connect().execute(
+                'SELECT value, expires_at FROM geocodes WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Geocoding cache unavailable ({e})")
+            return None
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _remember(self, key: str, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _count_hit(self, key: str):
+        with self._lock:
+            self._pending_hits[key] += 1
+            flush = sum(self._pending_hits.values()) >= HIT_FLUSH_INTERVAL
+        if flush:
+            self.flush_hits()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_geocoding_cache():
+    """
+    Get the process-wide geocoding cache, warmed from the most frequent queries
+
+    Returns:
+        GeocodingCache: Shared cache instance
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = GeocodingCache()
+            _shared_cache.warm()
+            atexit.register(_shared_cache.flush_hits)
+    return _shared_cache
@@ -0,0 +1,95 @@
+# utils/geohash.py
+"""
+Geohash encoding and radius cover for spatial lookups in plain SQL tables
+"""
+
+import math
+from typing import List, Set
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+def encode(lat: float, lon: float, precision: int = 5) -> str:
+    """
+    Encode a location as a geohash
+
+    Args:
+        lat (float): Latitude
+        lon (float): Longitude
+        precision (int): Number of characters (5 = cells of about 4.9 x 4.9 km at the equator)
+
+    Returns:
+        str: Geohash
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Bits alternate between longitude and latitude, longitude first
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+def cell_size_degrees(precision: int):
+    """
+    Size of a geohash cell
+
+    Returns:
+        tuple: (latitude degrees, longitude degrees)
+    """
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+def cover_radius(lat: float, lon: float, radius_km: float, precision: int = 5) -> List[str]:
+    """
+    Geohash cells that together cover a circle (via its bounding box)
+
+    Args:
+        lat (float): Centre latitude
+        lon (float): Centre longitude
+        radius_km (float): Radius in kilometers
+        precision (int): Geohash precision of the returned cells
+
+    Returns:
+        list: Geohashes whose cells intersect the circle's bounding box
+    """
+    dlat = radius_km / 111.32
+    dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 0.01))
+    cell_lat, cell_lon = cell_size_degrees(precision)
+
+    # Sample at half-cell steps so no cell inside the box is skipped
+    cells: Set[str] = set()
+    lat_steps = int(math.ceil(2 * dlat / (cell_lat / 2))) + 1
+    lon_steps = int(math.ceil(2 * dlon / (cell_lon / 2))) + 1
+    for i in range(lat_steps + 1):
+        sample_lat = min(lat - dlat + i * cell_lat / 2, lat + dlat)
+        for j in range(lon_steps + 1):
+            sample_lon = min(lon - dlon + j * cell_lon / 2, lon + dlon)
+            cells.add(encode(sample_lat, sample_lon, precision))
+    return sorted(cells)
@@ -0,0 +1,85 @@
+# utils/lazy_text.py
+"""
+Deferred formatting of human-readable text
+Scoring attaches a LazyText to every candidate, but the text is only built
+for results that are actually rendered, and handles with equal (hashable)
+inputs share one formatted copy
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+SHARED_TEXT_ENTRIES = 4096  # Formatted texts kept for reuse between handles
+
+_shared_texts = OrderedDict()
+_shared_texts_lock = threading.Lock()
+
+def format_once(build: Callable[..., Any], *args) -> Any:
+    """
+    build(*args), reusing an earlier result for the same function and inputs
+
+    Args:
+        build: Formatting function that depends only on its arguments
+        args: Its inputs; unhashable inputs (e.g. dicts) are formatted without sharing
+
+    Returns:
+        The formatted text (treat as read-only when shared)
+    """
+    try:
+        key = (build, args)
+        hash(key)
+    except TypeError:
+        return build(*args)
+
+    with _shared_texts_lock:
+        if key in _shared_texts:
+            _shared_texts.move_to_end(key)
+            return _shared_texts[key]
+    text = build(*args)
+    with _shared_texts_lock:
+        _shared_texts[key] = text
+        while len(_shared_texts) > SHARED_TEXT_ENTRIES:
+            _shared_texts.popitem(last=False)
+    return text
+
+
+class LazyText:
+    __slots__ = ('_pending', '_text')
+
+    def __init__(self, build: Callable[..., Any], *args):
+        """
+        Args:
+            build: Formatting function, called on first use with args
+            args: Its inputs
+        """
+        self._pending = (build, args)  # None once formatted
+        self._text = None
+
+    @classmethod
+    def of(cls, text: Any) -> 'LazyText':
+        """Handle for text that is already formatted"""
+        handle = cls(None)
+        handle._text = text
+        handle._pending = None
+        return handle
+
+    @property
+    def text(self) -> Any:
+        """The formatted text, built on first access"""
+        # Read the pending inputs once: another thread may finish formatting meanwhile,
+        # and it publishes the text before releasing the inputs
+        pending = self._pending
+        if pending is None:
+            return self._text
+        build, args = pending
+        text = format_once(build, *args)
+        self._text = text
+        self._pending = None  # Release the inputs
+        return text
+
+    def __str__(self):
+        return str(self.text)
+
+    def __repr__(self):
+        return f"LazyText({'pending' if self._pending is not None else repr(self._text)})"
@@ -0,0 +1,242 @@
+# utils/place_index.py
+"""
+Local autocomplete index of Norwegian place names
+A prefix trie over diacritic-folded names answers each keystroke in memory,
+with a bounded edit-distance search as a fallback for typos, so location
+suggestions never call the Kartverket API
+"""
+
+import json
+import os
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+# Letters that don't decompose into a base letter plus accent
+FOLDED_LETTERS = str.maketrans({'ø': 'o', 'æ': 'ae', 'å': 'a', 'ð': 'd', 'þ': 'th', 'ß': 'ss'})
+
+SUGGESTIONS_PER_NODE = 20  # Best-ranked places kept at every trie node
+
+def fold_name(text: str) -> str:
+    """
+    Normalize a place name for matching: lowercase, ø/æ/å folded and accents removed
+
+    Args:
+        text (str): Place name or query, e.g. "Åndalsnes" or "Jiehkkevárri"
+
+    Returns:
+        str: Folded text, e.g. "andalsnes" or "jiehkkevarri"
+    """
+    text = text.strip().lower().translate(FOLDED_LETTERS)
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class _TrieNode:
+    __slots__ = ('children', 'place_ids')
+
+    def __init__(self):
+        self.children = {}
+        self.place_ids = []
+
+
+class PlaceAutocompleteIndex:
+    def __init__(self, places: List[Dict]):
+        """
+        Args:
+            places: Dicts with 'name', 'type', 'municipality', 'county', 'lat' and 'lon'
+        """
+        type_ranking = {place_type: rank for rank, place_type in enumerate(config.PLACE_TYPE_RANKING)}
+        self.places = places
+        self.root = _TrieNode()
+
+        # Lower sort key = better suggestion: preferred place types first, then shorter names
+        self._sort_keys = [
+            (type_ranking.get(place.get('type', ''), len(type_ranking)), len(place['name']), place['name'])
+            for place in places
+        ]
+
+        for place_id, place in enumerate(places):
+            for key in self._index_keys(place['name']):
+                self._insert(key, place_id)
+        self._finalize(self.root)
+
+    @classmethod
+    def from_json_file(cls, filepath: str) -> 'PlaceAutocompleteIndex':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['places'])
+
+    @staticmethod
+    def _index_keys(name: str) -> List[str]:
+        """The full folded name plus every suffix starting at a later word ("Store Skagastølstind" -> also "skagastolstind")"""
+        words = fold_name(name).replace('-', ' ').split()
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def _insert(self, key: str, place_id: int):
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            node.place_ids.append(place_id)
+
+    def _finalize(self, node: _TrieNode):
+        """Rank and truncate the places under every node once, so lookups only read lists"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            unique_ids = set(current.place_ids)
+            current.place_ids = sorted(unique_ids, key=self._sort_keys.__getitem__)[:SUGGESTIONS_PER_NODE]
+            stack.extend(current.children.values())
+
+    def suggest(self, query: str, max_results: int = 5) -> List[Dict]:
+        """
+        Suggest places whose name (or a later word in it) starts with the query
+
+        Args:
+            query (str): What the user has typed so far
+            max_results (int): Maximum number of suggestions
+
+        Returns:
+            list: Location dicts in the KartverketClient format, best match first
+        """
+        folded = ' '.join(fold_name(query).replace('-', ' ').split())
+        if not folded:
+            return []
+
+        place_ids = self._prefix_matches(folded)
+        if not place_ids:
+            # Only pay for the typo-tolerant walk when the exact prefix finds nothing
+            place_ids = self._fuzzy_matches(folded, self._max_typos(folded))
+
+        return [self._to_location(self.places[place_id], query) for place_id in place_ids[:max_results]]
+
+    def _prefix_matches(self, folded: str) -> List[int]:
+        node = self.root
+        for char in folded:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.place_ids
+
+    @staticmethod
+    def _max_typos(folded: str) -> int:
+        if len(folded) < 3:
+            return 0
+        return 1 if len(folded) <= 5 else 2
+
+    def _fuzzy_matches(self, folded: str, max_typos: int) -> List[int]:
+        """
+        Places with a prefix within max_typos edits of the query, closest first
+
+        Walks the trie with one Levenshtein row per node and prunes branches
+        where every cell already exceeds max_typos
+        """
+        if max_typos == 0:
+            return []
+
+        matches: List[Tuple[int, Tuple, int]] = []
+        first_row = list(range(len(folded) + 1))
+        stack = [(child, char, first_row) for char, child in self.root.children.items()]
+
+        while stack:
+            node, char, previous_row = stack.pop()
+            row = [previous_row[0] + 1]
+            for column in range(1, len(folded) + 1):
+                substitution = previous_row[column - 1] + (folded[column - 1] != char)
+                row.append(min(row[column - 1] + 1, previous_row[column] + 1, substitution))
+
+            if row[-1] <= max_typos:
+                # Everything below this node completes a matching prefix
+                for place_id in node.place_ids:
+                    matches.append((row[-1], self._sort_keys[place_id], place_id))
+            elif min(row) <= max_typos:
+                stack.extend((child, child_char, row) for child_char, child in node.children.items())
+
+        matches.sort()
+        # A place can match under several indexed words; keep its closest match
+        return list(dict.fromkeys(place_id for _, _, place_id in matches))
+
+    @staticmethod
+    def _to_location(place: Dict, query: str) -> Dict:
+        return {
+            'name': place['name'],
+            'lat': place['lat'],
+            'lon': place['lon'],
+            'municipality': place.get('municipality', ''),
+            'county': place.get('county', ''),
+            'place_type': place.get('type', ''),
+            'original_search': query
+        }
+
+
+def build_place_names_file(source: str, output: Optional[str] = None) -> int:
+    """
+    Convert a Kartverket stedsnavn dump into the autocomplete place list
+
+    Args:
+        source: JSON file of stedsnavn API results (a list of 'navn' entries, or
+                pages with a 'navn' list)
+        output: Target file (defaults to config.PLACE_NAMES_FILE)
+
+    Returns:
+        int: Number of places written
+    """
+    output = output or config.PLACE_NAMES_FILE
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        data = [data]
+    entries = []
+    for item in data:
+        entries.extend(item['navn'] if isinstance(item, dict) and 'navn' in item else [item])
+
+    allowed_types = set(config.PLACE_TYPE_RANKING)
+    places = {}
+    for entry in entries:
+        point = entry.get('representasjonspunkt') or {}
+        place_type = entry.get('navneobjekttype', '')
+        if place_type not in allowed_types or 'nord' not in point or 'øst' not in point:
+            continue
+        municipalities = entry.get('kommuner') or [{}]
+        counties = entry.get('fylker') or [{}]
+        place = {
+            'name': entry['skrivemåte'],
+            'type': place_type,
+            'municipality': municipalities[0].get('kommunenavn', entry.get('kommunenavn', '')),
+            'county': counties[0].get('fylkesnavn', entry.get('fylkesnavn', '')),
+            'lat': round(point['nord'], 5),
+            'lon': round(point['øst'], 5)
+        }
+        places[(place['name'], place['type'], place['municipality'])] = place  # Drop duplicate spellings
+
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': source, 'places': list(places.values())}, f, ensure_ascii=False)
+    os.replace(tmp_path, output)
+
+    print(f"✅ Wrote {len(places)} place names to {output}")
+    return len(places)
+
+
+_place_index = None
+_place_index_lock = threading.Lock()
+
+def get_place_index() -> Optional[PlaceAutocompleteIndex]:
+    """
+    Get the process-wide place name index
+
+    Returns:
+        PlaceAutocompleteIndex, or None if the place names file can't be loaded
+    """
+    global _place_index
+    with _place_index_lock:
+        if _place_index is None:
+            try:
+                _place_index = PlaceAutocompleteIndex.from_json_file(config.PLACE_NAMES_FILE)
+                print(f"📁 Loaded {len(_place_index.places)} place names for autocomplete")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"❌ Error loading place names from {config.PLACE_NAMES_FILE}: {e}")
+                return None
+    return _place_index
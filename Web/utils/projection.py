@@ -0,0 +1,61 @@
+# utils/projection.py
+"""
+Map projection helpers
+Norwegian national grids (seNorge, Kartverket) use UTM zone 33N on ETRS89 (EPSG:25833)
+"""
+
+import numpy as np
+
+# GRS80 ellipsoid (ETRS89)
+GRS80_A = 6378137.0
+GRS80_F = 1 / 298.257222101
+
+UTM_SCALE = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM33_CENTRAL_MERIDIAN = 15.0
+
+def latlon_to_utm33(lat, lon):
+    """
+    Convert latitude/longitude to UTM zone 33N easting/northing
+    Accurate to well under a metre across mainland Norway; works on scalars and arrays
+
+    Args:
+        lat: Latitude(s) in degrees
+        lon: Longitude(s) in degrees
+
+    Returns:
+        tuple: (easting, northing) in meters
+    """
+    phi = np.radians(np.asarray(lat, dtype=float))
+    dlam = np.radians(np.asarray(lon, dtype=float) - UTM33_CENTRAL_MERIDIAN)
+
+    e2 = GRS80_F * (2 - GRS80_F)
+    e4, e6 = e2 * e2, e2 * e2 * e2
+    ep2 = e2 / (1 - e2)
+
+    sin_phi, cos_phi, tan_phi = np.sin(phi), np.cos(phi), np.tan(phi)
+    n = GRS80_A / np.sqrt(1 - e2 * sin_phi ** 2)
+    t = tan_phi ** 2
+    c = ep2 * cos_phi ** 2
+    a = dlam * cos_phi
+
+    # Meridional arc length
+    m = GRS80_A * (
+        (1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * phi
+        - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * phi)
+        + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * phi)
+        - (35 * e6 / 3072) * np.sin(6 * phi)
+    )
+
+    easting = UTM_FALSE_EASTING + UTM_SCALE * n * (
+        a
+        + (1 - t + c) * a ** 3 / 6
+        + (5 - 18 * t + t ** 2 + 72 * c - 58 * ep2) * a ** 5 / 120
+    )
+    northing = UTM_SCALE * (m + n * tan_phi * (
+        a ** 2 / 2
+        + (5 - t + 9 * c + 4 * c ** 2) * a ** 4 / 24
+        + (61 - 58 * t + t ** 2 + 600 * c - 330 * ep2) * a ** 6 / 720
+    ))
+
+    return easting, northing
@@ -0,0 +1,137 @@
+# utils/region_index.py
+"""
+Spatial index of polygon regions (e.g. Varsom avalanche forecast regions)
+A coarse lat/lon grid prefilters candidate regions, then an exact
+point-in-polygon test picks the region containing the point
+"""
+
+import json
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import config
+from utils.distance_calculator import KM_PER_DEGREE_LAT
+
+class RegionIndex:
+    def __init__(self, features: List[Dict], cell_degrees: float = 0.5):
+        """
+        Args:
+            features: GeoJSON features with 'id' and 'name' properties and
+                      Polygon or MultiPolygon geometries
+            cell_degrees: Size of the prefilter grid cells
+        """
+        self.cell_degrees = cell_degrees
+        self.regions = []  # (properties, list of polygons as lists of rings)
+        self.grid = {}     # (row, col) -> region indices whose bounding box touches the cell
+
+        for feature in features:
+            geometry = feature['geometry']
+            if geometry['type'] == 'Polygon':
+                polygons = [geometry['coordinates']]
+            elif geometry['type'] == 'MultiPolygon':
+                polygons = geometry['coordinates']
+            else:
+                continue
+            self._add_region(feature['properties'], polygons)
+
+    @classmethod
+    def from_geojson_file(cls, filepath: str) -> 'RegionIndex':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['features'])
+
+    def _add_region(self, properties: Dict, polygons: List):
+        index = len(self.regions)
+        self.regions.append((properties, polygons))
+
+        lons = [point[0] for polygon in polygons for point in polygon[0]]
+        lats = [point[1] for polygon in polygons for point in polygon[0]]
+        min_row, min_col = self._cell(min(lats), min(lons))
+        max_row, max_col = self._cell(max(lats), max(lons))
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                self.grid.setdefault((row, col), []).append(index)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def lookup(self, lat: float, lon: float, fallback_km: float = 0) -> Optional[Dict]:
+        """
+        Find the region containing a point
+
+        Args:
+            fallback_km: If no region contains the point, use the nearest one within this distance
+
+        Returns:
+            The region's properties (e.g. {'id': 3028, 'name': 'Jotunheimen'}), or None
+        """
+        for index in self.grid.get(self._cell(lat, lon), ()):
+            properties, polygons = self.regions[index]
+            for polygon in polygons:
+                if _point_in_polygon(lon, lat, polygon):
+                    return properties
+        return self.nearest(lat, lon, fallback_km) if fallback_km > 0 else None
+
+    def nearest(self, lat: float, lon: float, max_distance_km: float) -> Optional[Dict]:
+        """
+        Find the region whose outline is closest to a point
+
+        Returns:
+            The region's properties, or None if no outline is within max_distance_km
+        """
+        nearest, nearest_km = None, max_distance_km
+        for properties, polygons in self.regions:
+            for polygon in polygons:
+                distance_km = _distance_to_ring_km(lat, lon, polygon[0])
+                if distance_km <= nearest_km:
+                    nearest, nearest_km = properties, distance_km
+        return nearest
+
+
+def _point_in_polygon(x: float, y: float, polygon: List) -> bool:
+    """Even-odd ray casting test; polygon is an outer ring followed by any holes"""
+    inside = False
+    for ring in polygon:
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i][0], ring[i][1]
+            xj, yj = ring[j][0], ring[j][1]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+    return inside
+
+def _distance_to_ring_km(lat: float, lon: float, ring: List) -> float:
+    """Distance from a point to the closest edge of a ring (flat projection around the point)"""
+    km_per_degree_lon = KM_PER_DEGREE_LAT * math.cos(math.radians(lat))
+    points = [((x - lon) * km_per_degree_lon, (y - lat) * KM_PER_DEGREE_LAT) for x, y in (p[:2] for p in ring)]
+    nearest = math.inf
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy
+        # Closest point on the edge to the origin (the query point)
+        t = 0.0 if length2 == 0 else max(0.0, min(1.0, -(x1 * dx + y1 * dy) / length2))
+        nearest = min(nearest, math.hypot(x1 + t * dx, y1 + t * dy))
+    return nearest
+
+
+_avalanche_region_index = None
+_avalanche_region_index_lock = threading.Lock()
+
+def get_avalanche_region_index() -> Optional[RegionIndex]:
+    """
+    Get the process-wide index of avalanche forecast regions
+
+    Returns:
+        RegionIndex, or None if the regions file can't be loaded
+    """
+    global _avalanche_region_index
+    with _avalanche_region_index_lock:
+        if _avalanche_region_index is None:
+            try:
+                _avalanche_region_index = RegionIndex.from_geojson_file(config.AVALANCHE_REGIONS_FILE)
+                print(f"📁 Loaded {len(_avalanche_region_index.regions)} avalanche regions")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"❌ Error loading avalanche regions from {config.AVALANCHE_REGIONS_FILE}: {e}")
+                return None
+    return _avalanche_region_index
@@ -0,0 +1,173 @@
+# utils/spatial_index.py
+"""
+KD-tree over points on the unit sphere for nearest and radius queries
+Points are stored as 3D unit vectors, where straight-line (chord) distance
+grows with great-circle distance, so an ordinary KD-tree gives exact answers
+"""
+
+import heapq
+import math
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.distance_calculator import EARTH_RADIUS_KM
+
+def to_unit_vectors(lats, lons) -> np.ndarray:
+    """Latitudes and longitudes in degrees as an (n, 3) array of unit vectors"""
+    lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+def _km_to_chord(distance_km: float) -> float:
+    return 2 * math.sin(min(distance_km / (2 * EARTH_RADIUS_KM), math.pi / 2))
+
+
+class SpatialIndex:
+    def __init__(self, lats: Sequence[float], lons: Sequence[float],
+                 groups: Optional[Sequence[Hashable]] = None, leaf_size: int = 16):
+        """
+        Args:
+            lats, lons: Point coordinates in degrees; query results refer to points by position
+            groups: Optional label per point (e.g. region name) for nearest_by_group
+            leaf_size: Points per leaf, checked together with one vectorized calculation
+        """
+        self.points = to_unit_vectors(lats, lons).reshape(-1, 3)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+
+        # Node arrays: bounding box, point range in self.order, children (-1 for leaves)
+        self._lower, self._upper = [], []
+        self._start, self._end = [], []
+        self._left, self._right = [], []
+        if len(self.points):
+            self._build(0, len(self.points))
+        self._lower = np.array(self._lower)
+        self._upper = np.array(self._upper)
+
+        self._groups = {}
+        if groups is not None:
+            members = {}
+            for i, group in enumerate(groups):
+                members.setdefault(group, []).append(i)
+            lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+            for group, indices in members.items():
+                indices = np.array(indices)
+                self._groups[group] = (SpatialIndex(lats[indices], lons[indices], leaf_size=leaf_size), indices)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self._start)
+        block = self.points[self.order[start:end]]
+        self._lower.append(block.min(axis=0))
+        self._upper.append(block.max(axis=0))
+        self._start.append(start)
+        self._end.append(end)
+        self._left.append(-1)
+        self._right.append(-1)
+
+        if end - start > self.leaf_size:
+            # Split at the median of the widest dimension
+            dim = int(np.argmax(self._upper[node] - self._lower[node]))
+            mid = (start + end) // 2
+            partition = np.argpartition(block[:, dim], mid - start)
+            self.order[start:end] = self.order[start:end][partition]
+            self._left[node] = self._build(start, mid)
+            self._right[node] = self._build(mid, end)
+        return node
+
+    def _box_distance2(self, node: int, query: np.ndarray) -> float:
+        """Squared chord distance from the query to the node's bounding box"""
+        gap = np.maximum(np.maximum(self._lower[node] - query, query - self._upper[node]), 0)
+        return float(gap @ gap)
+
+    def _leaf_distances2(self, node: int, query: np.ndarray):
+        indices = self.order[self._start[node]:self._end[node]]
+        diff = self.points[indices] - query
+        return indices, np.einsum('ij,ij->i', diff, diff)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        The k points closest to a location
+
+        Returns:
+            list: (point index, distance in km), nearest first
+        """
+        if not len(self.points) or k < 1:
+            return []
+        query = to_unit_vectors([lat], [lon])[0]
+
+        best = []  # Max-heap of (-distance2, index) holding the k closest so far
+        frontier = [(0.0, 0)]
+        while frontier:
+            box_distance2, node = heapq.heappop(frontier)
+            if len(best) == k and box_distance2 > -best[0][0]:
+                break  # Every remaining node is farther than the current k-th point
+            if self._left[node] < 0:
+                indices, distances2 = self._leaf_distances2(node, query)
+                for index, distance2 in zip(indices.tolist(), distances2.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance2, index))
+                    elif distance2 < -best[0][0]:
+                        heapq.heapreplace(best, (-distance2, index))
+            else:
+                for child in (self._left[node], self._right[node]):
+                    heapq.heappush(frontier, (self._box_distance2(child, query), child))
+
+        best.sort(reverse=True)
+        chords = np.sqrt([-distance2 for distance2, _ in best])
+        return list(zip([index for _, index in best], _chord_to_km(chords).tolist()))
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, float]]:
+        """
+        All points within a great-circle radius of a location
+
+        Returns:
+            list: (point index, distance in km), nearest first
+        """
+        if not len(self.points):
+            return []
+        query = to_unit_vectors([lat], [lon])[0]
+        radius2 = _km_to_chord(radius_km) ** 2
+
+        found_indices, found_distances2 = [], []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance2(node, query) > radius2:
+                continue
+            if self._left[node] < 0:
+                indices, distances2 = self._leaf_distances2(node, query)
+                inside = distances2 <= radius2
+                found_indices.append(indices[inside])
+                found_distances2.append(distances2[inside])
+            else:
+                stack.extend((self._left[node], self._right[node]))
+
+        if not found_indices:
+            return []
+        indices = np.concatenate(found_indices)
+        distances = _chord_to_km(np.sqrt(np.concatenate(found_distances2)))
+        by_distance = np.argsort(distances, kind='stable')
+        return list(zip(indices[by_distance].tolist(), distances[by_distance].tolist()))
+
+    def nearest_by_group(self, lat: float, lon: float) -> Dict[Hashable, Tuple[int, float]]:
+        """
+        The closest point of every group (e.g. each region's nearest tour)
+
+        Returns:
+            dict: group -> (point index, distance in km)
+        """
+        nearest = {}
+        for group, (subset, indices) in self._groups.items():
+            closest = subset.nearest(lat, lon, 1)
+            if closest:
+                index, distance = closest[0]
+                nearest[group] = (int(indices[index]), distance)
+        return nearest
@@ -0,0 +1,270 @@
+# utils/travel_time.py
+"""
+Precomputed road travel times from origin grid cells to tour trailheads
+An offline build (python worker.py build-travel-times) runs shortest paths
+over a road network extract, including ferries; at request time driving
+time is a table lookup, with a straight-line estimate for anything the
+table doesn't cover
+"""
+
+import heapq
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+from utils.distance_calculator import (KM_PER_DEGREE_LAT, CoordinateArray, calculate_distances,
+                                       calculate_driving_time)
+from utils.spatial_index import SpatialIndex
+
+ACCESS_NODES = 3         # Nearest road nodes tried when joining a point to the network
+ACCESS_DETOUR = 1.3      # Local roads are longer than the straight line
+ACCESS_SPEED_KMH = 50    # Average speed on roads off the extract
+CELL_CHUNK = 2000        # Origin cells processed per distance matrix
+
+def origin_cell(lat: float, lon: float, cell_km: float) -> Tuple[int, int]:
+    """
+    Grid cell (row, col) of a starting location; cells are about cell_km square
+
+    Returns:
+        tuple: (row, col)
+    """
+    lat_step = cell_km / KM_PER_DEGREE_LAT
+    row = math.floor(lat / lat_step)
+    return row, math.floor(lon / _lon_step(row, cell_km))
+
+def _lon_step(row: int, cell_km: float) -> float:
+    # Longitude degrees shrink towards the pole, so widen the step per row to keep cells square
+    lat_step = cell_km / KM_PER_DEGREE_LAT
+    return cell_km / (KM_PER_DEGREE_LAT * math.cos(math.radians((row + 0.5) * lat_step)))
+
+def get_matrix_path() -> str:
+    return os.path.join(config.CACHE_DIR, 'travel_times.npz')
+
+def trailhead_key(lat: float, lon: float) -> str:
+    return f"{lat:.4f},{lon:.4f}"
+
+
+class RoadNetwork:
+    def __init__(self, nodes: Dict[str, Sequence[float]], edges: List[Dict]):
+        """
+        Args:
+            nodes: Node name -> [lat, lon]
+            edges: Dicts with 'from', 'to' and 'minutes' (ferries include crossing and waiting time)
+        """
+        self.names = list(nodes)
+        index = {name: i for i, name in enumerate(self.names)}
+        self.coordinates = CoordinateArray([nodes[name][0] for name in self.names],
+                                           [nodes[name][1] for name in self.names])
+        self.node_index = SpatialIndex([nodes[name][0] for name in self.names],
+                                       [nodes[name][1] for name in self.names])
+        self.adjacency = [[] for _ in self.names]
+        for edge in edges:
+            a, b = index[edge['from']], index[edge['to']]
+            self.adjacency[a].append((b, float(edge['minutes'])))
+            self.adjacency[b].append((a, float(edge['minutes'])))
+
+    @classmethod
+    def from_json_file(cls, filepath: str) -> 'RoadNetwork':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['nodes'], data['edges'])
+
+    def access(self, lat: float, lon: float) -> List[Tuple[int, float]]:
+        """Nearest nodes with the minutes needed to reach them off the network"""
+        return [(i, _access_minutes(distance)) for i, distance in self.node_index.nearest(lat, lon, ACCESS_NODES)]
+
+    def shortest_minutes(self, sources: List[Tuple[int, float]]) -> np.ndarray:
+        """
+        Dijkstra from one or more start nodes (each with a start cost in minutes)
+
+        Returns:
+            np.ndarray: Minutes to every node (inf where unreachable)
+        """
+        minutes = np.full(len(self.names), np.inf)
+        heap = []
+        for node, cost in sources:
+            if cost < minutes[node]:
+                minutes[node] = cost
+                heapq.heappush(heap, (cost, node))
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > minutes[node]:
+                continue
+            for neighbour, edge_minutes in self.adjacency[node]:
+                new_cost = cost + edge_minutes
+                if new_cost < minutes[neighbour]:
+                    minutes[neighbour] = new_cost
+                    heapq.heappush(heap, (new_cost, neighbour))
+        return minutes
+
+def _access_minutes(distance_km):
+    return distance_km * ACCESS_DETOUR / ACCESS_SPEED_KMH * 60
+
+
+def collect_trailheads() -> List[Tuple[float, float]]:
+    """Unique trailhead coordinates of every tour and destination in the catalogs"""
+    trailheads = {}
+    with open(config.DESTINATIONS_FILE, 'r', encoding='utf-8') as f:
+        for destination in json.load(f):
+            trailheads[trailhead_key(destination['lat'], destination['lon'])] = (destination['lat'], destination['lon'])
+    with open(config.SKI_TOURS_FILE, 'r', encoding='utf-8') as f:
+        for region in json.load(f)['regions'].values():
+            for tour in region['ski_tours']:
+                trailheads[trailhead_key(tour['lat'], tour['lon'])] = (tour['lat'], tour['lon'])
+    return list(trailheads.values())
+
+def build_travel_time_matrix(network_file: Optional[str] = None, output: Optional[str] = None,
+                             cell_km: Optional[float] = None) -> Optional[str]:
+    """
+    Compute driving minutes from every origin cell near the road network to every trailhead
+
+    Args:
+        network_file: Road network JSON (defaults to config.ROAD_NETWORK_FILE)
+        output: Target .npz file (defaults to cache/travel_times.npz)
+        cell_km: Origin cell size (defaults to config.TRAVEL_TIME_CELL_KM)
+
+    Returns:
+        str: Path of the stored matrix, or None if the build failed
+    """
+    network_file = network_file or config.ROAD_NETWORK_FILE
+    output = output or get_matrix_path()
+    cell_km = cell_km or config.TRAVEL_TIME_CELL_KM
+
+    try:
+        network = RoadNetwork.from_json_file(network_file)
+        trailheads = collect_trailheads()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"🚫 Error loading road network or trailheads: {e}")
+        return None
+    print(f"🛣️  Routing {len(trailheads)} trailheads over {len(network.names)} road nodes...")
+
+    # Roads are two-way, so one search from each trailhead gives its time from every node
+    node_minutes = np.column_stack([
+        network.shortest_minutes(network.access(lat, lon)) for lat, lon in trailheads
+    ])  # nodes x trailheads
+
+    cells = _origin_cells_near(network, cell_km)
+    print(f"   {len(cells)} origin cells of {cell_km:g} km")
+
+    minutes = np.empty((len(cells), len(trailheads)), dtype=np.float32)
+    lat_step = cell_km / KM_PER_DEGREE_LAT
+    for start in range(0, len(cells), CELL_CHUNK):
+        chunk = cells[start:start + CELL_CHUNK]
+        centres = CoordinateArray([(row + 0.5) * lat_step for row, _ in chunk],
+                                  [(col + 0.5) * _lon_step(row, cell_km) for row, col in chunk])
+        distances = centres.distance_matrix(network.coordinates)  # cells x nodes
+        nearest = np.argsort(distances, axis=1)[:, :ACCESS_NODES]
+        access = _access_minutes(np.take_along_axis(distances, nearest, axis=1))
+        # Best over the nearest nodes of (drive to the node + node to trailhead)
+        totals = access[:, :, np.newaxis] + node_minutes[nearest]
+        minutes[start:start + len(chunk)] = totals.min(axis=1)
+
+    minutes[~np.isfinite(minutes)] = np.nan
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{output}.tmp{os.getpid()}.npz"
+    np.savez(temp_path,
+             cells=np.array(cells, dtype=np.int32).reshape(-1, 2),
+             trailheads=np.array(trailheads, dtype=np.float64).reshape(-1, 2),
+             minutes=minutes,
+             cell_km=np.float64(cell_km))
+    os.replace(temp_path, output)
+    print(f"✅ Stored travel times for {len(cells)} cells x {len(trailheads)} trailheads in {output}")
+    return output
+
+def _origin_cells_near(network: RoadNetwork, cell_km: float) -> List[Tuple[int, int]]:
+    """Cells whose centre is within TRAVEL_TIME_MAX_ACCESS_KM of a road node"""
+    radius_km = config.TRAVEL_TIME_MAX_ACCESS_KM
+    lat_step = cell_km / KM_PER_DEGREE_LAT
+    cells = set()
+    for lat, lon in zip(np.degrees(network.coordinates.lat_rad), np.degrees(network.coordinates.lon_rad)):
+        min_row, _ = origin_cell(lat - radius_km / KM_PER_DEGREE_LAT, lon, cell_km)
+        max_row, _ = origin_cell(lat + radius_km / KM_PER_DEGREE_LAT, lon, cell_km)
+        for row in range(min_row, max_row + 1):
+            lon_step = _lon_step(row, cell_km)
+            lon_radius = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(lat)))
+            cols = range(math.floor((lon - lon_radius) / lon_step), math.floor((lon + lon_radius) / lon_step) + 1)
+            centre_lat = (row + 0.5) * lat_step
+            distances = calculate_distances(lat, lon, [centre_lat] * len(cols),
+                                            [(col + 0.5) * lon_step for col in cols])
+            cells.update((row, col) for col, distance in zip(cols, distances) if distance <= radius_km)
+    return sorted(cells)
+
+
+class TravelTimeMatrix:
+    def __init__(self, path: str):
+        with np.load(path) as data:
+            self.cell_km = float(data['cell_km'])
+            self.minutes = data['minutes']
+            self.cell_rows = {(int(row), int(col)): i for i, (row, col) in enumerate(data['cells'])}
+            self.trailhead_columns = {trailhead_key(lat, lon): j for j, (lat, lon) in enumerate(data['trailheads'])}
+
+    def driving_hours(self, origin_lat: float, origin_lon: float,
+                      lats: Sequence[float], lons: Sequence[float]) -> Optional[np.ndarray]:
+        """
+        Road driving hours from a starting location to trailheads
+
+        Returns:
+            np.ndarray: Hours per trailhead (NaN for trailheads not in the table or
+                        not reachable by road), or None if the origin is outside the table
+        """
+        row = self.cell_rows.get(origin_cell(origin_lat, origin_lon, self.cell_km))
+        if row is None:
+            return None
+        columns = np.array([self.trailhead_columns.get(trailhead_key(lat, lon), -1) for lat, lon in zip(lats, lons)],
+                           dtype=np.int64)
+        hours = np.full(len(columns), np.nan)
+        known = columns >= 0
+        hours[known] = self.minutes[row, columns[known]] / 60
+        return hours
+
+
+def estimate_driving_hours(origin_lat: float, origin_lon: float,
+                           lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """
+    Driving hours to many points: the precomputed road table where it has an answer,
+    otherwise the straight-line estimate from the DRIVING_DISTANCES table
+
+    Returns:
+        np.ndarray: Hours per point
+    """
+    estimate = calculate_driving_time(calculate_distances(origin_lat, origin_lon, lats, lons))
+    matrix = get_travel_time_matrix()
+    if matrix is None or len(estimate) == 0:
+        return estimate
+    road_hours = matrix.driving_hours(origin_lat, origin_lon, lats, lons)
+    if road_hours is None:
+        return estimate
+    return np.where(np.isnan(road_hours), estimate, road_hours)
+
+
+_travel_time_matrix = None
+_travel_time_matrix_loaded = False
+_travel_time_matrix_lock = threading.Lock()
+
+def get_travel_time_matrix() -> Optional[TravelTimeMatrix]:
+    """
+    Get the process-wide travel time table
+
+    Returns:
+        TravelTimeMatrix, or None if it hasn't been built
+    """
+    global _travel_time_matrix, _travel_time_matrix_loaded
+    with _travel_time_matrix_lock:
+        if not _travel_time_matrix_loaded:
+            _travel_time_matrix_loaded = True
+            try:
+                _travel_time_matrix = TravelTimeMatrix(get_matrix_path())
+                print(f"📁 Loaded travel times for {len(_travel_time_matrix.cell_rows)} origin cells")
+            except FileNotFoundError:
+                print("⚠️  No travel time table (run: python worker.py build-travel-times) - using straight-line estimates")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"❌ Error loading travel times from {get_matrix_path()}: {e}")
+    return _travel_time_matrix
@@ -226,7 +226,7 @@ class LocationFormHandler:
             if not query or len(query) < 2:
                 return []
             
-            locations = self.location_service.search_multiple_locations(query, max_results)
+            locations = self.location_service.suggest_locations(query, max_results)
             
             suggestions = []
             for location in locations:
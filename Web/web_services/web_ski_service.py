@@ -98,6 +98,7 @@ class WebSkiService:
                     'features': tour.features,
                     'technical_grade': tour.technical_grade,
                     'distance_km': getattr(tour, 'distance_from_start', 0),
+                    'driving_hours': getattr(tour, 'driving_hours', None),
                     'scores': {
                         'total': round(score_result.total_score, 1),
                         'snow': round(score_result.snow_score, 0),
@@ -189,7 +190,7 @@ class WebSkiService:
         Get location suggestions for autocomplete
         """
         try:
-            locations = self.location_service.search_multiple_locations(query, max_results)
+            locations = self.location_service.suggest_locations(query, max_results)
             
             formatted_suggestions = []
             for location in locations:
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Background worker for the ski touring planner
+Keeps shared caches warm so web requests only read prepared data
+
+Usage:
+    python worker.py prefetch          # Refresh regional weather on every forecast cycle
+    python worker.py prefetch --once   # Refresh once and exit (e.g. from cron)
+    python worker.py ingest-snow       # Store the last days' seNorge snow grids
+    python worker.py ingest-avalanche  # Store warnings for all avalanche regions
+    python worker.py ingest-regobs     # Store recent RegObs snow observations
+    python worker.py build-place-index --source stedsnavn.json  # Rebuild place name autocomplete
+    python worker.py warm-geocoding    # Re-resolve frequent place queries before they expire
+    python worker.py build-travel-times  # Route origin cells to every trailhead over the road network
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+# Add current directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from api_clients.avalanche_warning_store import ingest_avalanche_warnings
+from api_clients.regobs_store import ingest_regobs_observations
+from api_clients.senorge_grid import get_snow_grid_store, ingest_snow_grids
+from services.location_service import LocationService
+from services.weather_prefetch_service import WeatherPrefetchService
+from utils.place_index import build_place_names_file
+from utils.travel_time import build_travel_time_matrix
+
+
+def run_prefetch(args):
+    """Refresh the regional weather snapshot once or on a schedule"""
+    prefetch_service = WeatherPrefetchService()
+    if args.once:
+        prefetch_service.refresh()
+        return
+
+    print("🌐 Weather prefetch worker started (Ctrl+C to stop)")
+    try:
+        prefetch_service.run_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Weather prefetch worker stopped")
+
+
+def run_ingest_snow(args):
+    """Ingest seNorge grids for the last few days, skipping days already stored"""
+    last_day = date.fromisoformat(args.date) if args.date else date.today()
+    stored = set(get_snow_grid_store().available_dates())
+
+    for offset in range(args.days):
+        day = last_day - timedelta(days=offset)
+        if day in stored and not args.force:
+            print(f"✅ seNorge grids for {day} already stored")
+            continue
+        ingest_snow_grids(day, args.source)
+
+
+def run_ingest_avalanche(args):
+    """Store avalanche warnings for all regions for the next days"""
+    ingest_avalanche_warnings(days=args.days)
+
+
+def run_ingest_regobs(args):
+    """Store recent RegObs observations from the API or a local dump"""
+    ingest_regobs_observations(days_back=args.days, source=args.source)
+
+
+def run_build_place_index(args):
+    """Convert a Kartverket stedsnavn dump into the autocomplete place list"""
+    build_place_names_file(args.source, args.output)
+
+
+def run_warm_geocoding(args):
+    """Refresh cached answers for the most frequent place queries"""
+    LocationService().refresh_frequent_locations(limit=args.limit)
+
+
+def run_build_travel_times(args):
+    """Precompute road driving times from origin cells to all trailheads"""
+    build_travel_time_matrix(args.network, cell_km=args.cell_km)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ski touring planner background worker")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    prefetch_parser = subparsers.add_parser('prefetch', help="Keep the regional weather snapshot fresh")
+    prefetch_parser.add_argument('--once', action='store_true', help="Refresh once and exit")
+    prefetch_parser.set_defaults(handler=run_prefetch)
+
+    snow_parser = subparsers.add_parser('ingest-snow', help="Download daily seNorge snow grids")
+    snow_parser.add_argument('--date', help="Last day to ingest (YYYY-MM-DD, default today)")
+    snow_parser.add_argument('--days', type=int, default=3, help="Number of days to ingest")
+    snow_parser.add_argument('--source', help="Local .nc/.npz file or OPeNDAP URL instead of the configured URLs")
+    snow_parser.add_argument('--force', action='store_true', help="Re-ingest days already stored")
+    snow_parser.set_defaults(handler=run_ingest_snow)
+
+    avalanche_parser = subparsers.add_parser('ingest-avalanche', help="Download warnings for all avalanche regions")
+    avalanche_parser.add_argument('--days', type=int, default=3, help="Number of valid days to ingest")
+    avalanche_parser.set_defaults(handler=run_ingest_avalanche)
+
+    regobs_parser = subparsers.add_parser('ingest-regobs', help="Download recent RegObs observations")
+    regobs_parser.add_argument('--days', type=int, default=7, help="Days of observations to fetch")
+    regobs_parser.add_argument('--source', help="JSON dump of RegObs Search results instead of the API")
+    regobs_parser.set_defaults(handler=run_ingest_regobs)
+
+    place_parser = subparsers.add_parser('build-place-index', help="Build the place name autocomplete list")
+    place_parser.add_argument('--source', required=True, help="JSON dump of Kartverket stedsnavn results")
+    place_parser.add_argument('--output', help="Target file (default config.PLACE_NAMES_FILE)")
+    place_parser.set_defaults(handler=run_build_place_index)
+
+    geocoding_parser = subparsers.add_parser('warm-geocoding', help="Refresh frequent geocoding cache entries")
+    geocoding_parser.add_argument('--limit', type=int, help="Number of queries to refresh (default config.GEOCODING_WARM_ENTRIES)")
+    geocoding_parser.set_defaults(handler=run_warm_geocoding)
+
+    travel_parser = subparsers.add_parser('build-travel-times', help="Build the road travel time table")
+    travel_parser.add_argument('--network', help="Road network JSON (default config.ROAD_NETWORK_FILE)")
+    travel_parser.add_argument('--cell-km', type=float, help="Origin cell size (default config.TRAVEL_TIME_CELL_KM)")
+    travel_parser.set_defaults(handler=run_build_travel_times)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()